@@ -0,0 +1 @@
+"""Benchmarks for the ZHA Device Info integration."""
@@ -0,0 +1,92 @@
+"""Measure how long importing the integration takes.
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and
+the cumulative time of the integration's own imports is reported, along
+with whether the ZHA integration was pulled in. Pass ``--ref`` to also
+measure the integration as it was at another git revision, e.g. before a
+change::
+
+    python -m benchmarks.import_time --ref HEAD~1
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tarfile
+import tempfile
+from io import BytesIO
+
+MODULES = (
+    "custom_components.zha_device_info",
+    "custom_components.zha_device_info.sensor",
+    "custom_components.zha_device_info.binary_sensor",
+    "custom_components.zha_device_info.services",
+)
+ROUNDS = 5
+IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def import_time(module: str, root: str) -> dict:
+    """Return the cumulative import time of a module in microseconds."""
+    best = None
+    for _ in range(ROUNDS):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if result.returncode:
+            # e.g. an old revision written against another Home Assistant
+            return {"module": module, "error": result.stderr.strip().splitlines()[-1]}
+        imported = {}
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME.match(line)
+            if match:
+                imported[match.group(4)] = int(match.group(2))
+        if best is None or imported[module] < best[module]:
+            best = imported
+    return {
+        "module": module,
+        "cumulative_us": best[module],
+        "imports_zha": "homeassistant.components.zha" in best,
+    }
+
+
+def measure(root: str) -> list:
+    """Measure every module of the integration found under ``root``."""
+    return [import_time(module, root) for module in MODULES]
+
+
+def export_ref(ref: str, target: str) -> None:
+    """Extract the integration at a git revision into ``target``."""
+    archive = subprocess.run(
+        ["git", "archive", ref, "custom_components"],
+        capture_output=True,
+        check=True,
+    ).stdout
+    with tarfile.open(fileobj=BytesIO(archive)) as tar:
+        tar.extractall(target)
+
+
+def main() -> None:
+    """Print the measurement as JSON."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ref", help="also measure this git revision")
+    args = parser.parse_args()
+
+    report = {"current": measure(os.getcwd())}
+    if args.ref:
+        with tempfile.TemporaryDirectory() as target:
+            export_ref(args.ref, target)
+            report[args.ref] = measure(target)
+    json.dump(report, sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Synthetic ZHA mesh used by the ZHA Device Info benchmarks.
+
+Devices expose the same attributes the integration reads from ZHA's
+``Device`` objects. String values are built per device, as they are when
+zigpy reads them from the Basic cluster, so the mesh does not benefit
+from accidental sharing of identical literals.
+"""
+
+import random
+import time
+
+# (manufacturer, model, device_type, power_source, quirk class or None)
+MODELS = [
+    ("IKEA of Sweden", "TRADFRI bulb E27 WS opal 980lm", "Router", "Mains", None),
+    ("IKEA of Sweden", "TRADFRI control outlet", "Router", "Mains", None),
+    ("IKEA of Sweden", "TRADFRI remote control", "EndDevice", "Battery or Unknown", "IkeaTradfriRemote"),
+    ("IKEA of Sweden", "TRADFRI motion sensor", "EndDevice", "Battery or Unknown", "IkeaTradfriMotion"),
+    ("LUMI", "lumi.sensor_magnet.aq2", "EndDevice", "Battery or Unknown", "MagnetAQ2"),
+    ("LUMI", "lumi.weather", "EndDevice", "Battery or Unknown", "Weather"),
+    ("LUMI", "lumi.sensor_motion.aq2", "EndDevice", "Battery or Unknown", "MotionAQ2"),
+    ("LUMI", "lumi.plug.maeu01", "Router", "Mains", "PlugMAEU01"),
+    ("Philips", "LCT015", "Router", "Mains", None),
+    ("Signify Netherlands B.V.", "LCA001", "Router", "Mains", None),
+    ("Philips", "SML001", "EndDevice", "Battery or Unknown", "PhilipsMotion"),
+    ("Philips", "RWL021", "EndDevice", "Battery or Unknown", "PhilipsRWL021"),
+    ("_TZ3000_g5xawfcq", "TS0121", "Router", "Mains", "TuyaPlug"),
+    ("_TZE200_cowvfni3", "TS0601", "Router", "Mains", "TuyaCover"),
+    ("_TZ3000_kmh5qpmb", "TS0203", "EndDevice", "Battery or Unknown", "TuyaDoorSensor"),
+    ("SONOFF", "SNZB-02", "EndDevice", "Battery or Unknown", None),
+    ("SONOFF", "S31 Lite zb", "Router", "Mains", None),
+    ("innr", "SP 240", "Router", "Mains", "InnrPlug"),
+    ("Third Reality, Inc", "3RSP02028BZ", "Router", "Mains", None),
+    ("Centralite", "3326-L", "EndDevice", "Battery or Unknown", "CentraLiteMotion"),
+]
+
+
+class SyntheticDevice:
+    """Stand-in for a ZHA device with realistic attribute values."""
+
+    def __init__(self, index: int, rng: random.Random, now: float) -> None:
+        """Initialize the device."""
+        manufacturer, model, device_type, power_source, quirk = rng.choice(MODELS)
+        self.ieee = ":".join(
+            f"{byte:02x}" for byte in (0x00, 0x12, 0x4B, 0x00) + tuple(
+                (index >> shift) & 0xFF for shift in (24, 16, 8, 0)
+            )
+        )
+        self.nwk = rng.randrange(0x0001, 0xFFF7)
+        # Copy strings so every device owns its values, as with zigpy
+        self.manufacturer = "".join(list(manufacturer))
+        self.model = "".join(list(model))
+        self.name = f"{manufacturer} {model} {index}"
+        self.quirk_applied = quirk is not None
+        self.quirk_class = (
+            f"zhaquirks.{manufacturer.split()[0].lower()}.{quirk}"
+            if quirk else "".join(list(model))
+        )
+        self.power_source = "".join(list(power_source))
+        self.device_type = "".join(list(device_type))
+        self.lqi = rng.randrange(30, 256)
+        self.rssi = rng.randrange(-95, -30)
+        self.last_seen = now - rng.uniform(0, 3600)
+        self.available = rng.random() > 0.03
+
+    def chatter(self, rng: random.Random, now: float) -> None:
+        """Simulate a message from the device."""
+        self.last_seen = now
+        self.lqi = max(0, min(255, self.lqi + rng.randrange(-8, 9)))
+        self.rssi = max(-100, min(-20, self.rssi + rng.randrange(-3, 4)))
+
+
+def generate_mesh(count: int, seed: int = 0) -> dict:
+    """Return ``count`` synthetic devices keyed by IEEE address."""
+    rng = random.Random(seed)
+    now = time.time()
+    devices = (SyntheticDevice(index, rng, now) for index in range(count))
+    return {device.ieee: device for device in devices}
+
+
+class SyntheticDeviceEntry:
+    """Stand-in for a device registry entry."""
+
+    def __init__(self, name_by_user) -> None:
+        """Initialize the entry."""
+        self.name_by_user = name_by_user
+
+
+class SyntheticDeviceRegistry:
+    """Device registry double answering lookups by ZHA identifier."""
+
+    def __init__(self, devices: dict, renamed: float = 0.2, seed: int = 0) -> None:
+        """Index the devices, giving a fraction of them a user name."""
+        rng = random.Random(seed)
+        self._entries = {}
+        for ieee, device in devices.items():
+            name_by_user = f"Room {device.name}" if rng.random() < renamed else None
+            self._entries[ieee] = SyntheticDeviceEntry(name_by_user)
+
+    def async_get_device(self, identifiers):
+        """Return the entry of the first known identifier."""
+        for _domain, ieee in identifiers:
+            entry = self._entries.get(ieee)
+            if entry is not None:
+                return entry
+        return None
+
+
+class StandInGateway:
+    """Local stand-in for the ZHA gateway holding a synthetic mesh."""
+
+    def __init__(self, devices: dict) -> None:
+        """Initialize the gateway."""
+        self.devices = devices
+        self.application_controller = None
+
+    def chatter(self, fraction: float, seed: int = 0) -> int:
+        """Let a fraction of the devices send a message, return how many."""
+        rng = random.Random(seed)
+        now = time.time()
+        count = int(len(self.devices) * fraction)
+        for device in rng.sample(list(self.devices.values()), count):
+            device.chatter(rng, now)
+        return count
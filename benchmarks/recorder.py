@@ -0,0 +1,175 @@
+"""Estimate the recorder load of ZHA Device Info on a synthetic mesh.
+
+Entities are added through a real entity platform and driven for one
+simulated hour: at every refresh a fraction of the devices send a
+message, the ``update`` action runs and the LQI/RSSI history stats are
+recomputed. Every ``state_changed`` event is then costed the way the
+recorder writes it: one ``states`` row per event, plus one
+``state_attributes`` row per distinct attribute blob, built without the
+entity's unrecorded attributes.
+
+Three main sensor modes are compared:
+
+- ``recorded``: every attribute recorded, as before volatile attributes
+  were excluded
+- ``unrecorded``: the default, volatile attributes excluded from recording
+- ``slim``: the slim main entity option, without any split entities
+
+Run from the repository root in a Home Assistant development environment::
+
+    python -m benchmarks.recorder --devices 500 --output recorder.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import callback
+from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.json import json_bytes
+
+from custom_components.zha_device_info import sensor
+from custom_components.zha_device_info.const import (
+    CONF_SLIM_MAIN_ENTITY,
+    DOMAIN,
+    SERVICE_UPDATE,
+)
+from custom_components.zha_device_info.device_context import build_device_contexts
+from custom_components.zha_device_info.history import async_refresh_history_stats
+
+from .mesh import StandInGateway, SyntheticDeviceRegistry, generate_mesh
+from .suite import new_hass
+
+DEFAULT_DEVICES = 500
+# One hour at the default refresh interval of 5 minutes
+DEFAULT_ROUNDS = 12
+# Devices that sent at least one message since the previous refresh
+DEFAULT_CHATTER = 0.5
+MODES = ("recorded", "unrecorded", "slim")
+# Dropped by the recorder for every domain
+ALWAYS_EXCLUDED = frozenset({"attribution", "restored", "supported_features"})
+
+
+class RecordedSensor(sensor.ZHADeviceInfoSensor):
+    """Main sensor recording every attribute, the baseline."""
+
+    _unrecorded_attributes = frozenset()
+
+
+class RecorderCost:
+    """Cost state changes as recorder rows and bytes."""
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.states_rows = 0
+        self.attributes_rows = 0
+        self.attributes_bytes = 0
+        self._shared = set()
+
+    @callback
+    def async_state_changed(self, event) -> None:
+        """Cost one state change."""
+        state = event.data["new_state"]
+        if state is None:
+            return
+        self.states_rows += 1
+        excluded = ALWAYS_EXCLUDED
+        if state.state_info is not None:
+            excluded = excluded | state.state_info["unrecorded_attributes"]
+        shared = json_bytes({
+            key: value for key, value in state.attributes.items()
+            if key not in excluded
+        })
+        # The recorder stores each distinct attribute blob once
+        if shared not in self._shared:
+            self._shared.add(shared)
+            self.attributes_rows += 1
+            self.attributes_bytes += len(shared)
+
+    def as_dict(self) -> dict:
+        """Return the counters."""
+        return {
+            "states_rows": self.states_rows,
+            "attributes_rows": self.attributes_rows,
+            "attributes_bytes": self.attributes_bytes,
+        }
+
+
+async def run_mode(mode: str, size: int, rounds: int, chatter: float) -> dict:
+    """Return the recorder cost of one simulated hour in one mode."""
+    gateway = StandInGateway(generate_mesh(size))
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await new_hass(config_dir, gateway)
+
+        # No split entities, they are recorded the same in every mode
+        options = {CONF_SLIM_MAIN_ENTITY: mode == "slim"}
+        contexts = build_device_contexts(
+            gateway.devices.values(), SyntheticDeviceRegistry(gateway.devices)
+        )
+        if mode == "recorded":
+            entities = [RecordedSensor(hass, context) for context in contexts]
+        else:
+            entities = sensor.build_sensor_entities(hass, contexts, options)
+        component = EntityComponent(logging.getLogger(__name__), "sensor", hass)
+        await component.async_add_entities(entities)
+        await hass.services.async_call(DOMAIN, SERVICE_UPDATE, blocking=True)
+        await hass.async_block_till_done()
+
+        cost = RecorderCost()
+        unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, cost.async_state_changed)
+        for round_number in range(rounds):
+            gateway.chatter(chatter, seed=round_number)
+            await hass.services.async_call(DOMAIN, SERVICE_UPDATE, blocking=True)
+            await async_refresh_history_stats(hass)
+            # Flush the write window instead of waiting for it
+            hass.data[DOMAIN]["writer"].async_stop()
+            await hass.async_block_till_done()
+        unsub()
+
+        result = {"mode": mode, "entities": len(entities), **cost.as_dict()}
+        await hass.async_stop(force=True)
+    return result
+
+
+async def run(size: int, rounds: int, chatter: float) -> dict:
+    """Run every mode and return the report."""
+    return {
+        "devices": size,
+        "rounds": rounds,
+        "chatter_fraction": chatter,
+        "results": [
+            await run_mode(mode, size, rounds, chatter) for mode in MODES
+        ],
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=DEFAULT_DEVICES)
+    parser.add_argument(
+        "--rounds", type=int, default=DEFAULT_ROUNDS,
+        help="refreshes to simulate, 12 is one hour at the default interval",
+    )
+    parser.add_argument(
+        "--chatter", type=float, default=DEFAULT_CHATTER,
+        help="fraction of devices with a new message at each refresh",
+    )
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.devices, args.rounds, args.chatter))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
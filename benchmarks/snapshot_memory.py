@@ -0,0 +1,85 @@
+"""Measure device_registry memory for per-device dicts vs snapshots.
+
+Snapshots are measured after every entity built its attributes from
+them once, as the main sensors do on each write, so anything a snapshot
+kept from that read would be counted.
+
+Run from the repository root in a Home Assistant development environment::
+
+    python -m benchmarks.snapshot_memory
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+from datetime import datetime
+
+from custom_components.zha_device_info.snapshot import DeviceSnapshot
+
+from .mesh import generate_mesh
+
+DEVICES = 5000
+
+
+def legacy_device_info(device) -> dict:
+    """Build the per-device dict stored before snapshots were introduced."""
+    last_seen = datetime.fromtimestamp(device.last_seen)
+    info = {
+        "ieee": str(device.ieee),
+        "nwk": f"0x{device.nwk:04x}",
+        "manufacturer": device.manufacturer,
+        "model": device.model,
+        "name": device.name,
+        "quirk_applied": device.quirk_applied,
+        "power_source": device.power_source,
+        "lqi": device.lqi,
+        "rssi": device.rssi,
+        "last_seen": last_seen.isoformat(),
+        "available": device.available,
+    }
+    if device.quirk_applied:
+        info["quirk_class"] = device.quirk_class
+    return info
+
+
+def measure(build, devices, read=None) -> int:
+    """Return the bytes retained by a registry built with ``build``.
+
+    ``read`` is called on every entry before measuring, the way entities
+    read the registry.
+    """
+    gc.collect()
+    tracemalloc.start()
+    registry = {str(device.ieee): build(device) for device in devices}
+    if read is not None:
+        for entry in registry.values():
+            read(entry)
+    retained, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del registry
+    return retained
+
+
+def main() -> None:
+    """Print the measurement as JSON."""
+    devices = list(generate_mesh(DEVICES).values())
+    dict_bytes = measure(legacy_device_info, devices)
+    snapshot_bytes = measure(
+        DeviceSnapshot.from_device, devices, DeviceSnapshot.as_dict
+    )
+    json.dump(
+        {
+            "devices": DEVICES,
+            "dict_bytes": dict_bytes,
+            "snapshot_bytes": snapshot_bytes,
+            "ratio": round(snapshot_bytes / dict_bytes, 3),
+        },
+        sys.stdout,
+        indent=2,
+    )
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Measure entity construction at platform setup for large meshes.
+
+Compares building every entity with one device registry lookup per entity,
+as platform setup did before, with the batched single-pass construction.
+Run from the repository root in a Home Assistant development environment::
+
+    python -m benchmarks.startup
+"""
+
+import asyncio
+import json
+import sys
+import tempfile
+import time
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.zha_device_info import new_domain_data
+from custom_components.zha_device_info.binary_sensor import (
+    ZHADeviceBinarySensor,
+    build_binary_sensor_entities,
+)
+from custom_components.zha_device_info.const import (
+    DOMAIN,
+    SPLITTABLE_ATTRIBUTES,
+)
+from custom_components.zha_device_info.device_context import (
+    build_device_contexts,
+    enabled_splits,
+)
+from custom_components.zha_device_info.sensor import (
+    ZHADeviceAttributeSensor,
+    ZHADeviceInfoSensor,
+    build_sensor_entities,
+)
+
+from .mesh import SyntheticDeviceRegistry, generate_mesh
+
+SIZES = (1000, 5000)
+ROUNDS = 3
+# Every split enabled, the worst case for setup
+OPTIONS = {conf: True for conf in SPLITTABLE_ATTRIBUTES}
+
+
+def per_entity(hass, devices, registry) -> list:
+    """Build entities resolving the device entry for every entity."""
+    sensor_splits = enabled_splits(OPTIONS, "sensor")
+    binary_splits = enabled_splits(OPTIONS, "binary_sensor")
+    entities = []
+    for device in devices:
+        [context] = build_device_contexts([device], registry)
+        entities.append(ZHADeviceInfoSensor(hass, context))
+        for conf_data in sensor_splits:
+            [context] = build_device_contexts([device], registry)
+            entities.append(ZHADeviceAttributeSensor(hass, context, conf_data))
+        for conf_data in binary_splits:
+            [context] = build_device_contexts([device], registry)
+            entities.append(ZHADeviceBinarySensor(hass, context, conf_data))
+    return entities
+
+
+def batched(hass, devices, registry) -> list:
+    """Build entities the way both platforms do at setup."""
+    contexts = build_device_contexts(devices, registry)
+    return build_sensor_entities(hass, contexts, OPTIONS) + build_binary_sensor_entities(
+        hass, contexts, OPTIONS
+    )
+
+
+def best_of(build, hass, devices, registry):
+    """Return the fastest of ``ROUNDS`` runs in milliseconds and the entity count."""
+    best = float("inf")
+    count = 0
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        count = len(build(hass, devices, registry))
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 1), count
+
+
+async def run() -> list:
+    """Run every size and return the results."""
+    results = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.data[DOMAIN] = new_domain_data(hass)
+        for size in SIZES:
+            mesh = generate_mesh(size)
+            registry = SyntheticDeviceRegistry(mesh)
+            devices = list(mesh.values())
+            per_entity_ms, entities = best_of(per_entity, hass, devices, registry)
+            batched_ms, _ = best_of(batched, hass, devices, registry)
+            results.append({
+                "devices": size,
+                "entities": entities,
+                "per_entity_lookup_ms": per_entity_ms,
+                "batched_ms": batched_ms,
+            })
+        await hass.async_stop(force=True)
+    return results
+
+
+def main() -> None:
+    """Print the measurement as JSON."""
+    json.dump(asyncio.run(run()), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""Benchmark ZHA Device Info against synthetic meshes of increasing size.
+
+For each mesh size this measures platform setup, including adding every
+entity to Home Assistant, the ``update`` action (initial, incremental and
+no-op runs) including its state writes and the longest time the event
+loop was blocked, the ``export`` action in every format, and peak Python
+memory. Results are printed, or written with ``--output``, as one
+JSON document so runs can be compared between releases.
+
+Run from the repository root in a Home Assistant development environment::
+
+    python -m benchmarks.suite --sizes 100,1000,5000,20000 --output bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    device_registry as dr,
+    entity,
+    entity_registry as er,
+    translation,
+)
+from homeassistant.helpers.entity_component import EntityComponent
+
+from custom_components.zha_device_info import binary_sensor, new_domain_data, sensor
+from custom_components.zha_device_info.const import (
+    DOMAIN,
+    SERVICE_EXPORT,
+    SERVICE_UPDATE,
+    SPLITTABLE_ATTRIBUTES,
+    ZHA_DOMAIN,
+)
+from custom_components.zha_device_info.device_context import build_device_contexts
+from custom_components.zha_device_info.services import async_register_services
+
+from .mesh import StandInGateway, SyntheticDeviceRegistry, generate_mesh
+
+DEFAULT_SIZES = (100, 1000, 5000, 20000)
+CHATTER_FRACTION = 0.1
+# Every split enabled, the worst case for setup
+OPTIONS = {conf: True for conf in SPLITTABLE_ATTRIBUTES}
+EXPORTS = (
+    {"format": "json", "compress": "none"},
+    {"format": "ndjson", "compress": "none"},
+    {"format": "ndjson", "compress": "gzip"},
+)
+
+
+class LoopMonitor:
+    """Record the longest stretch the event loop did not get back to us."""
+
+    def __init__(self) -> None:
+        """Initialize the monitor."""
+        self.max_block = 0.0
+        self._task = None
+
+    async def _run(self) -> None:
+        """Yield continuously, timing every round trip through the loop."""
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0)
+            self.max_block = max(self.max_block, time.perf_counter() - start)
+
+    def __enter__(self):
+        """Start monitoring."""
+        self.max_block = 0.0
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Stop monitoring."""
+        self._task.cancel()
+
+
+def ms(seconds: float) -> float:
+    """Round seconds to milliseconds."""
+    return round(seconds * 1000, 2)
+
+
+async def new_hass(config_dir: str, gateway: StandInGateway) -> HomeAssistant:
+    """Return a Home Assistant instance with the integration's state."""
+    hass = HomeAssistant(config_dir)
+    await dr.async_load(hass)
+    await er.async_load(hass)
+    # Done by bootstrap, adding entities needs them
+    translation.async_setup(hass)
+    entity.async_setup(hass)
+    hass.data[ZHA_DOMAIN] = SimpleNamespace(
+        gateway_proxy=SimpleNamespace(gateway=gateway)
+    )
+    hass.data[DOMAIN] = new_domain_data(hass)
+    await async_register_services(hass)
+    return hass
+
+
+async def setup_platforms(hass: HomeAssistant, gateway: StandInGateway) -> int:
+    """Run both platform setups and add the entities, return how many."""
+    entry = SimpleNamespace(options=OPTIONS, async_on_unload=lambda unsub: None)
+    hass.data[DOMAIN]["device_contexts"] = build_device_contexts(
+        gateway.devices.values(), SyntheticDeviceRegistry(gateway.devices)
+    )
+    added = 0
+    for platform in (sensor, binary_sensor):
+        entities = []
+        await platform.async_setup_entry(hass, entry, entities.extend)
+        # A real entity platform, so entities are indexed and write states
+        domain = platform.__name__.rsplit(".", 1)[-1]
+        component = EntityComponent(logging.getLogger(__name__), domain, hass)
+        await component.async_add_entities(entities)
+        added += len(entities)
+    hass.data[DOMAIN].pop("device_contexts")
+    return added
+
+
+async def timed_update(hass: HomeAssistant) -> dict:
+    """Run the update action and its state writes, return latency and blocking."""
+    writer = hass.data[DOMAIN]["writer"]
+    written = writer.written
+    with LoopMonitor() as monitor:
+        start = time.perf_counter()
+        await hass.services.async_call(DOMAIN, SERVICE_UPDATE, blocking=True)
+        # Flush the write window instead of waiting for it
+        writer.async_stop()
+        await hass.async_block_till_done()
+        elapsed = time.perf_counter() - start
+    stats = hass.data[DOMAIN]["last_update"]
+    return {
+        "ms": ms(elapsed),
+        "max_loop_block_ms": ms(monitor.max_block),
+        "devices_changed": stats["devices_changed"],
+        "entities_written": stats["entities_written"],
+        "states_written": writer.written - written,
+    }
+
+
+async def bench_size(size: int, config_dir: str) -> dict:
+    """Run every measurement for one mesh size."""
+    gateway = StandInGateway(generate_mesh(size))
+    hass = await new_hass(config_dir, gateway)
+    result = {"devices": size}
+
+    start = time.perf_counter()
+    result["entities"] = await setup_platforms(hass, gateway)
+    result["setup_ms"] = ms(time.perf_counter() - start)
+
+    result["update_initial"] = await timed_update(hass)
+    # Without entities in the index, nothing would be written
+    assert result["update_initial"]["entities_written"] > 0
+    gateway.chatter(CHATTER_FRACTION)
+    result["update_incremental"] = await timed_update(hass)
+    assert result["update_incremental"]["entities_written"] > 0
+    result["update_noop"] = await timed_update(hass)
+
+    result["export"] = []
+    for options in EXPORTS:
+        path = os.path.join(
+            config_dir, f"export_{size}.{options['format']}.{options['compress']}"
+        )
+        start = time.perf_counter()
+        await hass.services.async_call(
+            DOMAIN, SERVICE_EXPORT, {**options, "path": path}, blocking=True
+        )
+        result["export"].append({
+            **options,
+            "ms": ms(time.perf_counter() - start),
+            "bytes": os.path.getsize(path),
+        })
+
+    await hass.async_stop(force=True)
+    return result
+
+
+async def peak_memory(size: int, config_dir: str) -> int:
+    """Return the peak traced memory of setup plus the initial update."""
+    tracemalloc.start()
+    gateway = StandInGateway(generate_mesh(size))
+    hass = await new_hass(config_dir, gateway)
+    await setup_platforms(hass, gateway)
+    await hass.services.async_call(DOMAIN, SERVICE_UPDATE, blocking=True)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await hass.async_stop(force=True)
+    return peak
+
+
+async def run(sizes) -> dict:
+    """Run the suite and return the report."""
+    results = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as config_dir:
+            result = await bench_size(size, config_dir)
+            # Separate pass, tracing slows down everything it measures
+            result["peak_memory_bytes"] = await peak_memory(size, config_dir)
+        results.append(result)
+    return {
+        "python": platform.python_version(),
+        "homeassistant": HA_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "chatter_fraction": CHATTER_FRACTION,
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the suite and write the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="comma separated mesh sizes",
+    )
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = asyncio.run(run(sizes))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
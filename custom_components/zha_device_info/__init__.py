@@ -1,12 +1,37 @@
 import logging
+from datetime import timedelta
+from functools import partial
+from typing import Any, Dict, Optional
 
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.config_entries import (
+    SIGNAL_CONFIG_ENTRY_CHANGED,
+    ConfigEntry,
+    ConfigEntryState,
+)
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.start import async_at_started
 
-from .const import DOMAIN, PLATFORMS, SERVICE_UPDATE
+from .const import (
+    DOMAIN, PLATFORMS, SERVICE_UPDATE,
+    CONF_SCAN_INTERVAL, DEFAULT_OPTIONS,
+    HISTORY_SIZE, HISTORY_STATS_INTERVAL, CONF_WRITE_WINDOW,
+    DATA_ZHA_WAITERS, ZHA_DOMAIN,
+)
+from .batcher import StateWriteBatcher
+from .device_context import get_zha_gateway
+from .entity_index import EntityIndex
+from .history import SignalHistory, async_refresh_history_stats
+from .listener import ZHADeviceInfoListener
+from .query import DeviceIndexes
+from .scheduler import ShardedScheduler
+from .stale import StaleTracker
+from .store import SnapshotStore
 from .services import async_register_services
+from .signature import SignatureCache
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,29 +41,127 @@ async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up ZHA Device Info."""
     return True
 
+def new_writer(hass: HomeAssistant, entry: Optional[ConfigEntry]) -> StateWriteBatcher:
+    """Return the state write batcher for the entry's write window."""
+    options = entry.options if entry is not None else {}
+    write_window = options.get(CONF_WRITE_WINDOW, DEFAULT_OPTIONS[CONF_WRITE_WINDOW])
+    return StateWriteBatcher(hass, write_window / 1000)
+
+def new_domain_data(
+    hass: HomeAssistant, entry: Optional[ConfigEntry] = None
+) -> Dict[str, Any]:
+    """Return the empty state kept in ``hass.data[DOMAIN]``.
+
+    Setup, the tests and the benchmarks all start from this layout.
+    """
+    data = {
+        "device_registry": {},
+        "entities": EntityIndex(),
+        # IEEE -> change sequence at which the device was removed
+        "removed": {},
+        "indexes": DeviceIndexes(),
+        "summary_entities": {},
+        "history": SignalHistory(HISTORY_SIZE),
+        "history_stats": {},
+        "stale": StaleTracker(hass),
+        # IEEE -> failed refresh count and last error
+        "device_errors": {},
+        "perf_entities": {},
+        "signatures": SignatureCache(),
+        # Entity state writes are coalesced per window, set before any entity
+        "writer": new_writer(hass, entry),
+    }
+    data["store"] = SnapshotStore(hass)
+    return data
+
+@callback
+def async_retry_when_zha_loaded(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Set up the entry again as soon as ZHA is loaded.
+
+    Home Assistant retries an entry that is not ready with backoff, and
+    during startup only once startup is done. ZHA usually finishes well
+    before either.
+    """
+    waiters = hass.data.setdefault(DATA_ZHA_WAITERS, {})
+    if entry.entry_id in waiters:
+        return
+
+    @callback
+    def _handle_entry_changed(change, zha_entry: ConfigEntry) -> None:
+        """Reload the entry once the ZHA gateway exists."""
+        if zha_entry.domain != ZHA_DOMAIN or get_zha_gateway(hass) is None:
+            return
+        waiters.pop(entry.entry_id)()
+        if entry.state is ConfigEntryState.SETUP_RETRY:
+            _LOGGER.debug("ZHA is loaded, setting up ZHA Device Info again")
+            hass.config_entries.async_schedule_reload(entry.entry_id)
+
+    waiters[entry.entry_id] = async_dispatcher_connect(
+        hass, SIGNAL_CONFIG_ENTRY_CHANGED, _handle_entry_changed
+    )
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up config entry."""
     _LOGGER.debug("Setting up ZHA Device Info config entry")
+    if get_zha_gateway(hass) is None:
+        async_retry_when_zha_loaded(hass, entry)
+        raise ConfigEntryNotReady("ZHA gateway is not ready")
+    # Set up by a backoff retry before ZHA's entry reported it was loaded
+    if (unsub := hass.data.get(DATA_ZHA_WAITERS, {}).pop(entry.entry_id, None)):
+        unsub()
     try:
         if DOMAIN not in hass.data:
-            hass.data[DOMAIN] = {
-                "device_registry": {},
-                "entities": []
-            }
-        _LOGGER.debug("Initialized device registry and entities list")
+            hass.data[DOMAIN] = new_domain_data(hass, entry)
+            _LOGGER.debug("Initialized device registry and entity index")
+            # Show the last known data until ZHA has been scanned
+            restored = await hass.data[DOMAIN]["store"].async_restore()
+            _LOGGER.debug("Restored %s stored device snapshots", restored)
+        else:
+            # Kept across reloads, but the write window follows the options
+            hass.data[DOMAIN]["writer"] = new_writer(hass, entry)
 
         await async_register_services(hass)
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        # Device names resolved for the platforms, stale after setup
+        hass.data[DOMAIN].pop("device_contexts", None)
 
-        # Initial update
-        async def initial_update(event):
-            await hass.services.async_call(DOMAIN, SERVICE_UPDATE)
+        # Push per-device changes from ZHA as they happen
+        listener = ZHADeviceInfoListener(hass)
+        listener.async_start()
+        hass.data[DOMAIN]["listener"] = listener
+
+        # Periodic reconciliation, spread over the interval in buckets
+        scan_interval = entry.options.get(
+            CONF_SCAN_INTERVAL, DEFAULT_OPTIONS[CONF_SCAN_INTERVAL]
+        )
+        if scan_interval:
+            scheduler = ShardedScheduler(hass, scan_interval)
+            scheduler.async_start()
+            hass.data[DOMAIN]["scheduler"] = scheduler
+
+        # Stale devices are detected from last_seen deadlines
+        hass.data[DOMAIN]["stale"].async_start()
+        entry.async_on_unload(hass.data[DOMAIN]["stale"].async_stop)
 
-        hass.bus.async_listen_once(
-            EVENT_HOMEASSISTANT_STARTED,
-            initial_update
+        # Rolling LQI/RSSI stats, recomputed for the whole mesh at once
+        entry.async_on_unload(
+            async_track_time_interval(
+                hass,
+                partial(async_refresh_history_stats, hass),
+                timedelta(seconds=HISTORY_STATS_INTERVAL),
+            )
         )
 
+        # Initial update, later full scans only reconcile missed changes.
+        # Runs right away when the entry is set up after Home Assistant started.
+        async def initial_update(hass: HomeAssistant) -> None:
+            await hass.services.async_call(DOMAIN, SERVICE_UPDATE)
+
+        entry.async_on_unload(async_at_started(hass, initial_update))
+
+        # Apply option changes by reloading the entry
+        entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+
         _LOGGER.debug("ZHA Device Info config entry setup complete")
         return True
     except Exception as err:
@@ -49,9 +172,24 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload config entry."""
     _LOGGER.debug("Unloading ZHA Device Info config entry")
     try:
+        for key in ("scheduler", "listener"):
+            task = hass.data.get(DOMAIN, {}).pop(key, None)
+            if task is not None:
+                task.async_stop()
+        # A full scan still running would write to unloaded entities
+        if (scan_task := hass.data.get(DOMAIN, {}).pop("scan_task", None)) is not None:
+            scan_task.cancel()
+        # Flush pending writes, the batcher is replaced on the next setup
+        if (writer := hass.data.get(DOMAIN, {}).get("writer")) is not None:
+            writer.async_stop()
+
         result = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
         _LOGGER.debug("ZHA Device Info config entry unloaded")
         return result
     except Exception as err:
         _LOGGER.error("Error unloading config entry: %s", err)
-        return False
\ No newline at end of file
+        return False
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload config entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,86 @@
+"""Coalesce entity state writes during update bursts."""
+
+import logging
+from typing import Any, Dict, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class StateWriteBatcher:
+    """Collect entities needing a state write and flush them together.
+
+    Entities scheduled again before the window closes are written once,
+    with their latest state. A window of 0 writes immediately.
+    """
+
+    def __init__(self, hass: HomeAssistant, window: float) -> None:
+        """Initialize the batcher with a window in seconds."""
+        self._hass = hass
+        self._window = window
+        # Insertion ordered set of entities waiting for the next flush
+        self._dirty: Dict[Any, None] = {}
+        self._unsub_flush: Optional[CALLBACK_TYPE] = None
+        self.requested = 0
+        self.written = 0
+        self.flushes = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Return the write counters."""
+        return {
+            "requested": self.requested,
+            "written": self.written,
+            "saved": self.requested - self.written,
+            "flushes": self.flushes,
+            "pending": len(self._dirty),
+        }
+
+    @callback
+    def async_schedule(self, entity) -> None:
+        """Request a state write for an entity."""
+        self.requested += 1
+        if not self._window:
+            self._async_write(entity)
+            return
+        self._dirty[entity] = None
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, self._window, self._async_flush
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Write everything still pending and cancel the timer."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+        self._async_flush(None)
+
+    @callback
+    def _async_flush(self, _now) -> None:
+        """Write every dirty entity once."""
+        self._unsub_flush = None
+        dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        self.flushes += 1
+        for entity in dirty:
+            self._async_write(entity)
+        _LOGGER.debug(
+            "Flushed %s state writes, %s saved so far",
+            len(dirty),
+            self.requested - self.written,
+        )
+
+    @callback
+    def _async_write(self, entity) -> None:
+        """Write one entity if it is still added to Home Assistant."""
+        if entity.hass is None:
+            return
+        try:
+            entity.async_write_ha_state()
+            self.written += 1
+        except Exception as err:
+            _LOGGER.error("Error writing state of %s: %s", entity.entity_id, err)
@@ -1,23 +1,23 @@
 """ZHA Device Info binary sensor platform."""
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Mapping
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.device_registry import async_get
-from homeassistant.components.zha.const import DOMAIN as ZHA_DOMAIN
 
 from .const import (
     DOMAIN,
-    SPLITTABLE_ATTRIBUTES,
-    DEFAULT_OPTIONS,
-    ATTR_QUIRK_CLASS,
-    ATTR_QUIRK_APPLIED,
+    SIGNAL_DEVICE_ADDED,
 )
+from .device_context import (
+    DeviceContext, async_entity_id, async_get_device_contexts, enabled_splits,
+    get_zha_gateway, split_slug,
+)
+from .snapshot import DeviceSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,82 +28,100 @@ async def async_setup_entry(
 ) -> None:
     """Set up ZHA device info binary sensors."""
     try:
-        zha_data = hass.data.get(ZHA_DOMAIN)
-        if not zha_data or not zha_data.gateway_proxy:
+        # The config entry waits for ZHA before forwarding the platforms
+        if get_zha_gateway(hass) is None:
             _LOGGER.error("ZHA gateway not found")
             return
 
-        device_registry = async_get(hass)
-        
-        entities = []
-        for device in zha_data.gateway_proxy.gateway.devices.values():
-            if device is None:
-                continue
-                
-            try:
-                # Only process binary sensor platform configurations
-                binary_sensor_configs = {
-                    conf: conf_data 
-                    for conf, conf_data in SPLITTABLE_ATTRIBUTES.items()
-                    if conf_data.get("platform") == "binary_sensor"
-                }
-                
-                for conf, conf_data in binary_sensor_configs.items():
-                    if entry.options.get(conf, DEFAULT_OPTIONS[conf]):
-                        entity = ZHADeviceBinarySensor(
-                            hass, device, device_registry, conf_data
-                        )
-                        entities.append(entity)
-                
-                if entities:
-                    hass.data[DOMAIN]["entities"].extend(entities)
-                    
-            except Exception as entity_err:
-                _LOGGER.exception("Error creating binary sensor for device %s: %s", device.name, entity_err)
+        entities = build_binary_sensor_entities(
+            hass, async_get_device_contexts(hass), entry.options
+        )
 
         async_add_entities(entities)
-        
+
+        @callback
+        def async_add_device(context: DeviceContext) -> None:
+            """Add the binary sensors of a device paired after setup."""
+            async_add_entities(
+                build_binary_sensor_entities(hass, [context], entry.options)
+            )
+
+        entry.async_on_unload(
+            async_dispatcher_connect(hass, SIGNAL_DEVICE_ADDED, async_add_device)
+        )
+
     except Exception as err:
         _LOGGER.exception("Error setting up ZHA Device Info binary sensors: %s", err)
 
 
+def build_binary_sensor_entities(
+    hass: HomeAssistant, contexts: List[DeviceContext], options: Mapping[str, Any]
+) -> List[BinarySensorEntity]:
+    """Create the split binary sensors of every device in one pass."""
+    splits = enabled_splits(options, "binary_sensor")
+    entities: List[BinarySensorEntity] = []
+    if not splits:
+        return entities
+    for context in contexts:
+        try:
+            for conf_data in splits:
+                entities.append(ZHADeviceBinarySensor(hass, context, conf_data))
+        except Exception as entity_err:
+            _LOGGER.exception(
+                "Error creating binary sensor for device %s: %s",
+                context.name,
+                entity_err,
+            )
+    return entities
+
+
 class ZHADeviceBinarySensor(BinarySensorEntity):
     """Binary sensor for ZHA device attributes."""
 
-    def __init__(self, hass, device, device_registry, conf_data):
+    # Written by the update pipeline when a tracked field changes
+    _attr_should_poll = False
+    # Every change of a binary state is written
+    throttle = None
+
+    def __init__(self, hass, context: DeviceContext, conf_data):
         """Initialize the binary sensor."""
-        self._device = device
+        self._device = context.device
+        self._ieee = context.ieee
+        self._data = hass.data[DOMAIN]
+        self._snapshots = self._data["device_registry"]
         self._conf_data = conf_data
-        device_entry = device_registry.async_get_device(
-            identifiers={(ZHA_DOMAIN, str(device.ieee))},
-        )
-        device_name = device_entry.name_by_user if device_entry and device_entry.name_by_user else device.name
-        
-        self._attr_name = f"{device_name} {conf_data['name']}"
-        self._attr_unique_id = f"{DOMAIN}_{device.ieee}_{conf_data['name']}"
-        self.entity_id = async_generate_entity_id(
-            "binary_sensor.{}",
-            f"zha_device_info_{device_name.lower().replace(' ', '_')}_{conf_data['name'].lower().replace(' ', '_')}",
-            hass=hass
+        # Resolved once instead of on every state read
+        self._value = conf_data["value"]
+        self._extra_attributes = conf_data.get("extra_attributes")
+        self.tracked_fields = frozenset(conf_data["attributes"])
+
+        self._attr_name = f"{context.name} {conf_data['name']}"
+        self._attr_unique_id = f"{DOMAIN}_{context.ieee}_{conf_data['name']}"
+        self.entity_id = async_entity_id(
+            hass,
+            "binary_sensor",
+            "zha_device_info",
+            context.slug,
+            split_slug(conf_data["name"]),
         )
         
         self._attr_icon = conf_data["icon"]
         self._attr_device_class = conf_data.get("device_class")
-        
-        # Point to ZHA device
-        self._attr_device_info = {
-            "identifiers": {(ZHA_DOMAIN, str(device.ieee))},
-        }
+        self._attr_device_info = context.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Register the binary sensor in the per-device entity index."""
+        self.hass.data[DOMAIN]["entities"].add_binary(self._device, self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Remove the binary sensor from the per-device entity index."""
+        self.hass.data[DOMAIN]["entities"].discard(self._device, self)
 
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
         try:
-            if "available" in self._conf_data["attributes"]:
-                return bool(getattr(self._device, "available", False))
-            elif ATTR_QUIRK_APPLIED in self._conf_data["attributes"]:
-                return bool(getattr(self._device, "quirk_applied", False))
-            return False
+            return bool(self._value(self._snapshot(), self._data))
         except Exception as err:
             _LOGGER.error(
                 "Error getting binary sensor state for device %s: %s",
@@ -115,15 +133,13 @@ class ZHADeviceBinarySensor(BinarySensorEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return additional attributes based on the sensor type."""
-        attributes = {}
-        if ATTR_QUIRK_APPLIED in self._conf_data["attributes"]:
-            # Add quirk name as attribute if quirk is applied
-            if self._device.quirk_applied:
-                quirk = self._device.quirk_class
-                if isinstance(quirk, str):
-                    attributes[ATTR_QUIRK_CLASS] = quirk
-                elif hasattr(quirk, "__name__"):
-                    attributes[ATTR_QUIRK_CLASS] = quirk.__name__
-                else:
-                    attributes[ATTR_QUIRK_CLASS] = str(quirk)
-        return attributes
+        if self._extra_attributes is None:
+            return {}
+        return self._extra_attributes(self._snapshot(), self._data)
+
+    def _snapshot(self) -> DeviceSnapshot:
+        """Return the latest snapshot of the device."""
+        snapshot = self._snapshots.get(self._ieee)
+        if snapshot is None:
+            snapshot = DeviceSnapshot.from_device(self._device)
+        return snapshot
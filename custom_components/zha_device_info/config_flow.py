@@ -9,8 +9,23 @@ from .const import (
     SPLITTABLE_ATTRIBUTES,
     DEFAULT_OPTIONS,
     CONF_NAMES,
+    CONF_SCAN_INTERVAL,
+    CONF_WRITE_WINDOW,
+    CONF_PERFORMANCE_SENSORS,
+    CONF_SLIM_MAIN_ENTITY,
+    CONF_LAST_SEEN_GRANULARITY,
+    CONF_LQI_DEADBAND,
+    CONF_RSSI_DEADBAND,
 )
 
+SCAN_INTERVAL_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=0, max=86400))
+WRITE_WINDOW_VALIDATOR = vol.All(vol.Coerce(int), vol.Range(min=0, max=5000))
+THROTTLE_VALIDATORS = {
+    CONF_LAST_SEEN_GRANULARITY: vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+    CONF_LQI_DEADBAND: vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+    CONF_RSSI_DEADBAND: vol.All(vol.Coerce(int), vol.Range(min=0, max=100)),
+}
+
 class ZHADeviceInfoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for ZHA Device Info."""
 
@@ -32,11 +47,33 @@ class ZHADeviceInfoConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=vol.Schema(
                 {
+                    **{
+                        vol.Optional(
+                            conf,
+                            default=DEFAULT_OPTIONS[conf],
+                        ): bool
+                        for conf in SPLITTABLE_ATTRIBUTES
+                    },
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL,
+                        default=DEFAULT_OPTIONS[CONF_SCAN_INTERVAL],
+                    ): SCAN_INTERVAL_VALIDATOR,
+                    vol.Optional(
+                        CONF_WRITE_WINDOW,
+                        default=DEFAULT_OPTIONS[CONF_WRITE_WINDOW],
+                    ): WRITE_WINDOW_VALIDATOR,
+                    vol.Optional(
+                        CONF_PERFORMANCE_SENSORS,
+                        default=DEFAULT_OPTIONS[CONF_PERFORMANCE_SENSORS],
+                    ): bool,
                     vol.Optional(
-                        conf,
-                        default=DEFAULT_OPTIONS[conf],
-                    ): bool
-                    for conf in SPLITTABLE_ATTRIBUTES
+                        CONF_SLIM_MAIN_ENTITY,
+                        default=DEFAULT_OPTIONS[CONF_SLIM_MAIN_ENTITY],
+                    ): bool,
+                    **{
+                        vol.Optional(conf, default=DEFAULT_OPTIONS[conf]): validator
+                        for conf, validator in THROTTLE_VALIDATORS.items()
+                    },
                 }
             ),
         )
@@ -67,11 +104,46 @@ class ZHADeviceInfoOptionsFlow(config_entries.OptionsFlow):
             step_id="init",
             data_schema=vol.Schema(
                 {
+                    **{
+                        vol.Optional(
+                            conf,
+                            default=self.options.get(conf, DEFAULT_OPTIONS[conf]),
+                        ): bool
+                        for conf in SPLITTABLE_ATTRIBUTES
+                    },
+                    vol.Optional(
+                        CONF_SCAN_INTERVAL,
+                        default=self.options.get(
+                            CONF_SCAN_INTERVAL, DEFAULT_OPTIONS[CONF_SCAN_INTERVAL]
+                        ),
+                    ): SCAN_INTERVAL_VALIDATOR,
+                    vol.Optional(
+                        CONF_WRITE_WINDOW,
+                        default=self.options.get(
+                            CONF_WRITE_WINDOW, DEFAULT_OPTIONS[CONF_WRITE_WINDOW]
+                        ),
+                    ): WRITE_WINDOW_VALIDATOR,
+                    vol.Optional(
+                        CONF_PERFORMANCE_SENSORS,
+                        default=self.options.get(
+                            CONF_PERFORMANCE_SENSORS,
+                            DEFAULT_OPTIONS[CONF_PERFORMANCE_SENSORS],
+                        ),
+                    ): bool,
                     vol.Optional(
-                        conf,
-                        default=self.options.get(conf, DEFAULT_OPTIONS[conf]),
-                    ): bool
-                    for conf in SPLITTABLE_ATTRIBUTES
+                        CONF_SLIM_MAIN_ENTITY,
+                        default=self.options.get(
+                            CONF_SLIM_MAIN_ENTITY,
+                            DEFAULT_OPTIONS[CONF_SLIM_MAIN_ENTITY],
+                        ),
+                    ): bool,
+                    **{
+                        vol.Optional(
+                            conf,
+                            default=self.options.get(conf, DEFAULT_OPTIONS[conf]),
+                        ): validator
+                        for conf, validator in THROTTLE_VALIDATORS.items()
+                    },
                 }
             ),
         )
@@ -1,20 +1,126 @@
 """Constants for ZHA Device Info integration."""
 
+from datetime import datetime
+from operator import attrgetter
+
 import voluptuous as vol
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
 
 DOMAIN = "zha_device_info"
 PLATFORMS = ["sensor", "binary_sensor"]
 
+# Not imported from the ZHA integration, which would load zigpy with it
+ZHA_DOMAIN = "zha"
+
+# Config entry id -> unsubscribe of entries retrying once ZHA is loaded
+DATA_ZHA_WAITERS = f"{DOMAIN}_zha_waiters"
+
+# Seconds to coalesce pushed ZHA device changes before refreshing
+PUSH_UPDATE_DELAY = 0.5
+
+# ZHA device events
+ZHA_EVENT = "zha_event"
+ZHA_DEVICE_OFFLINE = "device_offline"
+
+# ZHA gateway events
+ZHA_GW_DEVICE_JOINED = "device_joined"
+ZHA_GW_DEVICE_FULL_INIT = "device_fully_initialized"
+ZHA_GW_DEVICE_REMOVED = "device_removed"
+
+# Dispatched with the DeviceContext of a device paired after setup
+SIGNAL_DEVICE_ADDED = "zha_device_info_device_added"
+
+# Periodic reconciliation scan
+CONF_SCAN_INTERVAL = "scan_interval"
+DEFAULT_SCAN_INTERVAL = 300  # seconds, 0 disables the scan
+SCAN_SHARDS = 12  # buckets refreshed one per tick
+SCAN_JITTER = 0.1  # +/- fraction of a tick
+SCAN_CHUNK_BUDGET = 0.01  # seconds of work before yielding to the loop
+
+# Persisted device snapshots
+STORAGE_KEY = f"{DOMAIN}.snapshots"
+STORAGE_VERSION = 1
+STORE_SAVE_DELAY = 30  # seconds, saves are debounced
+
+# Coalesced entity state writes
+CONF_WRITE_WINDOW = "write_window"
+DEFAULT_WRITE_WINDOW = 250  # milliseconds, 0 writes immediately
+
+# Rolling LQI/RSSI history
+HISTORY_SIZE = 60  # samples kept per device
+HISTORY_STATS_INTERVAL = 300  # seconds between recomputing the rolling stats
+
+# Stale device detection, seconds without messages per ZHA power source
+EVENT_DEVICE_STALE = "zha_device_info_stale"
+STALE_THRESHOLDS = {
+    "Mains": 2 * 60 * 60,
+    "Battery or Unknown": 6 * 60 * 60,
+}
+DEFAULT_STALE_THRESHOLD = 6 * 60 * 60
+
 # Service names
 SERVICE_UPDATE = "update"
 SERVICE_EXPORT = "export"
+SERVICE_QUERY = "query"
+SERVICE_PROFILE = "profile"
+
+# Capture modes of the profile service
+PROFILE_MODE_CPROFILE = "cprofile"
+PROFILE_MODE_TIMING = "timing"
+PROFILE_MODES = [PROFILE_MODE_TIMING, PROFILE_MODE_CPROFILE]
+
+# Export formats
+EXPORT_FORMAT_JSON = "json"
+EXPORT_FORMAT_NDJSON = "ndjson"
+EXPORT_FORMATS = [EXPORT_FORMAT_JSON, EXPORT_FORMAT_NDJSON]
+EXPORT_COMPRESS_NONE = "none"
+EXPORT_COMPRESS_GZIP = "gzip"
+EXPORT_COMPRESSIONS = [EXPORT_COMPRESS_NONE, EXPORT_COMPRESS_GZIP]
+EXPORT_MODE_FULL = "full"
+EXPORT_MODE_DELTA = "delta"
+EXPORT_MODE_TOPOLOGY = "topology"
+EXPORT_MODES = [EXPORT_MODE_FULL, EXPORT_MODE_DELTA, EXPORT_MODE_TOPOLOGY]
 
 # Service schemas
 SERVICE_SCHEMAS = {
-    SERVICE_UPDATE: vol.Schema({}),
+    SERVICE_UPDATE: vol.Schema({
+        vol.Optional("ieee"): str,
+        # Milliseconds of work per chunk before yielding to the event loop
+        vol.Optional("chunk_budget"): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=1000)
+        ),
+    }),
     SERVICE_EXPORT: vol.Schema({
         vol.Optional("path"): str,
-    })
+        vol.Optional("format", default=EXPORT_FORMAT_JSON): vol.In(EXPORT_FORMATS),
+        vol.Optional("compress", default=EXPORT_COMPRESS_NONE): vol.In(
+            EXPORT_COMPRESSIONS
+        ),
+        vol.Optional("mode", default=EXPORT_MODE_FULL): vol.In(EXPORT_MODES),
+        vol.Optional("details", default=False): cv.boolean,
+    }),
+    SERVICE_QUERY: vol.Schema({
+        vol.Optional("manufacturer"): vol.All(cv.ensure_list, [str]),
+        vol.Optional("model"): vol.All(cv.ensure_list, [str]),
+        vol.Optional("quirk_class"): vol.All(cv.ensure_list, [str]),
+        vol.Optional("power_source"): vol.All(cv.ensure_list, [str]),
+        vol.Optional("device_type"): vol.All(cv.ensure_list, [str]),
+        vol.Optional("available"): cv.boolean,
+        vol.Optional("lqi_min"): vol.Coerce(int),
+        vol.Optional("lqi_max"): vol.Coerce(int),
+        vol.Optional("rssi_min"): vol.Coerce(int),
+        vol.Optional("rssi_max"): vol.Coerce(int),
+        vol.Optional("fields"): vol.All(cv.ensure_list, [str]),
+        vol.Optional("details", default=False): cv.boolean,
+    }),
+    SERVICE_PROFILE: vol.Schema({
+        vol.Optional("runs", default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=100)
+        ),
+        vol.Optional("mode", default=PROFILE_MODE_TIMING): vol.In(PROFILE_MODES),
+        vol.Optional("path"): str,
+    }),
 }
 
 # Attributes
@@ -31,10 +137,14 @@ ATTR_RSSI = "rssi"
 ATTR_LAST_SEEN = "last_seen"
 ATTR_AVAILABLE = "available"
 ATTR_DEVICE_TYPE = "device_type"
+ATTR_STALE = "stale"  # derived from last_seen, not a snapshot field
 ATTR_SIGNATURE = "signature"
 ATTR_CLUSTER_DETAILS = "cluster_details"
 ATTR_ENDPOINTS = "endpoints"
 
+# Main sensor attributes that change with nearly every message of a device
+VOLATILE_ATTRIBUTES = frozenset({ATTR_LQI, ATTR_RSSI, ATTR_LAST_SEEN, ATTR_AVAILABLE})
+
 # Splittable Attributes Configuration
 CONF_SPLIT_LAST_SEEN = "split_last_seen"  # Changed format
 CONF_SPLIT_AVAILABILITY = "split_availability"  # Changed format
@@ -42,6 +152,31 @@ CONF_SPLIT_POWER = "split_power_source"  # Changed format
 CONF_SPLIT_NWK = "split_network_address"  # Changed format
 CONF_SPLIT_QUIRK = "split_quirk_info"  # Changed format
 CONF_SPLIT_DEVICE_TYPE = "split_device_type"  # Changed format
+CONF_SPLIT_STALE = "split_stale"
+CONF_SPLIT_LQI = "split_lqi"
+CONF_SPLIT_RSSI = "split_rssi"
+
+
+# Split entity values, called with the device snapshot and hass.data[DOMAIN]
+def _snapshot_value(name):
+    """Return an extractor reading one snapshot field."""
+    getter = attrgetter(name)
+    return lambda snapshot, data: getter(snapshot)
+
+
+def _last_seen_value(snapshot, data):
+    """Return last seen as a local datetime."""
+    if snapshot.last_seen is None:
+        return None
+    return dt_util.as_local(datetime.fromtimestamp(snapshot.last_seen))
+
+
+def _quirk_attributes(snapshot, data):
+    """Return the quirk class of a quirked device."""
+    if snapshot.quirk_applied:
+        return {ATTR_QUIRK_CLASS: snapshot.quirk_class}
+    return {}
+
 
 SPLITTABLE_ATTRIBUTES = {
     CONF_SPLIT_LAST_SEEN: {
@@ -49,6 +184,7 @@ SPLITTABLE_ATTRIBUTES = {
         "attributes": [ATTR_LAST_SEEN],
         "icon": "mdi:clock-outline",
         "device_class": "timestamp",
+        "value": _last_seen_value,
     },
     CONF_SPLIT_POWER: {
         "name": "Power Source",
@@ -56,18 +192,39 @@ SPLITTABLE_ATTRIBUTES = {
         "icon": "mdi:battery",
         "device_class": None,  # Remove power device_class
         "state_class": None,
+        "value": lambda snapshot, data: str(snapshot.power_source),
     },
     CONF_SPLIT_NWK: {
         "name": "Network Address",
         "attributes": [ATTR_NWK],
         "icon": "mdi:identifier",
         "device_class": None,
+        "value": _snapshot_value("nwk_hex"),
     },
     CONF_SPLIT_DEVICE_TYPE: {
         "name": "Device Type",
         "attributes": [ATTR_DEVICE_TYPE],
         "icon": "mdi:tag",
         "device_class": None,
+        "value": _snapshot_value("device_type"),
+    },
+    # Recorded as long-term statistics rather than attribute history
+    CONF_SPLIT_LQI: {
+        "name": "LQI",
+        "attributes": [ATTR_LQI],
+        "icon": "mdi:signal",
+        "device_class": None,
+        "state_class": "measurement",
+        "value": _snapshot_value("lqi"),
+    },
+    CONF_SPLIT_RSSI: {
+        "name": "RSSI",
+        "attributes": [ATTR_RSSI],
+        "icon": "mdi:signal-distance-variant",
+        "device_class": "signal_strength",
+        "state_class": "measurement",
+        "unit": "dBm",
+        "value": _snapshot_value("rssi"),
     },
     # Keep these in SPLITTABLE_ATTRIBUTES for config flow
     CONF_SPLIT_AVAILABILITY: {
@@ -76,6 +233,7 @@ SPLITTABLE_ATTRIBUTES = {
         "icon": "mdi:check-network-outline",
         "device_class": None,
         "platform": "binary_sensor",  # Add platform identifier
+        "value": _snapshot_value("available"),
     },
     CONF_SPLIT_QUIRK: {
         "name": "Quirk Info",
@@ -83,6 +241,84 @@ SPLITTABLE_ATTRIBUTES = {
         "icon": "mdi:puzzle",
         "device_class": None,
         "platform": "binary_sensor",  # Add platform identifier
+        "value": _snapshot_value("quirk_applied"),
+        "extra_attributes": _quirk_attributes,
+    },
+    CONF_SPLIT_STALE: {
+        "name": "Stale",
+        "attributes": [ATTR_STALE],
+        "icon": "mdi:timer-alert-outline",
+        "device_class": "problem",
+        "platform": "binary_sensor",
+        # Written by the stale tracker when the device flips
+        "value": lambda snapshot, data: snapshot.ieee in data["stale"].stale,
+    },
+}
+
+# Mesh-wide summary sensors
+MESH_SENSORS = {
+    "devices": {
+        "name": "Devices",
+        "icon": "mdi:zigbee",
+        "unit": None,
+    },
+    "unavailable": {
+        "name": "Unavailable Devices",
+        "icon": "mdi:lan-disconnect",
+        "unit": None,
+    },
+    "lqi": {
+        "name": "Median LQI",
+        "icon": "mdi:signal",
+        "unit": None,
+    },
+    "rssi": {
+        "name": "Median RSSI",
+        "icon": "mdi:signal-distance-variant",
+        "unit": "dBm",
+    },
+}
+
+# Minimum change before a throttled value is written, 0 writes every change
+CONF_LAST_SEEN_GRANULARITY = "last_seen_granularity"  # minutes
+CONF_LQI_DEADBAND = "lqi_deadband"
+CONF_RSSI_DEADBAND = "rssi_deadband"  # dB
+
+# Main sensor without volatile attributes
+CONF_SLIM_MAIN_ENTITY = "slim_main_entity"
+
+# Optional performance sensors
+CONF_PERFORMANCE_SENSORS = "performance_sensors"
+PERF_SENSORS = {
+    "update_duration": {
+        "name": "Last Update Duration",
+        "icon": "mdi:timer-outline",
+        "unit": "ms",
+    },
+    "devices_scanned": {
+        "name": "Last Update Devices Scanned",
+        "icon": "mdi:magnify-scan",
+        "unit": None,
+    },
+    "entities_written": {
+        "name": "Last Update Entities Written",
+        "icon": "mdi:pencil",
+        "unit": None,
+    },
+    "device_errors": {
+        "name": "Device Errors",
+        "icon": "mdi:alert-circle-outline",
+        "unit": None,
+    },
+    "export_duration": {
+        "name": "Last Export Duration",
+        "icon": "mdi:timer-outline",
+        "unit": "ms",
+    },
+    "export_bytes": {
+        "name": "Last Export Size",
+        "icon": "mdi:file-outline",
+        "unit": "B",
     },
 }
 
@@ -94,6 +330,16 @@ CONF_NAMES = {
     "split_network_address": "Split Network Address",
     "split_quirk_info": "Split Quirk Info",
     "split_device_type": "Split Device Type",
+    "split_stale": "Split Stale",
+    "split_lqi": "Split LQI",
+    "split_rssi": "Split RSSI",
+    "scan_interval": "Refresh Interval",
+    "write_window": "Write Batch Window",
+    "performance_sensors": "Performance Sensors",
+    "slim_main_entity": "Slim Main Entity",
+    "last_seen_granularity": "Last Seen Granularity",
+    "lqi_deadband": "LQI Deadband",
+    "rssi_deadband": "RSSI Deadband",
 }
 
 # Default configuration
@@ -104,4 +350,14 @@ DEFAULT_OPTIONS = {
     CONF_SPLIT_NWK: False,
     CONF_SPLIT_QUIRK: False,
     CONF_SPLIT_DEVICE_TYPE: False,
+    CONF_SPLIT_STALE: False,
+    CONF_SPLIT_LQI: False,
+    CONF_SPLIT_RSSI: False,
+    CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
+    CONF_WRITE_WINDOW: DEFAULT_WRITE_WINDOW,
+    CONF_PERFORMANCE_SENSORS: False,
+    CONF_SLIM_MAIN_ENTITY: False,
+    CONF_LAST_SEEN_GRANULARITY: 0,
+    CONF_LQI_DEADBAND: 0,
+    CONF_RSSI_DEADBAND: 0,
 }
\ No newline at end of file
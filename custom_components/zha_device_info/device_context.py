@@ -0,0 +1,114 @@
+"""Per-device data shared by every entity created at platform setup."""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import async_get
+from slugify import slugify
+
+from .const import DEFAULT_OPTIONS, DOMAIN, SPLITTABLE_ATTRIBUTES, ZHA_DOMAIN
+
+
+def get_zha_gateway(hass: HomeAssistant) -> Optional[Any]:
+    """Return the ZHA gateway, or None while ZHA is not set up."""
+    zha_data = hass.data.get(ZHA_DOMAIN)
+    if not zha_data or not zha_data.gateway_proxy:
+        return None
+    return zha_data.gateway_proxy.gateway
+
+
+def get_zha_device(gateway, ieee: str) -> Optional[Any]:
+    """Return the gateway's ZHA device with an IEEE address, or None."""
+    # zigpy is loaded with ZHA by now, it is only imported when needed
+    from zigpy.types import EUI64  # pylint: disable=import-outside-toplevel
+
+    try:
+        key = EUI64.convert(ieee)
+    except (AssertionError, ValueError):
+        return None
+    return gateway.devices.get(key)
+
+
+class DeviceContext:
+    """Name and identifiers of a ZHA device, resolved once per setup."""
+
+    __slots__ = ("device", "ieee", "name", "slug", "device_info")
+
+    def __init__(self, device, device_entry) -> None:
+        """Initialize from a ZHA device and its device registry entry."""
+        self.device = device
+        self.ieee = str(device.ieee)
+        # Use name_by_user if available, otherwise use device name
+        if device_entry and device_entry.name_by_user:
+            self.name = device_entry.name_by_user
+        else:
+            self.name = device.name
+        # Slugified once for every entity id of the device
+        self.slug = slugify(self.name, separator="_")
+        # Point to ZHA device instead of creating new one
+        self.device_info = {"identifiers": {(ZHA_DOMAIN, self.ieee)}}
+
+
+@lru_cache(maxsize=None)
+def split_slug(name: str) -> str:
+    """Return the entity id part of a split attribute name."""
+    return slugify(name, separator="_")
+
+
+@callback
+def async_entity_id(hass: HomeAssistant, domain: str, *parts: str) -> str:
+    """Return a free entity id joined from already slugified parts.
+
+    Gives the id ``async_generate_entity_id`` would, without slugifying
+    the device name again for each of its entities.
+    """
+    preferred = f"{domain}.{'_'.join(part for part in parts if part)}"
+    entity_id = preferred
+    tries = 1
+    while not hass.states.async_available(entity_id):
+        tries += 1
+        entity_id = f"{preferred}_{tries}"
+    return entity_id
+
+
+def build_device_contexts(devices: Iterable[Any], device_registry) -> List[DeviceContext]:
+    """Look up every device in the device registry once."""
+    contexts = []
+    for device in devices:
+        if device is None:
+            continue
+        device_entry = device_registry.async_get_device(
+            identifiers={(ZHA_DOMAIN, str(device.ieee))},
+        )
+        contexts.append(DeviceContext(device, device_entry))
+    return contexts
+
+
+def enabled_splits(options: Mapping[str, Any], platform: str) -> List[Dict[str, Any]]:
+    """Return the split attribute configs enabled for a platform."""
+    return [
+        conf_data
+        for conf, conf_data in SPLITTABLE_ATTRIBUTES.items()
+        if conf_data.get("platform", "sensor") == platform
+        and options.get(conf, DEFAULT_OPTIONS[conf])
+    ]
+
+
+@callback
+def async_get_device_contexts(hass: HomeAssistant) -> List[DeviceContext]:
+    """Return the contexts of every ZHA device, shared by both platforms.
+
+    Built by whichever platform sets up first and dropped once the config
+    entry finished forwarding its platforms.
+    """
+    data = hass.data[DOMAIN]
+    contexts = data.get("device_contexts")
+    if contexts is None:
+        gateway = get_zha_gateway(hass)
+        contexts = data["device_contexts"] = build_device_contexts(
+            gateway.devices.values(), async_get(hass)
+        )
+    return contexts
@@ -0,0 +1,39 @@
+"""Diagnostics support for ZHA Device Info."""
+
+from typing import Any, Dict
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return the state of the update pipeline for a config entry."""
+    data = hass.data.get(DOMAIN, {})
+    scheduler = data.get("scheduler")
+    profiler = data.get("profiler")
+    scan_task = data.get("scan_task")
+    return {
+        "options": dict(entry.options),
+        "devices": len(data.get("device_registry", {})),
+        "devices_with_entities": len(data.get("entities", ())),
+        "change_seq": data.get("change_seq", 0),
+        "tombstones": len(data.get("removed", {})),
+        "stale_devices": len(data["stale"].stale) if "stale" in data else None,
+        "listener": "listener" in data,
+        "scheduler": scheduler.diagnostics if scheduler is not None else None,
+        "scan_running": scan_task is not None and not scan_task.done(),
+        "last_update": data.get("last_update"),
+        "last_export": data.get("last_export"),
+        "export_watermark": data.get("export_watermark"),
+        "writes": data["writer"].stats if "writer" in data else None,
+        "device_errors": data.get("device_errors", {}),
+        "signature_models": len(data["signatures"]) if "signatures" in data else None,
+        "profiler": (
+            {"mode": profiler.mode, "remaining": profiler.remaining}
+            if profiler is not None else None
+        ),
+    }
@@ -0,0 +1,99 @@
+"""Per-device index of ZHA Device Info entities."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class DeviceEntities:
+    """Entities created for a single ZHA device."""
+
+    __slots__ = ("device", "main", "split", "binary")
+
+    def __init__(self, device) -> None:
+        """Initialize the entry."""
+        self.device = device
+        self.main: Optional[Any] = None
+        self.split: List[Any] = []
+        self.binary: List[Any] = []
+
+    def __iter__(self) -> Iterator[Any]:
+        """Iterate over every entity of the device exactly once."""
+        if self.main is not None:
+            yield self.main
+        yield from self.split
+        yield from self.binary
+
+    def __bool__(self) -> bool:
+        """Return True if the device still has entities."""
+        return self.main is not None or bool(self.split) or bool(self.binary)
+
+
+class EntityIndex:
+    """Index of ZHA Device Info entities keyed by IEEE address."""
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self._devices: Dict[str, DeviceEntities] = {}
+
+    def _entry(self, device) -> DeviceEntities:
+        """Return the entry for a device, creating it if needed."""
+        ieee = str(device.ieee)
+        entry = self._devices.get(ieee)
+        if entry is None:
+            entry = self._devices[ieee] = DeviceEntities(device)
+        else:
+            entry.device = device
+        return entry
+
+    def add_main(self, device, entity) -> None:
+        """Register the main ZHA Device Info sensor of a device."""
+        self._entry(device).main = entity
+
+    def add_split(self, device, entity) -> None:
+        """Register a split attribute sensor of a device."""
+        entry = self._entry(device)
+        if entity not in entry.split:
+            entry.split.append(entity)
+
+    def add_binary(self, device, entity) -> None:
+        """Register a split binary sensor of a device."""
+        entry = self._entry(device)
+        if entity not in entry.binary:
+            entry.binary.append(entity)
+
+    def discard(self, device, entity) -> None:
+        """Remove an entity from the index if present."""
+        ieee = str(device.ieee)
+        entry = self._devices.get(ieee)
+        if entry is None:
+            return
+        if entry.main is entity:
+            entry.main = None
+        elif entity in entry.split:
+            entry.split.remove(entity)
+        elif entity in entry.binary:
+            entry.binary.remove(entity)
+        if not entry:
+            del self._devices[ieee]
+
+    def get(self, ieee: str) -> Optional[DeviceEntities]:
+        """Return the entities of a device by IEEE address."""
+        return self._devices.get(ieee)
+
+    def entities(self) -> Iterator[Any]:
+        """Iterate over every indexed entity exactly once."""
+        for entry in self._devices.values():
+            yield from entry
+
+    def __contains__(self, ieee: object) -> bool:
+        """Return True if the IEEE address is indexed."""
+        return ieee in self._devices
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the indexed IEEE addresses."""
+        return iter(self._devices)
+
+    def __len__(self) -> int:
+        """Return the number of indexed devices."""
+        return len(self._devices)
@@ -0,0 +1,151 @@
+"""Streaming export of ZHA Device Info snapshots."""
+
+import gzip
+import os
+import tempfile
+from contextlib import suppress
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Mapping, Optional
+
+from homeassistant.helpers.json import json_bytes
+
+from .const import EXPORT_COMPRESS_GZIP, EXPORT_FORMAT_JSON, EXPORT_FORMAT_NDJSON
+from .signature import ModelDetails
+from .snapshot import DeviceSnapshot
+
+# IEEE -> shared model details, only set when they are exported
+Details = Optional[Mapping[str, ModelDetails]]
+
+
+def _document(snapshot: DeviceSnapshot, details: Details) -> Dict[str, Any]:
+    """Return the exported attributes of a device."""
+    document = dict(snapshot.attributes)
+    if details is not None:
+        model = details.get(snapshot.ieee)
+        if model is not None:
+            document.update(model.as_dict())
+    return document
+
+
+def _write_json(
+    stream: BinaryIO, snapshots: Iterable[DeviceSnapshot], details: Details = None
+) -> None:
+    """Write snapshots as one JSON object keyed by IEEE, one device per line."""
+    stream.write(b"{")
+    separator = b"\n"
+    for snapshot in snapshots:
+        stream.write(separator)
+        stream.write(json_bytes(snapshot.ieee))
+        stream.write(b": ")
+        stream.write(json_bytes(_document(snapshot, details)))
+        separator = b",\n"
+    stream.write(b"\n}\n")
+
+
+def _write_ndjson(
+    stream: BinaryIO, snapshots: Iterable[DeviceSnapshot], details: Details = None
+) -> None:
+    """Write one JSON document per device per line."""
+    for snapshot in snapshots:
+        stream.write(json_bytes(_document(snapshot, details)))
+        stream.write(b"\n")
+
+
+def _write_delta(
+    stream: BinaryIO,
+    header: Dict[str, Any],
+    upserts: Iterable[DeviceSnapshot],
+    removed: Iterable[str],
+    details: Details = None,
+) -> None:
+    """Write a replayable delta as NDJSON: a header, then one op per line."""
+    stream.write(json_bytes(header))
+    stream.write(b"\n")
+    for snapshot in upserts:
+        stream.write(json_bytes({
+            "op": "upsert",
+            "ieee": snapshot.ieee,
+            "device": _document(snapshot, details),
+        }))
+        stream.write(b"\n")
+    for ieee in removed:
+        stream.write(json_bytes({"op": "remove", "ieee": ieee}))
+        stream.write(b"\n")
+
+
+EXPORT_WRITERS: Dict[str, Callable[[BinaryIO, Iterable[DeviceSnapshot], Details], None]] = {
+    EXPORT_FORMAT_JSON: _write_json,
+    EXPORT_FORMAT_NDJSON: _write_ndjson,
+}
+
+
+def default_export_path(base: str, export_format: str, compress: Optional[str]) -> str:
+    """Return the default file name for an export format."""
+    path = f"{base}.{export_format}"
+    if compress == EXPORT_COMPRESS_GZIP:
+        path += ".gz"
+    return path
+
+
+def write_atomic(
+    path: str,
+    write: Callable[[BinaryIO], None],
+    compress: Optional[str] = None,
+) -> int:
+    """Stream content to a temp file and rename it over ``path``.
+
+    The target is only replaced once the file has been completely written
+    and flushed, so a failed export never clobbers a good one. Returns the
+    number of bytes written to disk.
+    """
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".",
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            if compress == EXPORT_COMPRESS_GZIP:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as stream:
+                    write(stream)
+            else:
+                write(raw)
+            raw.flush()
+            os.fsync(raw.fileno())
+            size = raw.tell()
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+    return size
+
+
+def write_export(
+    path: str,
+    snapshots: Iterable[DeviceSnapshot],
+    export_format: str = EXPORT_FORMAT_JSON,
+    compress: Optional[str] = None,
+    details: Details = None,
+) -> int:
+    """Stream snapshots to ``path`` atomically, run in the executor."""
+    writer = EXPORT_WRITERS[export_format]
+    return write_atomic(
+        path, lambda stream: writer(stream, snapshots, details), compress
+    )
+
+
+def write_delta_export(
+    path: str,
+    header: Dict[str, Any],
+    upserts: Iterable[DeviceSnapshot],
+    removed: Iterable[str],
+    compress: Optional[str] = None,
+    details: Details = None,
+) -> int:
+    """Stream a delta export to ``path`` atomically, run in the executor."""
+    return write_atomic(
+        path,
+        lambda stream: _write_delta(stream, header, upserts, removed, details),
+        compress,
+    )
@@ -0,0 +1,222 @@
+"""Rolling LQI and RSSI history for every ZHA device."""
+
+from __future__ import annotations
+
+import logging
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Set once the missing numpy has been reported
+_numpy_missing_logged = False
+
+# Metric name, array typecode and the value range the typecode can hold
+METRICS = (
+    ("lqi", "B", 0, 255),
+    ("rssi", "b", -128, 127),
+)
+
+# Attributes the rolling stats add to the main sensor
+STAT_ATTRIBUTES = frozenset(
+    f"{name}_{stat}" for name, *_ in METRICS for stat in ("mean", "p5", "slope")
+)
+
+
+def _clamp(value: int, low: int, high: int) -> int:
+    """Clamp a sample to the range of its buffer."""
+    return low if value < low else high if value > high else value
+
+
+class SignalHistory:
+    """Fixed-size ring buffers of LQI and RSSI samples for the whole mesh.
+
+    Each metric is one flat, preallocated ``array`` holding a row of
+    ``size`` samples per device, so memory is ``devices * size`` bytes per
+    metric and recording a sample is two index writes. Rows of removed
+    devices are reused.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize empty buffers."""
+        self.size = size
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._capacity = 0
+        self._buffers = {name: array(typecode) for name, typecode, _, _ in METRICS}
+        self._heads = array("H")
+        self._counts = array("H")
+
+    def _grow(self) -> None:
+        """Double the number of rows."""
+        extra = max(self._capacity, 16)
+        for name, typecode, _, _ in METRICS:
+            self._buffers[name].extend(array(typecode, bytes(extra * self.size)))
+        self._heads.extend(array("H", bytes(2 * extra)))
+        self._counts.extend(array("H", bytes(2 * extra)))
+        self._free.extend(range(self._capacity + extra - 1, self._capacity - 1, -1))
+        self._capacity += extra
+
+    def record(self, ieee: str, lqi: Optional[int], rssi: Optional[int]) -> None:
+        """Append one sample for a device, overwriting the oldest when full."""
+        if lqi is None or rssi is None:
+            return
+        row = self._rows.get(ieee)
+        if row is None:
+            if not self._free:
+                self._grow()
+            row = self._rows[ieee] = self._free.pop()
+            self._heads[row] = 0
+            self._counts[row] = 0
+
+        head = self._heads[row]
+        offset = row * self.size + head
+        for (name, _, low, high), value in zip(METRICS, (lqi, rssi)):
+            self._buffers[name][offset] = _clamp(value, low, high)
+        self._heads[row] = (head + 1) % self.size
+        if self._counts[row] < self.size:
+            self._counts[row] += 1
+
+    def remove(self, ieee: str) -> None:
+        """Forget the samples of a device."""
+        row = self._rows.pop(ieee, None)
+        if row is not None:
+            self._free.append(row)
+
+    def copy(self) -> Tuple[Dict[str, int], Dict[str, bytes], bytes, bytes]:
+        """Return a consistent copy of the buffers for computing off the loop."""
+        return (
+            dict(self._rows),
+            {name: buffer.tobytes() for name, buffer in self._buffers.items()},
+            self._heads.tobytes(),
+            self._counts.tobytes(),
+        )
+
+
+def compute_stats(
+    size: int,
+    rows: Dict[str, int],
+    buffers: Dict[str, bytes],
+    heads: bytes,
+    counts: bytes,
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """Return rolling mean, p5 and slope per device in one vectorized pass.
+
+    Runs in the executor on a copy made by ``SignalHistory.copy``. Slope is
+    the least-squares change per sample, oldest to newest.
+    """
+    global _numpy_missing_logged  # pylint: disable=global-statement
+    try:
+        import numpy as np  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        # numpy is a requirement, this only happens in a broken install
+        if not _numpy_missing_logged:
+            _numpy_missing_logged = True
+            _LOGGER.warning("numpy is not available, LQI/RSSI history stats disabled")
+        return {}
+
+    if not rows:
+        return {}
+
+    ieees = list(rows)
+    index = np.fromiter(rows.values(), dtype=np.intp, count=len(ieees))
+    head = np.frombuffer(heads, dtype=np.uint16)[index].astype(np.intp)
+    count = np.frombuffer(counts, dtype=np.uint16)[index].astype(np.intp)
+
+    # Chronological rank of every slot: 0 is the oldest sample
+    positions = np.arange(size)[None, :]
+    rank = (positions - head[:, None]) % size
+    missing = size - count
+    valid = rank >= missing[:, None]
+    rank = rank - missing[:, None]
+    samples = np.maximum(count, 1)
+
+    x_mean = (count - 1) / 2
+    x_dev = np.where(valid, rank - x_mean[:, None], 0.0)
+    x_var = (x_dev * x_dev).sum(axis=1)
+
+    p5_rank = 0.05 * (count - 1)
+    p5_low = np.floor(p5_rank).astype(np.intp)
+    p5_high = np.minimum(p5_low + 1, np.maximum(count - 1, 0))
+    p5_weight = p5_rank - p5_low
+
+    results: Dict[str, Dict[str, Optional[float]]] = {ieee: {} for ieee in ieees}
+    for name, typecode, _, _ in METRICS:
+        dtype = np.uint8 if typecode == "B" else np.int8
+        values = (
+            np.frombuffer(buffers[name], dtype=dtype)
+            .reshape(-1, size)[index]
+            .astype(np.float64)
+        )
+        masked = np.where(valid, values, 0.0)
+        mean = masked.sum(axis=1) / samples
+        y_dev = np.where(valid, values - mean[:, None], 0.0)
+        slope = np.divide(
+            (x_dev * y_dev).sum(axis=1),
+            x_var,
+            out=np.zeros(len(ieees)),
+            where=x_var > 0,
+        )
+        ordered = np.sort(np.where(valid, values, np.inf), axis=1)
+        low = np.take_along_axis(ordered, p5_low[:, None], axis=1)[:, 0]
+        high = np.take_along_axis(ordered, p5_high[:, None], axis=1)[:, 0]
+        p5 = low + (high - low) * p5_weight
+
+        for position, ieee in enumerate(ieees):
+            if count[position] == 0:
+                continue
+            stats = results[ieee]
+            stats[f"{name}_mean"] = round(float(mean[position]), 1)
+            stats[f"{name}_p5"] = round(float(p5[position]), 1)
+            stats[f"{name}_slope"] = round(float(slope[position]), 2)
+
+    return results
+
+
+async def async_refresh_history_stats(hass: HomeAssistant, _now=None) -> None:
+    """Recompute the rolling stats and write the main sensors that changed.
+
+    Like device updates, the writes go through each sensor's throttle, so
+    the deadbands also hold back small moves of the stats.
+    """
+    data = hass.data.get(DOMAIN)
+    if data is None:
+        return
+    history: SignalHistory = data["history"]
+    stats = await hass.async_add_executor_job(
+        compute_stats, history.size, *history.copy()
+    )
+    old, data["history_stats"] = data["history_stats"], stats
+
+    entities = data["entities"]
+    snapshots = data["device_registry"]
+    writer = data["writer"]
+    written = throttled = 0
+    for ieee, values in stats.items():
+        previous = old.get(ieee)
+        if previous == values:
+            continue
+        entry = entities.get(ieee)
+        if entry is None or entry.main is None or entry.main.slim:
+            continue
+        throttle = entry.main.throttle
+        snapshot = snapshots.get(ieee)
+        if throttle is not None and snapshot is not None:
+            changed = {
+                name for name, value in values.items()
+                if previous is None or previous.get(name) != value
+            }
+            if not throttle.should_write(snapshot, changed, values):
+                throttled += 1
+                continue
+        writer.async_schedule(entry.main)
+        written += 1
+    _LOGGER.debug(
+        "Refreshed LQI/RSSI history stats, %s sensors written, %s throttled",
+        written,
+        throttled,
+    )
@@ -0,0 +1,245 @@
+"""Push ZHA device changes to ZHA Device Info entities."""
+
+import logging
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from homeassistant.config_entries import SIGNAL_CONFIG_ENTRY_CHANGED
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.device_registry import async_get
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    DOMAIN,
+    PUSH_UPDATE_DELAY,
+    SIGNAL_DEVICE_ADDED,
+    ZHA_DEVICE_OFFLINE,
+    ZHA_DOMAIN,
+    ZHA_EVENT,
+    ZHA_GW_DEVICE_FULL_INIT,
+    ZHA_GW_DEVICE_JOINED,
+    ZHA_GW_DEVICE_REMOVED,
+)
+from .device_context import build_device_contexts, get_zha_gateway
+from .updater import (
+    async_finish_update,
+    async_record_error,
+    async_remove_snapshot,
+    async_update_device,
+    new_update_stats,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ZHADeviceInfoListener:
+    """Refresh single devices when ZHA reports traffic or availability changes.
+
+    The listener is registered on the zigpy application controller, which
+    calls ``handle_message`` for every packet received (and therefore every
+    ``last_seen`` bump), and on each ZHA device for its ``device_offline``
+    event. Changed devices are collected and refreshed together after
+    ``PUSH_UPDATE_DELAY`` seconds so chatty devices are coalesced.
+
+    Gateway events add the entities of devices paired after setup and
+    remove those of devices removed from ZHA, one device at a time.
+
+    Reloading ZHA replaces its gateway, so the listener moves its
+    subscriptions to the new gateway whenever the ZHA config entry changes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the listener."""
+        self._hass = hass
+        self._gateway = None
+        self._unsub_entry_changed: Optional[CALLBACK_TYPE] = None
+        self._pending: Set[Any] = set()
+        self._unsub_flush: Optional[CALLBACK_TYPE] = None
+        self._device_unsubs: Dict[Any, Callable[[], None]] = {}
+        self._gateway_unsubs: List[Callable[[], None]] = []
+        # Devices whose entities were requested but may not be added yet
+        self._added: Set[str] = set()
+
+    @callback
+    def async_start(self) -> None:
+        """Start listening to ZHA."""
+        self._unsub_entry_changed = async_dispatcher_connect(
+            self._hass, SIGNAL_CONFIG_ENTRY_CHANGED, self._handle_entry_changed
+        )
+        self._async_subscribe(get_zha_gateway(self._hass))
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening to ZHA."""
+        if self._unsub_entry_changed is not None:
+            self._unsub_entry_changed()
+            self._unsub_entry_changed = None
+        self._async_unsubscribe()
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._pending.clear()
+
+    @callback
+    def _async_subscribe(self, gateway) -> None:
+        """Listen to the controller, events and devices of a gateway."""
+        self._gateway = gateway
+        if gateway is None:
+            return
+        gateway.application_controller.add_listener(self)
+        self._gateway_unsubs = [
+            gateway.on_event(ZHA_GW_DEVICE_JOINED, self._handle_device_added),
+            gateway.on_event(ZHA_GW_DEVICE_FULL_INIT, self._handle_device_added),
+            gateway.on_event(ZHA_GW_DEVICE_REMOVED, self._handle_device_removed),
+        ]
+        for device in gateway.devices.values():
+            if device is not None:
+                self.async_track_device(device)
+        _LOGGER.debug(
+            "Listening to ZHA events for %s devices", len(self._device_unsubs)
+        )
+
+    @callback
+    def _async_unsubscribe(self) -> None:
+        """Stop listening to the current gateway."""
+        gateway, self._gateway = self._gateway, None
+        if gateway is not None:
+            application_controller = gateway.application_controller
+            if application_controller is not None:
+                application_controller.remove_listener(self)
+        for unsub in self._gateway_unsubs:
+            unsub()
+        self._gateway_unsubs.clear()
+        for unsub in self._device_unsubs.values():
+            unsub()
+        self._device_unsubs.clear()
+
+    @callback
+    def _handle_entry_changed(self, change, entry) -> None:
+        """Move to the new gateway when ZHA is set up again."""
+        if entry.domain != ZHA_DOMAIN:
+            return
+        gateway = get_zha_gateway(self._hass)
+        if gateway is self._gateway:
+            return
+        if gateway is None:
+            _LOGGER.debug("ZHA gateway went away, waiting for it to be set up again")
+        else:
+            _LOGGER.info("ZHA gateway changed, listening to the new gateway")
+        self._async_unsubscribe()
+        self._async_subscribe(gateway)
+
+    @callback
+    def async_track_device(self, device) -> None:
+        """Subscribe to the events of a single ZHA device."""
+        if device.ieee in self._device_unsubs:
+            return
+        self._device_unsubs[device.ieee] = device.on_event(
+            ZHA_EVENT, partial(self._handle_zha_event, device.ieee)
+        )
+
+    @callback
+    def async_untrack_device(self, ieee) -> None:
+        """Unsubscribe from the events of a single ZHA device."""
+        unsub = self._device_unsubs.pop(ieee, None)
+        if unsub is not None:
+            unsub()
+        self._pending.discard(ieee)
+
+    @callback
+    def _handle_device_added(self, event) -> None:
+        """Create the entities of a device that joined or finished pairing.
+
+        Joins are reported before and after ZHA initializes the device, so
+        this runs for whichever event finds it in the gateway first. Devices
+        that already have entities, such as a rejoin, are only refreshed.
+        """
+        ieee = event.device_info.ieee
+        if self._gateway is None:
+            return
+        device = self._gateway.devices.get(ieee)
+        if device is None or DOMAIN not in self._hass.data:
+            return
+
+        self.async_track_device(device)
+        self._async_schedule(ieee)
+        key = str(ieee)
+        # Also sent after a re-interview, which may change the signature
+        self._hass.data[DOMAIN]["signatures"].invalidate(key)
+        if key in self._added or key in self._hass.data[DOMAIN]["entities"]:
+            return
+        self._added.add(key)
+        contexts = build_device_contexts([device], async_get(self._hass))
+        _LOGGER.debug("Adding ZHA Device Info entities for new device %s", ieee)
+        async_dispatcher_send(self._hass, SIGNAL_DEVICE_ADDED, contexts[0])
+
+    @callback
+    def _handle_device_removed(self, event) -> None:
+        """Remove the entities and snapshot of a device removed from ZHA."""
+        ieee = event.device_info.ieee
+        self.async_untrack_device(ieee)
+        self._added.discard(str(ieee))
+        data = self._hass.data.get(DOMAIN)
+        if data is None:
+            return
+
+        async_remove_snapshot(self._hass, str(ieee))
+        data["signatures"].forget(str(ieee))
+        entry = data["entities"].get(str(ieee))
+        if entry is not None:
+            _LOGGER.debug("Removing ZHA Device Info entities of device %s", ieee)
+            for entity in list(entry):
+                self._hass.async_create_task(entity.async_remove(force_remove=True))
+        async_finish_update(self._hass, new_update_stats())
+
+    def handle_message(
+        self, sender, profile, cluster, src_ep, dst_ep, message
+    ) -> None:
+        """Handle a message received by the zigpy application controller."""
+        self._async_schedule(sender.ieee)
+
+    @callback
+    def _handle_zha_event(self, ieee, event) -> None:
+        """Handle a ZHA event emitted by a device."""
+        if event.data.get("device_event_type") == ZHA_DEVICE_OFFLINE:
+            self._async_schedule(ieee)
+
+    @callback
+    def _async_schedule(self, ieee) -> None:
+        """Queue a device for the next refresh."""
+        self._pending.add(ieee)
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, PUSH_UPDATE_DELAY, self._async_flush
+            )
+
+    @callback
+    def _async_flush(self, _now) -> None:
+        """Refresh every queued device."""
+        self._unsub_flush = None
+        pending, self._pending = self._pending, set()
+        if DOMAIN not in self._hass.data or self._gateway is None:
+            return
+
+        devices = self._gateway.devices
+        stats = new_update_stats()
+        for ieee in pending:
+            device = devices.get(ieee)
+            if device is None:
+                continue
+            try:
+                async_update_device(self._hass, device, stats)
+            except Exception as dev_err:
+                async_record_error(self._hass, stats, ieee, dev_err)
+
+        async_finish_update(self._hass, stats)
+        _LOGGER.debug(
+            "Pushed ZHA device info: %s of %s devices changed, %s entities written",
+            stats["devices_changed"],
+            stats["devices_scanned"],
+            stats["entities_written"],
+        )
@@ -0,0 +1,129 @@
+"""Performance counters and update profiling for ZHA Device Info."""
+
+import cProfile
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, PROFILE_MODE_CPROFILE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Devices listed in the attributes of the device errors sensor
+TOP_ERROR_DEVICES = 10
+
+
+def performance_values(data: Dict[str, Any]) -> Dict[str, Tuple[Any, Dict[str, Any]]]:
+    """Return the state and attributes of every performance sensor."""
+    last_update = data.get("last_update") or {}
+    last_export = data.get("last_export") or {}
+    errors = data["device_errors"]
+    worst = sorted(errors.items(), key=lambda item: item[1]["count"], reverse=True)
+    return {
+        "update_duration": (
+            last_update.get("duration_ms"),
+            {"finished": last_update.get("finished")},
+        ),
+        "devices_scanned": (
+            last_update.get("devices_scanned"),
+            {"devices_changed": last_update.get("devices_changed")},
+        ),
+        "entities_written": (
+            last_update.get("entities_written"),
+            data["writer"].stats,
+        ),
+        "device_errors": (
+            sum(error["count"] for error in errors.values()),
+            dict(worst[:TOP_ERROR_DEVICES]),
+        ),
+        "export_duration": (
+            last_export.get("duration_ms"),
+            {
+                key: last_export.get(key)
+                for key in ("mode", "format", "compress", "finished")
+            },
+        ),
+        "export_bytes": (last_export.get("bytes"), {"path": last_export.get("path")}),
+    }
+
+
+@callback
+def async_write_performance(hass: HomeAssistant) -> None:
+    """Write the performance sensors after an update or export."""
+    data = hass.data[DOMAIN]
+    for entity in data["perf_entities"].values():
+        data["writer"].async_schedule(entity)
+
+
+class UpdateProfiler:
+    """Capture the next runs of the update action.
+
+    In ``cprofile`` mode each run is profiled and dumped to
+    ``<path>_<run>.prof`` for ``pstats`` or snakeviz. The profile covers
+    everything the event loop ran during the update, including work done
+    while a scan yielded. In ``timing`` mode one JSON line per run with the
+    duration and counters is appended to ``<path>.ndjson``.
+    """
+
+    def __init__(self, mode: str, runs: int, path: str) -> None:
+        """Initialize the profiler."""
+        self.mode = mode
+        self.remaining = runs
+        self.path = path
+        self._run = 0
+
+    def begin(self) -> Optional[cProfile.Profile]:
+        """Start capturing a run."""
+        if self.mode != PROFILE_MODE_CPROFILE:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as err:
+            # Another profiler is already active
+            _LOGGER.warning("Could not profile ZHA device info update: %s", err)
+            return None
+        return profile
+
+    async def async_end(
+        self,
+        hass: HomeAssistant,
+        profile: Optional[cProfile.Profile],
+        duration: float,
+        stats: Optional[Dict[str, Any]],
+    ) -> None:
+        """Finish capturing a run and write its results."""
+        self._run += 1
+        self.remaining -= 1
+        data = hass.data[DOMAIN]
+        if self.remaining <= 0 and data.get("profiler") is self:
+            data.pop("profiler")
+
+        if profile is not None:
+            profile.disable()
+            path = f"{self.path}_{self._run}.prof"
+            await hass.async_add_executor_job(profile.dump_stats, path)
+        elif self.mode != PROFILE_MODE_CPROFILE:
+            path = f"{self.path}.ndjson"
+            line = json.dumps({
+                "run": self._run,
+                "duration_ms": round(duration * 1000, 2),
+                **(stats or {}),
+            })
+            await hass.async_add_executor_job(_append_line, path, line)
+        else:
+            return
+        _LOGGER.info(
+            "Captured ZHA device info update %s to %s, %s runs left",
+            self._run,
+            path,
+            max(self.remaining, 0),
+        )
+
+
+def _append_line(path: str, line: str) -> None:
+    """Append one line to a file, run in the executor."""
+    with open(path, "a", encoding="utf-8") as output:
+        output.write(line + "\n")
@@ -0,0 +1,177 @@
+"""Secondary indexes and queries over ZHA Device Info snapshots."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .signature import ModelDetails
+from .snapshot import DeviceSnapshot
+
+# Snapshot fields indexed by exact value
+CATEGORY_FIELDS = (
+    "manufacturer",
+    "model",
+    "quirk_class",
+    "power_source",
+    "device_type",
+    "available",
+    "quirk_applied",
+)
+
+# Snapshot fields indexed by value for range queries
+RANGE_FIELDS = ("lqi", "rssi")
+
+
+class DeviceIndexes:
+    """Secondary indexes maintained alongside the device registry.
+
+    Category fields map each value to the set of IEEE addresses having it.
+    Range fields keep a sorted list of ``(value, ieee)`` pairs so a range
+    is answered with two bisections.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty indexes."""
+        self._categories: Dict[str, Dict[Any, Set[str]]] = {
+            name: {} for name in CATEGORY_FIELDS
+        }
+        self._ranges: Dict[str, List[Tuple[int, str]]] = {
+            name: [] for name in RANGE_FIELDS
+        }
+
+    def update(
+        self,
+        old: Optional[DeviceSnapshot],
+        new: Optional[DeviceSnapshot],
+        changed: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Move a device from its old to its new values.
+
+        Pass ``new=None`` to remove the device. ``changed`` limits the work
+        to the fields that differ between the snapshots.
+        """
+        snapshot = new or old
+        if snapshot is None:
+            return
+        ieee = snapshot.ieee
+        names = set(changed) if changed is not None and old is not None else None
+
+        for name, index in self._categories.items():
+            if names is not None and name not in names:
+                continue
+            if old is not None:
+                value = getattr(old, name)
+                members = index.get(value)
+                if members is not None:
+                    members.discard(ieee)
+                    if not members:
+                        del index[value]
+            if new is not None:
+                index.setdefault(getattr(new, name), set()).add(ieee)
+
+        for name, ordered in self._ranges.items():
+            if names is not None and name not in names:
+                continue
+            if old is not None and (value := getattr(old, name)) is not None:
+                position = bisect_left(ordered, (value, ieee))
+                if position < len(ordered) and ordered[position] == (value, ieee):
+                    del ordered[position]
+            if new is not None and (value := getattr(new, name)) is not None:
+                insort(ordered, (value, ieee))
+
+    def counts(self, name: str) -> Dict[Any, int]:
+        """Return the number of devices per value of a category field."""
+        return {
+            value: len(members)
+            for value, members in self._categories[name].items()
+        }
+
+    def size(self, name: str) -> int:
+        """Return the number of devices with a value for a range field."""
+        return len(self._ranges[name])
+
+    def percentile(self, name: str, fraction: float) -> Optional[float]:
+        """Return a linearly interpolated percentile of a range field."""
+        ordered = self._ranges[name]
+        if not ordered:
+            return None
+        position = fraction * (len(ordered) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        low_value = ordered[lower][0]
+        value = low_value + (ordered[upper][0] - low_value) * (position - lower)
+        return round(value, 1)
+
+    def matching(self, name: str, values: Iterable[Any]) -> Set[str]:
+        """Return the devices whose category field equals any of the values."""
+        index = self._categories[name]
+        result: Set[str] = set()
+        for value in values:
+            result |= index.get(value, set())
+        return result
+
+    def in_range(
+        self, name: str, minimum: Optional[int], maximum: Optional[int]
+    ) -> Set[str]:
+        """Return the devices whose range field is within the bounds."""
+        ordered = self._ranges[name]
+        start = 0 if minimum is None else bisect_left(ordered, (minimum, ""))
+        if maximum is None:
+            end = len(ordered)
+        else:
+            # Sorts after every IEEE address with the same value
+            end = bisect_right(ordered, (maximum, "\U0010ffff"))
+        return {ieee for _value, ieee in ordered[start:end]}
+
+
+def query_devices(
+    snapshots: Mapping[str, DeviceSnapshot],
+    indexes: DeviceIndexes,
+    filters: Mapping[str, Any],
+    fields: Optional[Iterable[str]] = None,
+    details: Optional[Callable[[str], Optional[ModelDetails]]] = None,
+) -> List[Dict[str, Any]]:
+    """Return the projected attributes of devices matching every filter.
+
+    ``details`` looks up the shared model details of a device. They are
+    added to every device, or only the requested detail fields, if given.
+    """
+    candidates: List[Set[str]] = []
+    for name in CATEGORY_FIELDS:
+        if name in filters:
+            values = filters[name]
+            if not isinstance(values, (list, tuple, set)):
+                values = [values]
+            candidates.append(indexes.matching(name, values))
+    for name in RANGE_FIELDS:
+        minimum = filters.get(f"{name}_min")
+        maximum = filters.get(f"{name}_max")
+        if minimum is not None or maximum is not None:
+            candidates.append(indexes.in_range(name, minimum, maximum))
+
+    if candidates:
+        # Intersect starting from the most selective filter
+        candidates.sort(key=len)
+        matches = candidates[0].intersection(*candidates[1:])
+    else:
+        matches = set(snapshots)
+
+    fields = list(fields) if fields else None
+    results = []
+    for ieee in sorted(matches):
+        snapshot = snapshots.get(ieee)
+        if snapshot is None:
+            continue
+        attributes = snapshot.attributes
+        if details is not None:
+            model = details(ieee)
+            if model is not None:
+                attributes = {**attributes, **model.as_dict()}
+        if fields is None:
+            results.append(dict(attributes))
+        else:
+            projected = {"ieee": ieee}
+            projected.update((name, attributes.get(name)) for name in fields)
+            results.append(projected)
+    return results
@@ -0,0 +1,133 @@
+"""Sharded periodic refresh of ZHA Device Info."""
+
+import logging
+import random
+import zlib
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, SCAN_JITTER, SCAN_SHARDS
+from .device_context import get_zha_gateway
+from .updater import (
+    async_finish_update, async_record_error, async_remove_snapshot,
+    async_update_device, new_update_stats,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def shard_of(ieee, shards: int) -> int:
+    """Return the bucket of a device, stable across restarts."""
+    return zlib.crc32(str(ieee).encode()) % shards
+
+
+class ShardedScheduler:
+    """Refresh one bucket of devices per tick over the configured interval.
+
+    Devices are split into ``shards`` buckets by a hash of their IEEE
+    address. Each tick refreshes a single bucket, so a full pass over the
+    mesh is spread evenly across ``interval`` seconds instead of running in
+    one burst on the event loop.
+
+    The gateway is looked up on every tick, so a reloaded ZHA is picked up
+    and ticks are skipped while it is not set up.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        interval: float,
+        shards: int = SCAN_SHARDS,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._shards = shards
+        self._tick = interval / shards
+        self._bucket = 0
+        self._buckets: List[List[Any]] = []
+        self._unsub: Optional[CALLBACK_TYPE] = None
+
+    @property
+    def diagnostics(self) -> Dict[str, Any]:
+        """Return the scheduler settings and position."""
+        return {
+            "interval": self._tick * self._shards,
+            "shards": self._shards,
+            "bucket": self._bucket,
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Schedule the first tick."""
+        self._async_schedule()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the pending tick."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Schedule the next tick with jitter."""
+        delay = self._tick * (1 + random.uniform(-SCAN_JITTER, SCAN_JITTER))
+        self._unsub = async_call_later(self._hass, delay, self._async_tick)
+
+    @callback
+    def _async_start_cycle(self, gateway) -> None:
+        """Assign devices to buckets and drop devices that left the gateway."""
+        buckets: List[List[Any]] = [[] for _ in range(self._shards)]
+        seen = set()
+        for ieee, device in gateway.devices.items():
+            if device is None:
+                continue
+            buckets[shard_of(ieee, self._shards)].append(ieee)
+            seen.add(str(ieee))
+        self._buckets = buckets
+
+        device_registry = self._hass.data[DOMAIN]["device_registry"]
+        for ieee in device_registry.keys() - seen:
+            async_remove_snapshot(self._hass, ieee)
+
+    @callback
+    def _async_tick(self, _now) -> None:
+        """Refresh the devices of the current bucket."""
+        self._unsub = None
+        gateway = get_zha_gateway(self._hass)
+        if gateway is None:
+            # Retry the same bucket once ZHA is set up again
+            _LOGGER.debug("ZHA gateway not available, skipping refresh")
+            self._async_schedule()
+            return
+        try:
+            if self._bucket == 0:
+                self._async_start_cycle(gateway)
+
+            devices: Dict[Any, Any] = gateway.devices
+            stats = new_update_stats()
+            for ieee in self._buckets[self._bucket]:
+                device = devices.get(ieee)
+                if device is None:
+                    continue
+                try:
+                    async_update_device(self._hass, device, stats)
+                except Exception as dev_err:
+                    async_record_error(self._hass, stats, ieee, dev_err)
+
+            async_finish_update(self._hass, stats)
+            _LOGGER.debug(
+                "Refreshed bucket %s/%s: %s of %s devices changed, %s entities written",
+                self._bucket + 1,
+                self._shards,
+                stats["devices_changed"],
+                stats["devices_scanned"],
+                stats["entities_written"],
+            )
+        except Exception as err:
+            _LOGGER.exception("Error refreshing ZHA device info: %s", err)
+        finally:
+            self._bucket = (self._bucket + 1) % self._shards
+            self._async_schedule()
@@ -1,28 +1,30 @@
 """ZHA Device Info sensor platform."""
 
 import logging
-from typing import Any, Dict
-from datetime import datetime
-
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.util import dt as dt_util
-from homeassistant.components import zha
-from homeassistant.components.zha.const import DOMAIN as ZHA_DOMAIN
-from homeassistant.core import HomeAssistant
+from typing import Any, Dict, List, Mapping, Optional
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.entity import async_generate_entity_id
-from homeassistant.helpers.device_registry import async_get
 
 from .const import (
-    DOMAIN, ATTR_DEVICE_TYPE, ATTR_IEEE, ATTR_NWK, 
-    ATTR_MANUFACTURER, ATTR_MODEL, 
-    ATTR_NAME, ATTR_QUIRK_APPLIED, 
-    ATTR_QUIRK_CLASS, ATTR_POWER_SOURCE, 
-    ATTR_LQI, ATTR_RSSI, ATTR_LAST_SEEN, 
-    ATTR_AVAILABLE, SPLITTABLE_ATTRIBUTES,
-    DEFAULT_OPTIONS
+    DOMAIN, MESH_SENSORS, SIGNAL_DEVICE_ADDED,
+    CONF_PERFORMANCE_SENSORS, DEFAULT_OPTIONS, PERF_SENSORS,
+    CONF_SLIM_MAIN_ENTITY, VOLATILE_ATTRIBUTES,
+)
+from .device_context import (
+    DeviceContext, async_entity_id, async_get_device_contexts, enabled_splits,
+    get_zha_gateway, split_slug,
 )
+from .history import STAT_ATTRIBUTES
+from .perf import performance_values
+from .snapshot import SNAPSHOT_FIELDS, DeviceSnapshot
+from .summary import current_summary
+from .throttle import WriteThrottle, write_thresholds
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,124 +37,138 @@ async def async_setup_entry(
     """Set up ZHA device info sensors from a config entry."""
     _LOGGER.debug("Setting up ZHA Device Info sensors")
     try:
-        zha_data = hass.data.get(ZHA_DOMAIN)
-        if not zha_data or not zha_data.gateway_proxy:
+        # The config entry waits for ZHA before forwarding the platforms
+        if get_zha_gateway(hass) is None:
             _LOGGER.error("ZHA gateway not found")
             return
 
-        if DOMAIN not in hass.data:
-            hass.data[DOMAIN] = {"entities": []}
-        
-        device_registry = async_get(hass)
-        
-        entities = []
-        for device in zha_data.gateway_proxy.gateway.devices.values():
-            if device is None:
-                continue
-                
-            try:
-                # Add main sensor
-                main_entity = ZHADeviceInfoSensor(hass, device, device_registry)
-                entities.append(main_entity)
-                
-                # Add split attribute sensors based on config
-                for conf, conf_data in SPLITTABLE_ATTRIBUTES.items():
-                    if entry.options.get(conf, DEFAULT_OPTIONS[conf]):
-                        # Skip if this is a binary sensor
-                        if conf_data.get("platform") == "binary_sensor":
-                            continue
-                        entity = ZHADeviceAttributeSensor(
-                            hass, device, device_registry, conf_data
-                        )
-                        entities.append(entity)
-                        
-                hass.data[DOMAIN]["entities"].extend(entities)
-                
-            except Exception as entity_err:
-                _LOGGER.exception("Error creating sensor for device %s: %s", device.name, entity_err)
-
-        async_add_entities(entities, True)
+        entities = build_sensor_entities(
+            hass, async_get_device_contexts(hass), entry.options
+        )
+
+        # Mesh-wide summary sensors
+        for key, conf_data in MESH_SENSORS.items():
+            entities.append(ZHAMeshSummarySensor(hass, key, conf_data))
+
+        if entry.options.get(
+            CONF_PERFORMANCE_SENSORS, DEFAULT_OPTIONS[CONF_PERFORMANCE_SENSORS]
+        ):
+            for key, conf_data in PERF_SENSORS.items():
+                entities.append(ZHAPerformanceSensor(hass, key, conf_data))
+
+        # Entities read pushed snapshots, there is nothing to update on add
+        async_add_entities(entities)
+
+        @callback
+        def async_add_device(context: DeviceContext) -> None:
+            """Add the sensors of a device paired after setup."""
+            async_add_entities(build_sensor_entities(hass, [context], entry.options))
+
+        entry.async_on_unload(
+            async_dispatcher_connect(hass, SIGNAL_DEVICE_ADDED, async_add_device)
+        )
         _LOGGER.debug("ZHA Device Info sensors setup complete")
     except Exception as err:
         _LOGGER.exception("Error setting up ZHA Device Info sensors: %s", err)
 
 
+def build_sensor_entities(
+    hass: HomeAssistant, contexts: List[DeviceContext], options: Mapping[str, Any]
+) -> List[SensorEntity]:
+    """Create the main and split sensors of every device in one pass."""
+    splits = enabled_splits(options, "sensor")
+    slim = options.get(CONF_SLIM_MAIN_ENTITY, DEFAULT_OPTIONS[CONF_SLIM_MAIN_ENTITY])
+    thresholds = write_thresholds(options)
+    entities: List[SensorEntity] = []
+    for context in contexts:
+        try:
+            entities.append(ZHADeviceInfoSensor(hass, context, slim, thresholds))
+            for conf_data in splits:
+                entities.append(
+                    ZHADeviceAttributeSensor(hass, context, conf_data, thresholds)
+                )
+        except Exception as entity_err:
+            _LOGGER.exception(
+                "Error creating sensor for device %s: %s", context.name, entity_err
+            )
+    return entities
+
+
 class ZHADeviceInfoSensor(SensorEntity):
-    """ZHA Device Info sensor."""
+    """ZHA Device Info sensor.
+
+    In slim mode the sensor only carries the fields that rarely change, so
+    a message from the device does not write a new state.
+    """
 
     _attr_should_poll = False
+    # Still in the state machine, but not copied into every recorder row
+    _unrecorded_attributes = VOLATILE_ATTRIBUTES | STAT_ATTRIBUTES
     
-    def __init__(self, hass: HomeAssistant, device, device_registry) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        context: DeviceContext,
+        slim: bool = False,
+        thresholds: Optional[Mapping[str, float]] = None,
+    ) -> None:
         """Initialize the sensor."""
-        self._device = device
-        # Look up device using ZHA domain identifiers
-        device_entry = device_registry.async_get_device(
-            identifiers={(ZHA_DOMAIN, str(device.ieee))},
+        self._device = context.device
+        self._ieee = context.ieee
+        self._data = hass.data[DOMAIN]
+        self._snapshots = self._data["device_registry"]
+        self.slim = slim
+        # The full sensor exposes every field as an attribute
+        self.tracked_fields = (
+            frozenset(SNAPSHOT_FIELDS) - VOLATILE_ATTRIBUTES if slim else None
         )
-        _LOGGER.debug("Device entry from registry: %s", device_entry)
-        _LOGGER.debug("Device entry name_by_user: %s", device_entry.name_by_user if device_entry else None)
-        
-        # Use name_by_user if available, otherwise use device name
-        device_name = device_entry.name_by_user if device_entry and device_entry.name_by_user else device.name
-        _LOGGER.debug("Using name for device %s: %s", device.ieee, device_name)
-        
+        self.throttle = WriteThrottle.for_fields(thresholds or {}, self.tracked_fields)
+
         # Change friendly name to "ZHA Device Info"
         self._attr_name = "ZHA Device Info"
-        self._attr_unique_id = f"{DOMAIN}_{device.ieee}"
+        self._attr_unique_id = f"{DOMAIN}_{context.ieee}"
         # Change entity_id to include 'entity'
-        self.entity_id = async_generate_entity_id(
-            "sensor.{}",
-            f"zha_device_info_entity_{device_name.lower().replace(' ', '_')}",
-            hass=hass
+        self.entity_id = async_entity_id(
+            hass, "sensor", "zha_device_info_entity", context.slug
         )
-        
-        # Point to ZHA device instead of creating new one
-        self._attr_device_info = {
-            "identifiers": {(ZHA_DOMAIN, str(device.ieee))},
-        }
-        _LOGGER.debug("Initialized ZHA Device Info sensor: %s", self._attr_name)
-        
+        self._attr_device_info = context.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Register the sensor in the per-device entity index."""
+        self.hass.data[DOMAIN]["entities"].add_main(self._device, self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Remove the sensor from the per-device entity index."""
+        self.hass.data[DOMAIN]["entities"].discard(self._device, self)
+
     @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return device specific state attributes."""
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return device specific state attributes.
+
+        Built from the snapshot on each write and not kept, the sensor is
+        only written when its data changed.
+        """
         try:
-            ieee = str(self._device.ieee)
-            _LOGGER.debug("IEEE address for device %s: %s", self._device.name, ieee)
-            last_seen = self._device.last_seen
-            if isinstance(last_seen, float):
-                last_seen = datetime.fromtimestamp(last_seen)
-            nwk_hex = f"0x{self._device.nwk:04x}"
-            attributes = {
-                ATTR_IEEE: ieee,
-                ATTR_NWK: nwk_hex,
-                ATTR_MANUFACTURER: self._device.manufacturer,
-                ATTR_MODEL: self._device.model,
-                ATTR_NAME: self._device.name,
-                ATTR_QUIRK_APPLIED: self._device.quirk_applied,
-                ATTR_POWER_SOURCE: self._device.power_source,
-                ATTR_LQI: self._device.lqi,
-                ATTR_RSSI: self._device.rssi,
-                ATTR_LAST_SEEN: last_seen.isoformat(),
-                ATTR_AVAILABLE: self._device.available,
-                ATTR_DEVICE_TYPE: self._device.device_type,  # Add device type
-            }
-
-            # Add quirk_class if quirk is applied
-            if self._device.quirk_applied:
-                quirk = self._device.quirk_class
-                if isinstance(quirk, str):
-                    attributes["quirk_class"] = quirk
-                elif hasattr(quirk, "__name__"):
-                    attributes["quirk_class"] = quirk.__name__
-                else:
-                    attributes["quirk_class"] = str(quirk)
-
-            _LOGGER.debug("Attributes for device %s: %s", self._device.name, attributes)
+            attributes = self._snapshot().as_dict()
+            if self.slim:
+                for key in VOLATILE_ATTRIBUTES:
+                    attributes.pop(key, None)
+                return attributes
+            history = self._data["history_stats"].get(self._ieee)
+            if history:
+                attributes.update(history)
             return attributes
         except Exception as err:
             _LOGGER.error("Error getting attributes for device %s: %s", self._device.name, err)
             return {}
 
+    def _snapshot(self) -> DeviceSnapshot:
+        """Return the latest snapshot of the device."""
+        snapshot = self._snapshots.get(self._ieee)
+        if snapshot is None:
+            snapshot = DeviceSnapshot.from_device(self._device)
+        return snapshot
+
     @property
     def state(self) -> str:
         """Return the state of the sensor."""
@@ -162,33 +178,43 @@ class ZHADeviceInfoSensor(SensorEntity):
 class ZHADeviceAttributeSensor(SensorEntity):
     """Representation of a ZHA Device attribute sensor."""
 
-    def __init__(self, hass, device, device_registry, conf_data):
+    # Written by the update pipeline when a tracked field changes
+    _attr_should_poll = False
+
+    def __init__(self, hass, context: DeviceContext, conf_data, thresholds=None):
         """Initialize the sensor."""
-        self._device = device
+        self._device = context.device
+        self._ieee = context.ieee
+        self._data = hass.data[DOMAIN]
+        self._snapshots = self._data["device_registry"]
         self._conf_data = conf_data
-        device_entry = device_registry.async_get_device(
-            identifiers={(ZHA_DOMAIN, str(device.ieee))},
-        )
-        device_name = device_entry.name_by_user if device_entry and device_entry.name_by_user else device.name
-        
+        # Resolved once instead of on every state read
+        self._value = conf_data["value"]
+        self._extra_attributes = conf_data.get("extra_attributes")
+        self.tracked_fields = frozenset(conf_data["attributes"])
+        self.throttle = WriteThrottle.for_fields(thresholds or {}, self.tracked_fields)
+
         # Simplified friendly name
-        self._attr_name = f"{device_name} {conf_data['name']}"
-        self._attr_unique_id = f"{DOMAIN}_{device.ieee}_{conf_data['name']}"
+        self._attr_name = f"{context.name} {conf_data['name']}"
+        self._attr_unique_id = f"{DOMAIN}_{context.ieee}_{conf_data['name']}"
         # Keep the full entity_id format
-        self.entity_id = async_generate_entity_id(
-            "sensor.{}",
-            f"zha_device_info_{device_name.lower().replace(' ', '_')}_{conf_data['name'].lower().replace(' ', '_')}",
-            hass=hass
+        self.entity_id = async_entity_id(
+            hass, "sensor", "zha_device_info", context.slug, split_slug(conf_data["name"])
         )
         
         self._attr_icon = conf_data["icon"]
         self._attr_device_class = conf_data.get("device_class")
         self._attr_state_class = conf_data.get("state_class")
-        
-        # Point to ZHA device instead of creating new one
-        self._attr_device_info = {
-            "identifiers": {(ZHA_DOMAIN, str(device.ieee))},
-        }
+        self._attr_native_unit_of_measurement = conf_data.get("unit")
+        self._attr_device_info = context.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Register the sensor in the per-device entity index."""
+        self.hass.data[DOMAIN]["entities"].add_split(self._device, self)
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Remove the sensor from the per-device entity index."""
+        self.hass.data[DOMAIN]["entities"].discard(self._device, self)
 
     @property
     def native_value(self):
@@ -198,25 +224,7 @@ class ZHADeviceAttributeSensor(SensorEntity):
                 _LOGGER.debug("Device is None")
                 return None
 
-            if "last_seen" in self._conf_data["attributes"]:
-                last_seen = getattr(self._device, "last_seen", None)
-                if isinstance(last_seen, float):
-                    return dt_util.as_local(datetime.fromtimestamp(last_seen))
-                return last_seen
-            elif "available" in self._conf_data["attributes"]:
-                return getattr(self._device, "available", None)
-            elif "power_source" in self._conf_data["attributes"]:
-                return str(getattr(self._device, "power_source", None))
-            elif ATTR_NWK in self._conf_data["attributes"]:
-                nwk = getattr(self._device, "nwk", None)
-                return f"0x{nwk:04x}" if nwk is not None else None
-            elif ATTR_QUIRK_APPLIED in self._conf_data["attributes"]:
-                return getattr(self._device, "quirk_applied", False)
-            elif ATTR_DEVICE_TYPE in self._conf_data["attributes"]:
-                device_type = getattr(self._device, "device_type", None)
-                return str(device_type) if device_type is not None else None
-            return None
-
+            return self._value(self._snapshot(), self._data)
         except Exception as err:
             _LOGGER.error(
                 "Error getting native value for device %s: %s",
@@ -228,15 +236,88 @@ class ZHADeviceAttributeSensor(SensorEntity):
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return additional attributes based on the sensor type."""
-        attributes = {}
-        if ATTR_QUIRK_APPLIED in self._conf_data["attributes"]:
-            # Add quirk name as attribute if quirk is applied
-            if self._device.quirk_applied:
-                quirk = self._device.quirk_class
-                if isinstance(quirk, str):
-                    attributes[ATTR_QUIRK_CLASS] = quirk
-                elif hasattr(quirk, "__name__"):
-                    attributes[ATTR_QUIRK_CLASS] = quirk.__name__
-                else:
-                    attributes[ATTR_QUIRK_CLASS] = str(quirk)
-        return attributes
\ No newline at end of file
+        if self._extra_attributes is None:
+            return {}
+        return self._extra_attributes(self._snapshot(), self._data)
+
+    def _snapshot(self) -> DeviceSnapshot:
+        """Return the latest snapshot of the device."""
+        snapshot = self._snapshots.get(self._ieee)
+        if snapshot is None:
+            snapshot = DeviceSnapshot.from_device(self._device)
+        return snapshot
+
+
+class ZHAMeshSummarySensor(SensorEntity):
+    """Mesh-wide summary of all ZHA devices."""
+
+    _attr_should_poll = False
+
+    def __init__(self, hass, key, conf_data):
+        """Initialize the sensor."""
+        self._key = key
+        self._attr_name = f"ZHA Mesh {conf_data['name']}"
+        self._attr_unique_id = f"{DOMAIN}_mesh_{key}"
+        self.entity_id = async_generate_entity_id(
+            "sensor.{}", f"zha_device_info_mesh_{key}", hass=hass
+        )
+        self._attr_icon = conf_data["icon"]
+        self._attr_native_unit_of_measurement = conf_data["unit"]
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    async def async_added_to_hass(self) -> None:
+        """Register the sensor to be written when the summary changes."""
+        self.hass.data[DOMAIN]["summary_entities"][self._key] = self
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop writing the sensor."""
+        self.hass.data[DOMAIN]["summary_entities"].pop(self._key, None)
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        summary = current_summary(self.hass, self._key)
+        return summary[0] if summary else None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the breakdown behind the state."""
+        summary = current_summary(self.hass, self._key)
+        return summary[1] if summary else {}
+
+
+class ZHAPerformanceSensor(SensorEntity):
+    """Counters of the last update and export runs."""
+
+    _attr_should_poll = False
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, hass, key, conf_data):
+        """Initialize the sensor."""
+        self._key = key
+        self._attr_name = f"ZHA Device Info {conf_data['name']}"
+        self._attr_unique_id = f"{DOMAIN}_perf_{key}"
+        self.entity_id = async_generate_entity_id(
+            "sensor.{}", f"zha_device_info_perf_{key}", hass=hass
+        )
+        self._attr_icon = conf_data["icon"]
+        self._attr_native_unit_of_measurement = conf_data["unit"]
+        self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    async def async_added_to_hass(self) -> None:
+        """Register the sensor to be written after updates and exports."""
+        self.hass.data[DOMAIN]["perf_entities"][self._key] = self
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Stop writing the sensor."""
+        self.hass.data[DOMAIN]["perf_entities"].pop(self._key, None)
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return performance_values(self.hass.data[DOMAIN])[self._key][0]
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return the details behind the state."""
+        return performance_values(self.hass.data[DOMAIN])[self._key][1]
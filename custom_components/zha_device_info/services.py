@@ -1,91 +1,253 @@
 import logging
-from datetime import datetime
-from homeassistant.core import HomeAssistant
+import time
+import uuid
+from homeassistant.core import HomeAssistant, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
 from homeassistant.helpers.service import async_register_admin_service
-from homeassistant.helpers.json import save_json
-from homeassistant.components import zha
-from homeassistant.components.zha.const import DOMAIN as ZHA_DOMAIN
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, SERVICE_UPDATE, SERVICE_EXPORT, SERVICE_SCHEMAS
+from .const import (
+    DOMAIN, SERVICE_UPDATE, SERVICE_EXPORT, SERVICE_SCHEMAS, ATTR_IEEE,
+    SCAN_CHUNK_BUDGET, EXPORT_FORMAT_JSON, EXPORT_FORMAT_NDJSON,
+    EXPORT_COMPRESS_NONE, EXPORT_MODE_FULL, EXPORT_MODE_DELTA, EXPORT_MODE_TOPOLOGY,
+    SERVICE_QUERY, SERVICE_PROFILE,
+)
+from .device_context import get_zha_device, get_zha_gateway
+from .export import default_export_path, write_delta_export, write_export
+from .perf import UpdateProfiler, async_write_performance
+from .query import query_devices
+from .signature import DETAIL_ATTRIBUTES, async_details_lookup
+from .topology import async_collect_topology, write_topology
+from .updater import (
+    async_finish_update, async_run_full_scan, async_update_device, new_update_stats,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+
 async def async_register_services(hass: HomeAssistant) -> None:
     """Register services for ZHA Device Info."""
 
     async def handle_update(call) -> None:
         """Update device info."""
         _LOGGER.debug("Updating ZHA device info")
-        zha_data = hass.data.get(ZHA_DOMAIN)
+        gateway = get_zha_gateway(hass)
         
-        if not zha_data or not zha_data.gateway_proxy:
+        if gateway is None:
             _LOGGER.error("ZHA gateway not found")
             return
 
-        device_registry = {}
+        data = hass.data[DOMAIN]
+        ieee = call.data.get(ATTR_IEEE)
+        device = None
+        if ieee is not None:
+            # Read from the gateway, devices without entities can be refreshed too
+            device = get_zha_device(gateway, ieee)
+            if device is None:
+                raise ServiceValidationError(f"Unknown ZHA device: {ieee}")
+        profiler = data.get("profiler")
+        profile = profiler.begin() if profiler is not None else None
+        start = time.perf_counter()
+        stats = None
         try:
-            for device in zha_data.gateway_proxy.gateway.devices.values():
-                if device is None:
-                    continue
-                
-                try:
-                    last_seen = device.last_seen
-                    if isinstance(last_seen, float):
-                        last_seen = datetime.fromtimestamp(last_seen)
-
-                    nwk_hex = f"0x{device.nwk:04x}"
-                    device_info = {
-                        "ieee": str(device.ieee),
-                        "nwk": nwk_hex,
-                        "manufacturer": device.manufacturer,
-                        "model": device.model,
-                        "name": device.name,
-                        "quirk_applied": device.quirk_applied,
-                        "power_source": device.power_source,
-                        "lqi": device.lqi,
-                        "rssi": device.rssi,
-                        "last_seen": last_seen.isoformat() if last_seen else None,
-                        "available": device.available,
-                    }
-
-                    # Add quirk_class if quirk is applied
-                    if device.quirk_applied:
-                        quirk = device.quirk_class
-                        if isinstance(quirk, str):
-                            device_info["quirk_class"] = quirk
-                        elif hasattr(quirk, "__name__"):
-                            device_info["quirk_class"] = quirk.__name__
-                        else:
-                            device_info["quirk_class"] = str(quirk)
-
-                    device_registry[str(device.ieee)] = device_info
-                    _LOGGER.debug("Updated info for device %s", device.ieee)
-                except Exception as dev_err:
-                    _LOGGER.error("Error processing device %s: %s", device.ieee, dev_err)
-
-            # Store updated registry
-            hass.data[DOMAIN]["device_registry"] = device_registry
-
-            # Update the state of each ZHA Device Info sensor
-            for entity in hass.data[DOMAIN]["entities"]:
-                entity.async_write_ha_state()
-                
+            if device is not None:
+                # Refresh a single device without scanning the whole gateway
+                stats = new_update_stats()
+                async_update_device(hass, device, stats)
+            else:
+                chunk_budget = call.data.get("chunk_budget")
+                stats = await async_run_full_scan(
+                    hass,
+                    gateway.devices.values(),
+                    chunk_budget / 1000 if chunk_budget else SCAN_CHUNK_BUDGET,
+                )
+                if stats is None:
+                    # Replaced by a newer scan, which records its own stats
+                    stats = {"superseded": True}
+                    return
+
+            async_finish_update(hass, stats)
+            data["last_update"] = {
+                **stats,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                "finished": dt_util.utcnow().isoformat(),
+            }
+            async_write_performance(hass)
+            _LOGGER.debug(
+                "Updated ZHA device info: %s of %s devices changed, %s entities written",
+                stats["devices_changed"],
+                stats["devices_scanned"],
+                stats["entities_written"],
+            )
         except Exception as err:
             _LOGGER.exception("Error processing devices: %s", err)
+        finally:
+            if profiler is not None:
+                await profiler.async_end(
+                    hass, profile, time.perf_counter() - start, stats
+                )
 
     async def handle_export(call) -> None:
         """Export device info to JSON."""
-        path = call.data.get("path", hass.config.path("zha_devices.json"))
+        data = hass.data[DOMAIN]
+        export_format = call.data.get("format", EXPORT_FORMAT_JSON)
+        compress = call.data.get("compress")
+        if compress == EXPORT_COMPRESS_NONE:
+            compress = None
+        mode = call.data.get("mode", EXPORT_MODE_FULL)
+        if mode == EXPORT_MODE_TOPOLOGY:
+            await async_export_topology(call, compress)
+            return
+        # Resolved here, ZHA devices must not be read from the executor
+        lookup = async_details_lookup(hass) if call.data.get("details") else None
+        base_watermark = data.get("export_watermark")
+        if mode == EXPORT_MODE_DELTA and base_watermark is None:
+            _LOGGER.warning("No previous export to build a delta on, exporting everything")
+            mode = EXPORT_MODE_FULL
+
+        if mode == EXPORT_MODE_DELTA:
+            default_path = default_export_path(
+                "zha_devices.delta", EXPORT_FORMAT_NDJSON, compress
+            )
+        else:
+            default_path = default_export_path("zha_devices", export_format, compress)
+        path = call.data.get("path", hass.config.path(default_path))
+
+        start = time.perf_counter()
         try:
-            device_registry = hass.data[DOMAIN]["device_registry"]
-            if device_registry:
-                await hass.async_add_executor_job(save_json, path, device_registry)
-                _LOGGER.info("Exported ZHA device info to %s", path)
+            watermark = data.get("change_seq", 0)
+            # Snapshots are immutable, so a shallow copy is safe to stream
+            # from the executor while updates keep replacing registry entries
+            if mode == EXPORT_MODE_DELTA:
+                upserts = [
+                    snapshot
+                    for snapshot in data["device_registry"].values()
+                    if snapshot.version > base_watermark
+                ]
+                removed = [
+                    ieee
+                    for ieee, version in data["removed"].items()
+                    if version > base_watermark
+                ]
+                header = {
+                    "type": "delta",
+                    "epoch": data["export_epoch"],
+                    "base_watermark": base_watermark,
+                    "watermark": watermark,
+                    "upserts": len(upserts),
+                    "removed": len(removed),
+                }
+                size = await hass.async_add_executor_job(
+                    write_delta_export, path, header, upserts, removed, compress,
+                    _model_details(lookup, upserts),
+                )
+                _LOGGER.info(
+                    "Exported %s changed and %s removed ZHA devices to %s (%s bytes)",
+                    len(upserts), len(removed), path, size,
+                )
             else:
-                _LOGGER.error("No device registry data to export")
+                snapshots = list(data["device_registry"].values())
+                if not snapshots:
+                    _LOGGER.error("No device registry data to export")
+                    return
+                size = await hass.async_add_executor_job(
+                    write_export, path, snapshots, export_format, compress,
+                    _model_details(lookup, snapshots),
+                )
+                data["export_epoch"] = uuid.uuid4().hex
+                _LOGGER.info("Exported ZHA device info to %s (%s bytes)", path, size)
+
+            data["last_export"] = {
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                "bytes": size,
+                "path": path,
+                "mode": mode,
+                "format": EXPORT_FORMAT_NDJSON if mode == EXPORT_MODE_DELTA else export_format,
+                "compress": compress or EXPORT_COMPRESS_NONE,
+                "finished": dt_util.utcnow().isoformat(),
+            }
+            async_write_performance(hass)
+
+            # Later deltas start from here; older removals are no longer needed
+            data["export_watermark"] = watermark
+            data["removed"] = {
+                ieee: version
+                for ieee, version in data["removed"].items()
+                if version > watermark
+            }
         except Exception as err:
             _LOGGER.error("Failed to export: %s", err)
 
+    async def async_export_topology(call, compress) -> None:
+        """Export the neighbor and route graph of the mesh."""
+        gateway = get_zha_gateway(hass)
+        if gateway is None:
+            _LOGGER.error("ZHA gateway not found")
+            return
+        default_path = default_export_path(
+            "zha_topology", EXPORT_FORMAT_NDJSON, compress
+        )
+        path = call.data.get("path", hass.config.path(default_path))
+
+        start = time.perf_counter()
+        try:
+            # Tables are copied in the event loop, only the copy is written
+            topology = async_collect_topology(gateway)
+            size = await hass.async_add_executor_job(
+                write_topology, path, topology, compress
+            )
+            _LOGGER.info(
+                "Exported ZHA topology of %s nodes and %s edges to %s (%s bytes)",
+                len(topology.ieees), len(topology.edge_source), path, size,
+            )
+            hass.data[DOMAIN]["last_export"] = {
+                "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+                "bytes": size,
+                "path": path,
+                "mode": EXPORT_MODE_TOPOLOGY,
+                "format": EXPORT_FORMAT_NDJSON,
+                "compress": compress or EXPORT_COMPRESS_NONE,
+                "finished": dt_util.utcnow().isoformat(),
+            }
+            async_write_performance(hass)
+        except Exception as err:
+            _LOGGER.error("Failed to export topology: %s", err)
+
+    async def handle_query(call) -> ServiceResponse:
+        """Return devices matching the filters, answered from the indexes."""
+        data = hass.data[DOMAIN]
+        fields = call.data.get("fields")
+        filters = {
+            key: value for key, value in call.data.items()
+            if key not in ("fields", "details")
+        }
+        with_details = call.data.get("details") or any(
+            name in DETAIL_ATTRIBUTES for name in fields or ()
+        )
+        devices = query_devices(
+            data["device_registry"],
+            data["indexes"],
+            filters,
+            fields,
+            async_details_lookup(hass) if with_details else None,
+        )
+        return {"count": len(devices), "devices": devices}
+
+    async def handle_profile(call) -> None:
+        """Capture cProfile stats or timings of the next update runs."""
+        data = hass.data[DOMAIN]
+        runs = call.data["runs"]
+        if not runs:
+            data.pop("profiler", None)
+            _LOGGER.info("Stopped capturing ZHA device info updates")
+            return
+        mode = call.data["mode"]
+        path = call.data.get("path", hass.config.path(f"zha_device_info_{mode}"))
+        data["profiler"] = UpdateProfiler(mode, runs, path)
+        _LOGGER.info(
+            "Capturing the next %s ZHA device info updates (%s) to %s", runs, mode, path
+        )
+
     # Register services
     async_register_admin_service(
         hass, DOMAIN, SERVICE_UPDATE, handle_update,
@@ -98,3 +260,27 @@ async def async_register_services(hass: HomeAssistant) -> None:
         schema=SERVICE_SCHEMAS[SERVICE_EXPORT]
     )
     _LOGGER.debug("Registered export service")
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_QUERY, handle_query,
+        schema=SERVICE_SCHEMAS[SERVICE_QUERY],
+        supports_response=SupportsResponse.ONLY,
+    )
+    _LOGGER.debug("Registered query service")
+
+    async_register_admin_service(
+        hass, DOMAIN, SERVICE_PROFILE, handle_profile,
+        schema=SERVICE_SCHEMAS[SERVICE_PROFILE]
+    )
+    _LOGGER.debug("Registered profile service")
+
+
+def _model_details(lookup, snapshots):
+    """Return the model details of the exported devices, or None."""
+    if lookup is None:
+        return None
+    return {
+        snapshot.ieee: model
+        for snapshot in snapshots
+        if (model := lookup(snapshot.ieee)) is not None
+    }
@@ -0,0 +1,171 @@
+"""Zigbee signatures, endpoints and cluster details shared per device model."""
+
+from __future__ import annotations
+
+import logging
+import sys
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import ATTR_CLUSTER_DETAILS, ATTR_ENDPOINTS, ATTR_SIGNATURE, DOMAIN
+from .device_context import get_zha_gateway
+from .snapshot import quirk_class_name
+
+_LOGGER = logging.getLogger(__name__)
+
+DETAIL_ATTRIBUTES = (ATTR_SIGNATURE, ATTR_ENDPOINTS, ATTR_CLUSTER_DETAILS)
+
+ModelKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only deep copy with string keys and interned strings."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({str(key): _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Return a plain JSON serializable copy of a frozen value."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _hex(value) -> Optional[str]:
+    """Format a Zigbee identifier as a 16 bit hex string."""
+    return f"0x{int(value):04x}" if value is not None else None
+
+
+def _cluster_names(clusters: Mapping[int, Any]) -> Dict[str, str]:
+    """Map cluster ids to the class handling them, quirk clusters included."""
+    return {
+        _hex(cluster_id): type(cluster).__name__
+        for cluster_id, cluster in sorted(clusters.items())
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class ModelDetails:
+    """Read-only signature, endpoints and cluster details of a device model."""
+
+    signature: Mapping[str, Any]
+    endpoints: Mapping[str, Any]
+    cluster_details: Mapping[str, Any]
+
+    @classmethod
+    def from_device(cls, device) -> ModelDetails:
+        """Read the details of a ZHA device.
+
+        The signature is the one ZHA shows for the device. Endpoints and
+        cluster details come from the zigpy device after quirks applied.
+        """
+        endpoints = {}
+        cluster_details = {}
+        for endpoint_id, endpoint in sorted(device.device.endpoints.items()):
+            if endpoint_id == 0:
+                # ZDO
+                continue
+            endpoints[endpoint_id] = {
+                "profile_id": _hex(endpoint.profile_id),
+                "device_type": _hex(endpoint.device_type),
+            }
+            cluster_details[endpoint_id] = {
+                "in": _cluster_names(endpoint.in_clusters),
+                "out": _cluster_names(endpoint.out_clusters),
+            }
+        return cls(
+            signature=_freeze(device.zigbee_signature or {}),
+            endpoints=_freeze(endpoints),
+            cluster_details=_freeze(cluster_details),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the details as plain attributes."""
+        return {
+            ATTR_SIGNATURE: _thaw(self.signature),
+            ATTR_ENDPOINTS: _thaw(self.endpoints),
+            ATTR_CLUSTER_DETAILS: _thaw(self.cluster_details),
+        }
+
+
+EMPTY_DETAILS = ModelDetails(
+    MappingProxyType({}), MappingProxyType({}), MappingProxyType({})
+)
+
+
+class SignatureCache:
+    """Lazily built model details, one object per model and quirk.
+
+    Devices with the same manufacturer, model and quirk share the details
+    read from the first of them that was asked for. Nothing is read until
+    an export or query needs it. Re-interviewing a device drops the details
+    of its model, so they are read again on the next request.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._models: Dict[ModelKey, ModelDetails] = {}
+        self._devices: Dict[str, ModelKey] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached models."""
+        return len(self._models)
+
+    def get(self, device) -> ModelDetails:
+        """Return the details of a device's model, reading them if needed."""
+        ieee = str(device.ieee)
+        key = self._devices.get(ieee)
+        if key is None:
+            quirk_class = (
+                quirk_class_name(device.quirk_class) if device.quirk_applied else None
+            )
+            key = self._devices[ieee] = (device.manufacturer, device.model, quirk_class)
+        details = self._models.get(key)
+        if details is None:
+            try:
+                details = ModelDetails.from_device(device)
+            except Exception as err:
+                # Cached as empty until the device is interviewed again
+                _LOGGER.warning("Error reading the signature of device %s: %s", ieee, err)
+                details = EMPTY_DETAILS
+            self._models[key] = details
+        return details
+
+    def invalidate(self, ieee: str) -> None:
+        """Drop the details of a device's model after it was re-interviewed."""
+        key = self._devices.pop(ieee, None)
+        if key is not None:
+            self._models.pop(key, None)
+
+    def forget(self, ieee: str) -> None:
+        """Stop tracking a device removed from ZHA."""
+        self._devices.pop(ieee, None)
+
+
+@callback
+def async_details_lookup(hass: HomeAssistant) -> Callable[[str], Optional[ModelDetails]]:
+    """Return a lookup of model details by IEEE address, for the event loop."""
+    gateway = get_zha_gateway(hass)
+    devices = {
+        str(ieee): device
+        for ieee, device in (gateway.devices.items() if gateway is not None else ())
+        if device is not None
+    }
+    cache: SignatureCache = hass.data[DOMAIN]["signatures"]
+
+    def lookup(ieee: str) -> Optional[ModelDetails]:
+        """Return the details of a device still in the gateway."""
+        device = devices.get(ieee)
+        return cache.get(device) if device is not None else None
+
+    return lookup
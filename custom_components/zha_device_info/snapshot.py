@@ -0,0 +1,164 @@
+"""Compact per-device snapshots for ZHA Device Info."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings that repeat across many devices."""
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def quirk_class_name(quirk) -> str:
+    """Return a printable name for a quirk class."""
+    if isinstance(quirk, str):
+        return quirk
+    if hasattr(quirk, "__name__"):
+        return quirk.__name__
+    return str(quirk)
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceSnapshot:
+    """Point-in-time view of a ZHA device.
+
+    Values are stored raw (``nwk`` as int, ``last_seen`` as a timestamp)
+    and only formatted by ``as_dict``. Strings shared by many devices are
+    interned so a large mesh holds one copy of each.
+
+    ``version`` is the registry change sequence at which the snapshot was
+    stored; it is ignored when comparing snapshots.
+    """
+
+    ieee: str
+    nwk: Optional[int]
+    manufacturer: Optional[str]
+    model: Optional[str]
+    name: str
+    quirk_applied: bool
+    quirk_class: Optional[str]
+    power_source: Optional[str]
+    lqi: Optional[int]
+    rssi: Optional[int]
+    last_seen: Optional[float]
+    available: bool
+    device_type: Optional[str]
+    version: int = field(default=0, compare=False)
+    _attributes: Optional[Mapping[str, Any]] = field(
+        default=None, init=False, compare=False, repr=False
+    )
+
+    @classmethod
+    def from_device(cls, device, version: int = 0) -> DeviceSnapshot:
+        """Take a snapshot of a ZHA device."""
+        quirk_applied = bool(device.quirk_applied)
+        last_seen = device.last_seen
+        if isinstance(last_seen, datetime):
+            last_seen = last_seen.timestamp()
+        device_type = device.device_type
+        return cls(
+            ieee=str(device.ieee),
+            nwk=device.nwk,
+            manufacturer=_intern(device.manufacturer),
+            model=_intern(device.model),
+            name=device.name,
+            quirk_applied=quirk_applied,
+            quirk_class=(
+                _intern(quirk_class_name(device.quirk_class))
+                if quirk_applied else None
+            ),
+            power_source=_intern(device.power_source),
+            lqi=device.lqi,
+            rssi=device.rssi,
+            last_seen=last_seen,
+            available=bool(device.available),
+            device_type=(
+                _intern(str(device_type)) if device_type is not None else None
+            ),
+            version=version,
+        )
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> DeviceSnapshot:
+        """Rebuild a snapshot stored with ``as_row``."""
+        *values, version = row
+        return cls(*(_intern(value) for value in values), version=version)
+
+    def as_row(self) -> List[Any]:
+        """Return the data fields and version as a compact list."""
+        return [getattr(self, name) for name in SNAPSHOT_FIELDS] + [self.version]
+
+    @property
+    def nwk_hex(self) -> Optional[str]:
+        """Return the network address as a hex string."""
+        return f"0x{self.nwk:04x}" if self.nwk is not None else None
+
+    @property
+    def last_seen_iso(self) -> Optional[str]:
+        """Return last seen as an ISO 8601 string in local time."""
+        if self.last_seen is None:
+            return None
+        return datetime.fromtimestamp(self.last_seen).isoformat()
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the exported representation of the snapshot."""
+        info = {
+            "ieee": self.ieee,
+            "nwk": self.nwk_hex,
+            "manufacturer": self.manufacturer,
+            "model": self.model,
+            "name": self.name,
+            "quirk_applied": self.quirk_applied,
+            "power_source": self.power_source,
+            "lqi": self.lqi,
+            "rssi": self.rssi,
+            "last_seen": self.last_seen_iso,
+            "available": self.available,
+            "device_type": self.device_type,
+        }
+        if self.quirk_applied:
+            info["quirk_class"] = self.quirk_class
+        return info
+
+    @property
+    def attributes(self) -> Mapping[str, Any]:
+        """Return the read-only exported mapping, built on first use.
+
+        Snapshots are replaced whenever device data changes, so the mapping
+        always matches this snapshot's data and version and is dropped with
+        it. Exports and queries share it. Entities build their attributes
+        with ``as_dict`` instead, so a mapping is only kept for devices that
+        were exported or queried.
+        """
+        attributes = self._attributes
+        if attributes is None:
+            attributes = MappingProxyType(self.as_dict())
+            object.__setattr__(self, "_attributes", attributes)
+        return attributes
+
+
+# Data fields, excluding the version stamp and cached mapping
+SNAPSHOT_FIELDS = tuple(
+    snapshot_field.name
+    for snapshot_field in fields(DeviceSnapshot)
+    if snapshot_field.compare
+)
+
+
+def changed_fields(
+    old: Optional[DeviceSnapshot], new: DeviceSnapshot
+) -> Set[str]:
+    """Return the fields that differ between two snapshots."""
+    if old is None:
+        return set(SNAPSHOT_FIELDS)
+    return {
+        name for name in SNAPSHOT_FIELDS
+        if getattr(old, name) != getattr(new, name)
+    }
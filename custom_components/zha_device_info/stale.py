@@ -0,0 +1,154 @@
+"""Detect ZHA devices that stopped reporting, driven by last_seen."""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_STALE,
+    DEFAULT_STALE_THRESHOLD,
+    DOMAIN,
+    EVENT_DEVICE_STALE,
+    STALE_THRESHOLDS,
+)
+from .snapshot import DeviceSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def stale_threshold(power_source: Optional[str]) -> int:
+    """Return the seconds of silence after which a device is stale."""
+    return STALE_THRESHOLDS.get(power_source, DEFAULT_STALE_THRESHOLD)
+
+
+class StaleTracker:
+    """Min-heap of device deadlines, ``last_seen`` plus a threshold.
+
+    A single timer is armed for the earliest deadline, so a changed
+    ``last_seen`` costs one heap push instead of rescanning every device.
+    Superseded heap entries are skipped lazily when they reach the top and
+    the heap is rebuilt once they outnumber the live ones.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the tracker."""
+        self._hass = hass
+        self._heap: List[Tuple[float, str]] = []
+        self._deadlines: Dict[str, float] = {}
+        self._timer_at: Optional[float] = None
+        self._unsub_timer: Optional[CALLBACK_TYPE] = None
+        self.stale: Set[str] = set()
+
+    @callback
+    def async_start(self) -> None:
+        """Arm the timer for devices tracked before a reload."""
+        self._async_arm()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the pending timer."""
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+            self._timer_at = None
+
+    @callback
+    def async_update(self, snapshot: DeviceSnapshot) -> None:
+        """Move the deadline of a device after its snapshot changed."""
+        ieee = snapshot.ieee
+        if snapshot.last_seen is None:
+            self.async_remove(ieee)
+            return
+        deadline = snapshot.last_seen + stale_threshold(snapshot.power_source)
+        if self._deadlines.get(ieee) == deadline:
+            return
+
+        self._deadlines[ieee] = deadline
+        heapq.heappush(self._heap, (deadline, ieee))
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(when, key) for key, when in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+        if ieee in self.stale and deadline > time.time():
+            self.stale.discard(ieee)
+            self._async_write(ieee)
+        self._async_arm()
+
+    @callback
+    def async_remove(self, ieee: str) -> None:
+        """Stop tracking a device."""
+        self._deadlines.pop(ieee, None)
+        self.stale.discard(ieee)
+
+    @callback
+    def _async_arm(self) -> None:
+        """Arm the timer for the earliest live deadline."""
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        if not heap:
+            self.async_stop()
+            return
+
+        deadline = heap[0][0]
+        if self._timer_at is not None and self._timer_at <= deadline:
+            return
+        self.async_stop()
+        self._timer_at = deadline
+        self._unsub_timer = async_call_later(
+            self._hass, max(deadline - time.time(), 0), self._async_expire
+        )
+
+    @callback
+    def _async_expire(self, _now) -> None:
+        """Mark every device whose deadline passed as stale."""
+        self._unsub_timer = None
+        self._timer_at = None
+        now = time.time()
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            deadline, ieee = heapq.heappop(heap)
+            if self._deadlines.get(ieee) != deadline or ieee in self.stale:
+                continue
+            self.stale.add(ieee)
+            self._async_fire(ieee, deadline)
+            self._async_write(ieee)
+        self._async_arm()
+
+    @callback
+    def _async_fire(self, ieee: str, deadline: float) -> None:
+        """Fire the stale event for a device."""
+        snapshot = self._hass.data[DOMAIN]["device_registry"].get(ieee)
+        if snapshot is None:
+            return
+        threshold = stale_threshold(snapshot.power_source)
+        _LOGGER.debug("Device %s has been silent for %s seconds", ieee, threshold)
+        self._hass.bus.async_fire(
+            EVENT_DEVICE_STALE,
+            {
+                "ieee": ieee,
+                "name": snapshot.name,
+                "power_source": snapshot.power_source,
+                "last_seen": snapshot.last_seen_iso,
+                "threshold": threshold,
+                "stale_since": dt_util.utc_from_timestamp(deadline).isoformat(),
+            },
+        )
+
+    @callback
+    def _async_write(self, ieee: str) -> None:
+        """Write the stale binary sensor of a device if it exists."""
+        data = self._hass.data[DOMAIN]
+        entry = data["entities"].get(ieee)
+        if entry is None:
+            return
+        for entity in entry.binary:
+            if ATTR_STALE in entity.tracked_fields:
+                data["writer"].async_schedule(entity)
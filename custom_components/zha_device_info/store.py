@@ -0,0 +1,94 @@
+"""Persist ZHA Device Info snapshots across restarts."""
+
+import logging
+from typing import Any, Dict
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, STORAGE_KEY, STORAGE_VERSION, STORE_SAVE_DELAY
+from .snapshot import SNAPSHOT_FIELDS, DeviceSnapshot
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SnapshotStore:
+    """Save the device registry with a debounced write and restore it at setup.
+
+    Snapshots are stored as compact rows in ``SNAPSHOT_FIELDS`` order, so
+    entities show the last known data before ZHA has finished loading and
+    the first full scan only writes what changed while Home Assistant was
+    down.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._hass = hass
+        self._store: Store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._scheduled_seq = None
+        self._save_pending = False
+
+    async def async_restore(self) -> int:
+        """Load stored snapshots into the registry, return how many."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.error("Error loading stored ZHA device info: %s", err)
+            return 0
+        if not stored:
+            return 0
+        if stored.get("fields") != list(SNAPSHOT_FIELDS):
+            _LOGGER.debug("Ignoring stored ZHA device info with different fields")
+            return 0
+
+        data = self._hass.data[DOMAIN]
+        registry = data["device_registry"]
+        restored = 0
+        for row in stored.get("snapshots", []):
+            try:
+                snapshot = DeviceSnapshot.from_row(row)
+            except (TypeError, ValueError) as err:
+                _LOGGER.debug("Skipping stored snapshot %s: %s", row, err)
+                continue
+            if snapshot.ieee in registry:
+                continue
+            registry[snapshot.ieee] = snapshot
+            data["indexes"].update(None, snapshot)
+            data["stale"].async_update(snapshot)
+            restored += 1
+
+        data["change_seq"] = max(data.get("change_seq", 0), stored.get("change_seq", 0))
+        self._scheduled_seq = data["change_seq"]
+        return restored
+
+    @callback
+    def async_schedule_save(self, changed: bool = False) -> None:
+        """Save within ``STORE_SAVE_DELAY`` seconds if anything changed.
+
+        ``changed`` reports changes that do not move the change sequence,
+        such as LQI or last seen. The first change arms the save and later
+        ones ride along with it: rescheduling would push the deadline back
+        on every update, so a busy mesh would never be saved.
+        """
+        change_seq = self._hass.data[DOMAIN].get("change_seq", 0)
+        if change_seq == self._scheduled_seq and not changed:
+            return
+        self._scheduled_seq = change_seq
+        if self._save_pending:
+            return
+        self._save_pending = True
+        self._store.async_delay_save(self._data_to_save, STORE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        """Return the registry as stored rows."""
+        # Changes from here on need a new save
+        self._save_pending = False
+        data = self._hass.data[DOMAIN]
+        return {
+            "fields": list(SNAPSHOT_FIELDS),
+            "change_seq": data.get("change_seq", 0),
+            "snapshots": [
+                snapshot.as_row() for snapshot in data["device_registry"].values()
+            ],
+        }
@@ -0,0 +1,82 @@
+"""Mesh-wide summaries derived from the ZHA Device Info indexes."""
+
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .query import DeviceIndexes
+
+_LOGGER = logging.getLogger(__name__)
+
+Summary = Tuple[Any, Dict[str, Any]]
+
+
+def _signal_summary(indexes: DeviceIndexes, name: str) -> Summary:
+    """Return the median of a range field with min and p10 as attributes."""
+    return (
+        indexes.percentile(name, 0.5),
+        {
+            "min": indexes.percentile(name, 0.0),
+            "p10": indexes.percentile(name, 0.1),
+            "median": indexes.percentile(name, 0.5),
+            "devices": indexes.size(name),
+        },
+    )
+
+
+def summarize(indexes: DeviceIndexes, total: int) -> Dict[str, Summary]:
+    """Return the state and attributes of every mesh summary sensor.
+
+    Every value is read from the incrementally maintained indexes, so this
+    costs the number of distinct values, not the number of devices.
+    """
+    availability = indexes.counts("available")
+    quirks = indexes.counts("quirk_applied")
+    unavailable = availability.get(False, 0)
+    return {
+        "devices": (
+            total,
+            {
+                "available": availability.get(True, 0),
+                "unavailable": unavailable,
+                "quirk_applied": quirks.get(True, 0),
+                "no_quirk": quirks.get(False, 0),
+                "power_source": {
+                    str(key): count
+                    for key, count in indexes.counts("power_source").items()
+                },
+                "device_type": {
+                    str(key): count
+                    for key, count in indexes.counts("device_type").items()
+                },
+            },
+        ),
+        "unavailable": (unavailable, {}),
+        "lqi": _signal_summary(indexes, "lqi"),
+        "rssi": _signal_summary(indexes, "rssi"),
+    }
+
+
+def current_summary(hass: HomeAssistant, key: str) -> Optional[Summary]:
+    """Return the last computed summary for a sensor key."""
+    data = hass.data[DOMAIN]
+    summaries = data.get("summary")
+    if summaries is None:
+        summaries = data["summary"] = summarize(
+            data["indexes"], len(data["device_registry"])
+        )
+    return summaries.get(key)
+
+
+@callback
+def async_write_summaries(hass: HomeAssistant) -> None:
+    """Recompute the summaries and write only the sensors that changed."""
+    data = hass.data[DOMAIN]
+    old = data.get("summary") or {}
+    new = summarize(data["indexes"], len(data["device_registry"]))
+    data["summary"] = new
+    for key, entity in data["summary_entities"].items():
+        if old.get(key) != new.get(key):
+            data["writer"].async_schedule(entity)
@@ -0,0 +1,115 @@
+"""Minimum-change throttling of entity writes."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Set
+
+from .const import (
+    CONF_LAST_SEEN_GRANULARITY,
+    CONF_LQI_DEADBAND,
+    CONF_RSSI_DEADBAND,
+    DEFAULT_OPTIONS,
+    HISTORY_SIZE,
+)
+from .history import METRICS, STAT_ATTRIBUTES
+from .snapshot import DeviceSnapshot
+
+# Snapshot field throttled by each option, and the option's unit in field units
+THROTTLE_OPTIONS = {
+    CONF_LAST_SEEN_GRANULARITY: ("last_seen", 60),  # minutes
+    CONF_LQI_DEADBAND: ("lqi", 1),
+    CONF_RSSI_DEADBAND: ("rssi", 1),  # dB
+}
+
+
+def write_thresholds(options: Mapping[str, Any]) -> Dict[str, float]:
+    """Return the minimum change of every throttled field and history stat.
+
+    The mean and p5 of a metric use the metric's deadband. A slope is
+    written once it adds up to the deadband over the whole history.
+    """
+    thresholds = {}
+    for conf, (name, scale) in THROTTLE_OPTIONS.items():
+        value = options.get(conf, DEFAULT_OPTIONS[conf])
+        if value:
+            thresholds[name] = value * scale
+    for name, *_ in METRICS:
+        if name in thresholds:
+            thresholds[f"{name}_mean"] = thresholds[f"{name}_p5"] = thresholds[name]
+            thresholds[f"{name}_slope"] = thresholds[name] / HISTORY_SIZE
+    return thresholds
+
+
+def _value(
+    snapshot: DeviceSnapshot, stats: Optional[Mapping[str, Any]], name: str
+) -> Any:
+    """Return the current value of a snapshot field or history stat."""
+    if name in STAT_ATTRIBUTES:
+        return stats.get(name) if stats else None
+    return getattr(snapshot, name)
+
+
+class WriteThrottle:
+    """Hold back the writes of an entity until a value moved enough.
+
+    A change of a throttled field is only written once it differs from the
+    last written value by at least the field's threshold. Changes of any
+    other tracked field are always written. The snapshot keeps every
+    change either way, so the next write shows the latest values. History
+    stats are read from the device's stats instead of the snapshot.
+    """
+
+    __slots__ = ("_thresholds", "_tracked", "_written")
+
+    def __init__(
+        self,
+        thresholds: Mapping[str, float],
+        tracked: Optional[FrozenSet[str]] = None,
+    ) -> None:
+        """Initialize the throttle."""
+        self._thresholds = dict(thresholds)
+        self._tracked = tracked
+        self._written: Dict[str, Any] = {}
+
+    @classmethod
+    def for_fields(
+        cls,
+        thresholds: Mapping[str, float],
+        tracked: Optional[FrozenSet[str]],
+    ) -> Optional[WriteThrottle]:
+        """Return a throttle for an entity, or None if it tracks no throttled field."""
+        if tracked is not None:
+            thresholds = {
+                name: threshold for name, threshold in thresholds.items()
+                if name in tracked
+            }
+        return cls(thresholds, tracked) if thresholds else None
+
+    def should_write(
+        self,
+        snapshot: DeviceSnapshot,
+        changed: Set[str],
+        stats: Optional[Mapping[str, Any]] = None,
+    ) -> bool:
+        """Return True if the change is worth a write, and remember it if so."""
+        for name in changed:
+            if self._tracked is not None and name not in self._tracked:
+                continue
+            threshold = self._thresholds.get(name)
+            if threshold is None or self._moved(
+                name, _value(snapshot, stats, name), threshold
+            ):
+                self._written = {
+                    field: _value(snapshot, stats, field) for field in self._thresholds
+                }
+                return True
+        return False
+
+    def _moved(self, name: str, value: Any, threshold: float) -> bool:
+        """Return True if a field moved by its threshold since the last write."""
+        if name not in self._written:
+            return True
+        written = self._written[name]
+        if written is None or value is None:
+            return written is not value
+        return abs(value - written) >= threshold
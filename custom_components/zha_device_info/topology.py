@@ -0,0 +1,210 @@
+"""Neighbor and route graph of the ZHA mesh."""
+
+from array import array
+from collections import deque
+from typing import Any, BinaryIO, Dict, List, Optional, Set
+
+from homeassistant.core import callback
+from homeassistant.helpers.json import json_bytes
+
+from .export import write_atomic
+
+# Zigbee coordinators always use network address 0x0000
+COORDINATOR_NWK = 0x0000
+
+# Columns of the node ("n"), edge ("e") and route ("r") lines
+TOPOLOGY_COLUMNS = {
+    "n": ["node", "ieee", "nwk", "device_type", "degree", "hops"],
+    "e": ["source", "target", "lqi", "depth", "relationship"],
+    "r": ["source", "destination", "next_hop", "status"],
+}
+# zigpy neighbor relationship values, by index
+RELATIONSHIPS = ["parent", "child", "sibling", "none", "previous_child"]
+
+
+class MeshTopology:
+    """Compact copy of the gateway's neighbor and route tables.
+
+    Nodes are numbered in the order they are first seen, gateway devices
+    first. Edges and routes are kept in parallel arrays of node indexes
+    and raw values, so the graph of a large mesh costs a few bytes per
+    edge instead of a dict per neighbor entry.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty topology."""
+        self.ieees: List[str] = []
+        self.nwks: List[Optional[int]] = []
+        self.device_types: List[Optional[str]] = []
+        self.coordinator: Optional[int] = None
+        self._index: Dict[str, int] = {}
+        self.edge_source = array("I")
+        self.edge_target = array("I")
+        self.edge_lqi = array("B")
+        self.edge_depth = array("B")
+        self.edge_relationship = array("B")
+        self.route_source = array("I")
+        # Routes name their destination and next hop by network address
+        self.route_destination = array("H")
+        self.route_next_hop = array("H")
+        self.route_status = array("B")
+
+    def add_node(
+        self, ieee: str, nwk: Optional[int] = None, device_type: Optional[str] = None
+    ) -> int:
+        """Return the index of a node, adding it if it is new."""
+        node = self._index.get(ieee)
+        if node is None:
+            node = self._index[ieee] = len(self.ieees)
+            self.ieees.append(ieee)
+            self.nwks.append(nwk)
+            self.device_types.append(device_type)
+        elif self.nwks[node] is None:
+            self.nwks[node] = nwk
+        if nwk == COORDINATOR_NWK and self.coordinator is None:
+            self.coordinator = node
+        return node
+
+    def add_edge(
+        self, source: int, target: int, lqi: int, depth: int, relationship: int
+    ) -> None:
+        """Add a neighbor table entry of ``source``."""
+        self.edge_source.append(source)
+        self.edge_target.append(target)
+        self.edge_lqi.append(lqi)
+        self.edge_depth.append(depth)
+        self.edge_relationship.append(relationship)
+
+    def add_route(self, source: int, destination: int, next_hop: int, status: int) -> None:
+        """Add a routing table entry of ``source``."""
+        self.route_source.append(source)
+        self.route_destination.append(destination)
+        self.route_next_hop.append(next_hop)
+        self.route_status.append(status)
+
+    def neighbor_sets(self) -> List[Set[int]]:
+        """Return the distinct neighbors of every node, in both directions."""
+        neighbors: List[Set[int]] = [set() for _ in self.ieees]
+        for source, target in zip(self.edge_source, self.edge_target):
+            if source != target:
+                neighbors[source].add(target)
+                neighbors[target].add(source)
+        return neighbors
+
+
+def hop_counts(neighbors: List[Set[int]], root: Optional[int]) -> array:
+    """Return the hops from ``root`` to every node, -1 if unreachable."""
+    hops = array("i", [-1]) * len(neighbors)
+    if root is None:
+        return hops
+    hops[root] = 0
+    queue = deque([root])
+    while queue:
+        node = queue.popleft()
+        for neighbor in neighbors[node]:
+            if hops[neighbor] < 0:
+                hops[neighbor] = hops[node] + 1
+                queue.append(neighbor)
+    return hops
+
+
+@callback
+def async_collect_topology(gateway) -> MeshTopology:
+    """Copy the neighbor and route tables of the gateway, in the event loop."""
+    topology = MeshTopology()
+    for ieee, device in gateway.devices.items():
+        if device is None:
+            continue
+        device_type = device.device_type
+        topology.add_node(
+            str(ieee), device.nwk, str(device_type) if device_type is not None else None
+        )
+
+    tables = gateway.application_controller.topology
+    for ieee, neighbors in tables.neighbors.items():
+        source = topology.add_node(str(ieee))
+        for neighbor in neighbors:
+            target = topology.add_node(str(neighbor.ieee), neighbor.nwk)
+            topology.add_edge(
+                source,
+                target,
+                neighbor.lqi,
+                neighbor.depth,
+                int(neighbor.relationship),
+            )
+    for ieee, routes in tables.routes.items():
+        source = topology.add_node(str(ieee))
+        for route in routes:
+            topology.add_route(
+                source, route.DstNWK, route.NextHop, int(route.RouteStatus)
+            )
+    return topology
+
+
+def _write_topology(stream: BinaryIO, topology: MeshTopology) -> None:
+    """Write a header, then one JSON array per node, edge and route.
+
+    Route addresses that match no node are written as ``{"nwk": "0x...."}``.
+    """
+    neighbors = topology.neighbor_sets()
+    hops = hop_counts(neighbors, topology.coordinator)
+    nwk_index = {
+        nwk: node for node, nwk in enumerate(topology.nwks) if nwk is not None
+    }
+    stream.write(json_bytes({
+        "type": "topology",
+        "nodes": len(topology.ieees),
+        "edges": len(topology.edge_source),
+        "routes": len(topology.route_source),
+        "coordinator": topology.coordinator,
+        "columns": TOPOLOGY_COLUMNS,
+        "relationships": RELATIONSHIPS,
+    }))
+    stream.write(b"\n")
+
+    for node, ieee in enumerate(topology.ieees):
+        nwk = topology.nwks[node]
+        stream.write(json_bytes([
+            "n",
+            node,
+            ieee,
+            f"0x{nwk:04x}" if nwk is not None else None,
+            topology.device_types[node],
+            len(neighbors[node]),
+            hops[node] if hops[node] >= 0 else None,
+        ]))
+        stream.write(b"\n")
+
+    for edge in zip(
+        topology.edge_source,
+        topology.edge_target,
+        topology.edge_lqi,
+        topology.edge_depth,
+        topology.edge_relationship,
+    ):
+        stream.write(json_bytes(["e", *edge]))
+        stream.write(b"\n")
+
+    def route_node(nwk: int) -> Any:
+        """Return the node of a route address, or the address if no node has it."""
+        node = nwk_index.get(nwk)
+        # Kept as is, a route through an unknown address is what we look for
+        return node if node is not None else {"nwk": f"0x{nwk:04x}"}
+
+    for source, destination, next_hop, status in zip(
+        topology.route_source,
+        topology.route_destination,
+        topology.route_next_hop,
+        topology.route_status,
+    ):
+        stream.write(json_bytes([
+            "r", source, route_node(destination), route_node(next_hop), status,
+        ]))
+        stream.write(b"\n")
+
+
+def write_topology(
+    path: str, topology: MeshTopology, compress: Optional[str] = None
+) -> int:
+    """Stream the topology to ``path`` atomically, run in the executor."""
+    return write_atomic(path, lambda stream: _write_topology(stream, topology), compress)
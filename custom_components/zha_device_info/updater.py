@@ -0,0 +1,186 @@
+"""Change-detecting update pipeline for ZHA Device Info."""
+
+import asyncio
+import logging
+import time
+from dataclasses import replace
+from typing import Any, Dict, Iterable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, SCAN_CHUNK_BUDGET, VOLATILE_ATTRIBUTES
+from .snapshot import DeviceSnapshot, changed_fields
+from .summary import async_write_summaries
+
+_LOGGER = logging.getLogger(__name__)
+
+# Snapshot fields that move the stale deadline of a device
+STALE_FIELDS = ("last_seen", "power_source")
+
+
+def new_update_stats() -> Dict[str, int]:
+    """Return empty counters for an update run."""
+    return {
+        "devices_scanned": 0,
+        "devices_changed": 0,
+        "entities_written": 0,
+        "entities_throttled": 0,
+        "errors": 0,
+    }
+
+
+@callback
+def async_record_error(
+    hass: HomeAssistant, stats: Dict[str, int], ieee, err: Exception
+) -> None:
+    """Log a failed device refresh and count it against the device."""
+    _LOGGER.error("Error processing device %s: %s", ieee, err)
+    stats["errors"] += 1
+    errors = hass.data[DOMAIN]["device_errors"].setdefault(
+        str(ieee), {"count": 0, "last_error": None}
+    )
+    errors["count"] += 1
+    errors["last_error"] = str(err)
+
+
+@callback
+def async_update_device(
+    hass: HomeAssistant, device, stats: Dict[str, int]
+) -> None:
+    """Refresh one device and write only the entities whose data changed.
+
+    Only changes of inventory fields move the device's version, so delta
+    exports are not filled with LQI, RSSI, last seen and availability
+    changes. Those still reach the snapshot and the entities.
+    """
+    data = hass.data[DOMAIN]
+    ieee = str(device.ieee)
+    old_snapshot = data["device_registry"].get(ieee)
+    new_snapshot = DeviceSnapshot.from_device(
+        device, old_snapshot.version if old_snapshot is not None else 0
+    )
+    stats["devices_scanned"] += 1
+    data["history"].record(ieee, new_snapshot.lqi, new_snapshot.rssi)
+
+    if old_snapshot == new_snapshot:
+        return
+
+    changed = changed_fields(old_snapshot, new_snapshot)
+    if not changed <= VOLATILE_ATTRIBUTES:
+        version = data["change_seq"] = data.get("change_seq", 0) + 1
+        new_snapshot = replace(new_snapshot, version=version)
+    data["device_registry"][ieee] = new_snapshot
+    data["removed"].pop(ieee, None)
+    data["indexes"].update(old_snapshot, new_snapshot, changed)
+    if not changed.isdisjoint(STALE_FIELDS):
+        data["stale"].async_update(new_snapshot)
+    stats["devices_changed"] += 1
+    _LOGGER.debug("Device %s changed fields: %s", ieee, changed)
+
+    entry = data["entities"].get(ieee)
+    if entry is None:
+        return
+
+    writer = data["writer"]
+    history_stats = data["history_stats"].get(ieee)
+    for entity in entry:
+        tracked = entity.tracked_fields
+        if tracked is None or not changed.isdisjoint(tracked):
+            throttle = entity.throttle
+            if throttle is not None and not throttle.should_write(
+                new_snapshot, changed, history_stats
+            ):
+                stats["entities_throttled"] += 1
+                continue
+            writer.async_schedule(entity)
+            stats["entities_written"] += 1
+
+
+@callback
+def async_finish_update(hass: HomeAssistant, stats: Dict[str, int]) -> None:
+    """Refresh mesh-wide state after a batch of device updates."""
+    async_write_summaries(hass)
+    hass.data[DOMAIN]["store"].async_schedule_save(stats["devices_changed"] > 0)
+
+
+@callback
+def async_remove_snapshot(hass: HomeAssistant, ieee: str) -> None:
+    """Drop a device from the registry and record when it was removed."""
+    data = hass.data[DOMAIN]
+    old_snapshot = data["device_registry"].pop(ieee, None)
+    if old_snapshot is None:
+        return
+    data["indexes"].update(old_snapshot, None)
+    data["history"].remove(ieee)
+    data["stale"].async_remove(ieee)
+    version = data.get("change_seq", 0) + 1
+    data["change_seq"] = version
+    data["removed"][ieee] = version
+
+
+async def async_update_devices(
+    hass: HomeAssistant,
+    devices: Iterable[Any],
+    chunk_budget: float = SCAN_CHUNK_BUDGET,
+) -> Dict[str, int]:
+    """Refresh every device and drop devices that left the gateway.
+
+    Devices are processed in chunks of at most ``chunk_budget`` seconds,
+    yielding to the event loop between chunks.
+    """
+    device_registry = hass.data[DOMAIN]["device_registry"]
+    stats = new_update_stats()
+    seen = set()
+    chunk_start = time.monotonic()
+
+    # Copy, the gateway may add or remove devices while we yield
+    for device in list(devices):
+        if device is None:
+            continue
+        seen.add(str(device.ieee))
+        try:
+            async_update_device(hass, device, stats)
+        except Exception as dev_err:
+            async_record_error(hass, stats, device.ieee, dev_err)
+
+        if time.monotonic() - chunk_start >= chunk_budget:
+            await asyncio.sleep(0)
+            chunk_start = time.monotonic()
+
+    for ieee in device_registry.keys() - seen:
+        async_remove_snapshot(hass, ieee)
+
+    return stats
+
+
+async def async_run_full_scan(
+    hass: HomeAssistant,
+    devices: Iterable[Any],
+    chunk_budget: float = SCAN_CHUNK_BUDGET,
+) -> Optional[Dict[str, int]]:
+    """Run a full scan, superseding any scan that is still running.
+
+    Returns None if this scan was itself superseded by a newer one.
+    """
+    data = hass.data[DOMAIN]
+    running = data.get("scan_task")
+    if running is not None and not running.done():
+        _LOGGER.debug("Superseding running ZHA device info scan")
+        running.cancel()
+
+    task = hass.async_create_task(
+        async_update_devices(hass, devices, chunk_budget),
+        "zha_device_info full scan",
+    )
+    data["scan_task"] = task
+    try:
+        return await task
+    except asyncio.CancelledError:
+        current = asyncio.current_task()
+        if current is not None and current.cancelling():
+            raise
+        _LOGGER.debug("ZHA device info scan was superseded or cancelled")
+        return None
+    finally:
+        if data.get("scan_task") is task:
+            data.pop("scan_task")
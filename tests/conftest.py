@@ -1,11 +1,15 @@
 """Test fixtures for ZHA Device Info integration tests."""
+import asyncio
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 from datetime import datetime
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceRegistry
 from homeassistant.components.zha.core.const import DOMAIN as ZHA_DOMAIN
 
+from custom_components.zha_device_info import new_domain_data
+from custom_components.zha_device_info.const import CONF_WRITE_WINDOW
+
 @pytest.fixture
 def mock_zha_device():
     """Mock ZHA device for testing."""
@@ -43,11 +47,28 @@ def mock_zha_data(mock_gateway):
 def hass(mock_zha_data):
     """Mock Home Assistant instance for testing."""
     hass = Mock(spec=HomeAssistant)
-    hass.data = {
-        ZHA_DOMAIN: mock_zha_data,
-        "zha_device_info": {
-            "device_registry": {},
-            "entities": []
-        }
-    }
+    # Timers and events are armed on these, tests only inspect the calls
+    hass.loop = MagicMock()
+    hass.bus = Mock()
+    hass.states = Mock()
+    hass.states.async_available.return_value = True
+    hass.services = ServiceRegistry(hass)
+    hass.config = Mock()
+
+    async def run_in_executor(target, *args):
+        return target(*args)
+
+    # Executor jobs run inline, so their results can be checked right away
+    hass.async_add_executor_job = run_in_executor
+    # Service handlers are awaited by the caller instead of scheduled
+    hass.async_run_hass_job = lambda job, *args: job.target(*args)
+    hass.async_create_task = (
+        lambda target, name=None: asyncio.get_running_loop().create_task(target)
+    )
+    hass.data = {ZHA_DOMAIN: mock_zha_data}
+    # Writes happen right away, tests check them without waiting for a flush
+    hass.data["zha_device_info"] = new_domain_data(
+        hass, Mock(options={CONF_WRITE_WINDOW: 0})
+    )
+    hass.data["zha_device_info"]["store"] = Mock()
     return hass
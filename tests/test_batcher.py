@@ -0,0 +1,25 @@
+"""Tests for the state write batcher."""
+from unittest.mock import Mock, patch
+
+from custom_components.zha_device_info.batcher import StateWriteBatcher
+
+async def test_batcher_merges_repeated_writes(hass):
+    """Test an entity scheduled many times in a window is written once."""
+    first, second = Mock(), Mock()
+    with patch(
+        "custom_components.zha_device_info.batcher.async_call_later"
+    ) as call_later:
+        batcher = StateWriteBatcher(hass, 0.25)
+        for _ in range(3):
+            batcher.async_schedule(first)
+        batcher.async_schedule(second)
+        assert call_later.call_count == 1
+        assert first.async_write_ha_state.call_count == 0
+
+        batcher._async_flush(None)
+
+    assert first.async_write_ha_state.call_count == 1
+    assert second.async_write_ha_state.call_count == 1
+    assert batcher.stats == {
+        "requested": 4, "written": 2, "saved": 2, "flushes": 1, "pending": 0,
+    }
@@ -0,0 +1,28 @@
+"""Tests for ZHA Device Info diagnostics and performance counters."""
+from unittest.mock import Mock
+
+from custom_components.zha_device_info.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.zha_device_info.perf import performance_values
+from custom_components.zha_device_info.updater import (
+    async_record_error,
+    new_update_stats,
+)
+
+async def test_diagnostics_report_errors(hass):
+    """Test device errors are counted and reported."""
+    stats = new_update_stats()
+    for _ in range(2):
+        async_record_error(hass, stats, "00:11", ValueError("boom"))
+    entry = Mock()
+    entry.options = {"scan_interval": 300}
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert stats["errors"] == 2
+    assert diagnostics["device_errors"] == {
+        "00:11": {"count": 2, "last_error": "boom"}
+    }
+    assert diagnostics["writes"]["requested"] == 0
+    assert performance_values(hass.data["zha_device_info"])["device_errors"][0] == 2
@@ -0,0 +1,31 @@
+"""Tests for the ZHA Device Info entity index."""
+from unittest.mock import Mock
+
+from custom_components.zha_device_info.entity_index import EntityIndex
+
+def test_index_yields_each_entity_once(mock_zha_device):
+    """Test every entity is returned once regardless of registration order."""
+    index = EntityIndex()
+    main, split, binary = Mock(), Mock(), Mock()
+
+    index.add_main(mock_zha_device, main)
+    index.add_split(mock_zha_device, split)
+    index.add_split(mock_zha_device, split)
+    index.add_binary(mock_zha_device, binary)
+
+    assert len(index) == 1
+    assert list(index.entities()) == [main, split, binary]
+    assert index.get("00:11:22:33:44:55:66:77").device is mock_zha_device
+
+def test_index_discard_drops_empty_device(mock_zha_device):
+    """Test a device is dropped once its last entity is removed."""
+    index = EntityIndex()
+    main, split = Mock(), Mock()
+    index.add_main(mock_zha_device, main)
+    index.add_split(mock_zha_device, split)
+
+    index.discard(mock_zha_device, main)
+    assert "00:11:22:33:44:55:66:77" in index
+
+    index.discard(mock_zha_device, split)
+    assert "00:11:22:33:44:55:66:77" not in index
@@ -0,0 +1,55 @@
+"""Tests for the streaming export writers."""
+import gzip
+import json
+import os
+
+import pytest
+
+from custom_components.zha_device_info.export import write_atomic, write_export
+from custom_components.zha_device_info.snapshot import DeviceSnapshot
+
+def _snapshots(mock_zha_device):
+    """Return snapshots of two devices."""
+    first = DeviceSnapshot.from_device(mock_zha_device)
+    mock_zha_device.ieee = "00:11:22:33:44:55:66:88"
+    mock_zha_device.quirk_applied = False
+    return [first, DeviceSnapshot.from_device(mock_zha_device)]
+
+def test_export_formats_parse(mock_zha_device, tmp_path):
+    """Test JSON, NDJSON and gzipped exports hold every device."""
+    snapshots = _snapshots(mock_zha_device)
+
+    path = tmp_path / "export.json"
+    size = write_export(str(path), snapshots, "json")
+    assert size == path.stat().st_size
+    devices = json.loads(path.read_text())
+    assert list(devices) == [snapshot.ieee for snapshot in snapshots]
+    assert devices[snapshots[0].ieee]["nwk"] == "0x1234"
+    assert "quirk_class" not in devices[snapshots[1].ieee]
+
+    path = tmp_path / "export.ndjson"
+    write_export(str(path), snapshots, "ndjson")
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["ieee"] for line in lines] == [snapshot.ieee for snapshot in snapshots]
+
+    path = tmp_path / "export.ndjson.gz"
+    size = write_export(str(path), snapshots, "ndjson", "gzip")
+    assert size == path.stat().st_size
+    with gzip.open(path, "rt") as stream:
+        assert [json.loads(line)["ieee"] for line in stream] == [
+            snapshot.ieee for snapshot in snapshots
+        ]
+
+def test_failed_write_keeps_previous_export(tmp_path):
+    """Test a failing writer leaves the old file and no temp file behind."""
+    path = tmp_path / "export.json"
+    path.write_text("previous")
+
+    def fail(stream):
+        stream.write(b"partial")
+        raise OSError("disk full")
+
+    with pytest.raises(OSError):
+        write_atomic(str(path), fail)
+    assert path.read_text() == "previous"
+    assert os.listdir(tmp_path) == ["export.json"]
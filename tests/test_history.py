@@ -0,0 +1,40 @@
+"""Tests for the rolling LQI/RSSI history."""
+import sys
+from unittest.mock import patch
+
+from custom_components.zha_device_info.history import SignalHistory, compute_stats
+
+def test_history_ring_buffer_stats():
+    """Test the buffer keeps the newest samples and computes rolling stats."""
+    history = SignalHistory(4)
+    for lqi, rssi in [(10, -90), (100, -80), (110, -70), (120, -60), (130, -50)]:
+        history.record("aa", lqi, rssi)
+    history.record("bb", 300, -200)
+    history.record("cc", None, -60)
+
+    stats = compute_stats(history.size, *history.copy())
+
+    # The oldest sample was overwritten
+    assert stats["aa"]["lqi_mean"] == 115.0
+    assert stats["aa"]["lqi_slope"] == 10.0
+    assert stats["aa"]["rssi_p5"] == -78.5
+    # Samples are clamped to the range of the buffer
+    assert stats["bb"] == {
+        "lqi_mean": 255.0, "lqi_p5": 255.0, "lqi_slope": 0.0,
+        "rssi_mean": -128.0, "rssi_p5": -128.0, "rssi_slope": 0.0,
+    }
+    assert "cc" not in stats
+
+    history.remove("aa")
+    assert "aa" not in compute_stats(history.size, *history.copy())
+
+def test_missing_numpy_logged_once(caplog):
+    """Test stats are skipped with a single warning when numpy is missing."""
+    history = SignalHistory(4)
+    history.record("aa", 100, -60)
+    with patch.dict(sys.modules, {"numpy": None}), patch(
+        "custom_components.zha_device_info.history._numpy_missing_logged", False
+    ):
+        assert compute_stats(history.size, *history.copy()) == {}
+        assert compute_stats(history.size, *history.copy()) == {}
+    assert caplog.text.count("numpy is not available") == 1
@@ -0,0 +1,47 @@
+"""Tests for ZHA Device Info setup and unload."""
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.exceptions import ConfigEntryNotReady
+
+from custom_components.zha_device_info import async_setup_entry, async_unload_entry
+from custom_components.zha_device_info.const import DATA_ZHA_WAITERS
+
+INIT = "custom_components.zha_device_info"
+
+async def test_setup_retried_when_zha_loads(hass, mock_gateway, mock_zha_data):
+    """Test setup fails right away without ZHA and is retried once ZHA loads."""
+    mock_zha_data.gateway_proxy = None
+    hass.config_entries = Mock()
+    entry = Mock(entry_id="entry", state=ConfigEntryState.SETUP_RETRY)
+
+    with patch(f"{INIT}.async_dispatcher_connect") as connect:
+        with pytest.raises(ConfigEntryNotReady):
+            await async_setup_entry(hass, entry)
+        # A second failed attempt keeps the single subscription
+        with pytest.raises(ConfigEntryNotReady):
+            await async_setup_entry(hass, entry)
+    assert connect.call_count == 1
+    handle_entry_changed = connect.call_args[0][2]
+
+    handle_entry_changed("updated", Mock(domain="light"))
+    handle_entry_changed("updated", Mock(domain="zha"))
+    hass.config_entries.async_schedule_reload.assert_not_called()
+
+    mock_zha_data.gateway_proxy = Mock(gateway=mock_gateway)
+    handle_entry_changed("updated", Mock(domain="zha"))
+    hass.config_entries.async_schedule_reload.assert_called_once_with("entry")
+    connect.return_value.assert_called_once_with()
+    assert hass.data[DATA_ZHA_WAITERS] == {}
+
+async def test_unload_cancels_running_scan(hass):
+    """Test unloading the entry cancels a full scan still in progress."""
+    scan_task = Mock()
+    hass.data["zha_device_info"]["scan_task"] = scan_task
+    hass.config_entries = Mock()
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+
+    assert await async_unload_entry(hass, Mock()) is True
+    scan_task.cancel.assert_called_once_with()
+    assert "scan_task" not in hass.data["zha_device_info"]
@@ -0,0 +1,68 @@
+"""Tests for the ZHA Device Info push listener."""
+from unittest.mock import AsyncMock, Mock, patch
+
+from custom_components.zha_device_info.listener import ZHADeviceInfoListener
+from custom_components.zha_device_info.snapshot import DeviceSnapshot
+
+LISTENER = "custom_components.zha_device_info.listener"
+
+def _start_listener(hass):
+    """Return a listener subscribed to the current ZHA gateway."""
+    listener = ZHADeviceInfoListener(hass)
+    with patch(f"{LISTENER}.async_dispatcher_connect"):
+        listener.async_start()
+    return listener
+
+async def test_device_added_once(hass, mock_gateway, mock_zha_device):
+    """Test joined and initialized events add a new device's entities once."""
+    mock_gateway.devices = {mock_zha_device.ieee: mock_zha_device}
+    listener = _start_listener(hass)
+    event = Mock()
+    event.device_info.ieee = mock_zha_device.ieee
+
+    with patch(f"{LISTENER}.async_get") as device_registry, patch(
+        f"{LISTENER}.async_call_later"
+    ), patch(f"{LISTENER}.async_dispatcher_send") as send:
+        device_registry.return_value.async_get_device.return_value = None
+        listener._handle_device_added(event)
+        listener._handle_device_added(event)
+
+    assert send.call_count == 1
+    assert send.call_args[0][2].ieee == mock_zha_device.ieee
+
+async def test_device_removed(hass, mock_gateway, mock_zha_device):
+    """Test removing a device drops its snapshot and entities."""
+    data = hass.data["zha_device_info"]
+    snapshot = DeviceSnapshot.from_device(mock_zha_device)
+    data["device_registry"][snapshot.ieee] = snapshot
+    data["indexes"].update(None, snapshot)
+    entity = Mock(async_remove=AsyncMock())
+    data["entities"].add_main(mock_zha_device, entity)
+
+    listener = _start_listener(hass)
+    event = Mock()
+    event.device_info.ieee = mock_zha_device.ieee
+    listener._handle_device_removed(event)
+
+    assert snapshot.ieee not in data["device_registry"]
+    assert snapshot.ieee in data["removed"]
+    entity.async_remove.assert_called_once_with(force_remove=True)
+
+async def test_listener_follows_zha_reload(hass, mock_gateway, mock_zha_data, mock_zha_device):
+    """Test the listener moves to the new gateway when ZHA is set up again."""
+    listener = _start_listener(hass)
+    mock_gateway.application_controller.add_listener.assert_called_once_with(listener)
+
+    new_gateway = Mock()
+    new_gateway.devices = {mock_zha_device.ieee: mock_zha_device}
+    mock_zha_data.gateway_proxy.gateway = new_gateway
+    listener._handle_entry_changed("updated", Mock(domain="zha"))
+
+    mock_gateway.application_controller.remove_listener.assert_called_once_with(listener)
+    new_gateway.application_controller.add_listener.assert_called_once_with(listener)
+    assert mock_zha_device.on_event.call_count == 1
+
+    # Other entries and unchanged gateways are ignored
+    listener._handle_entry_changed("updated", Mock(domain="light"))
+    listener._handle_entry_changed("updated", Mock(domain="zha"))
+    assert new_gateway.application_controller.add_listener.call_count == 1
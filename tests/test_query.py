@@ -0,0 +1,25 @@
+"""Tests for ZHA Device Info secondary indexes and queries."""
+from custom_components.zha_device_info.query import DeviceIndexes, query_devices
+from custom_components.zha_device_info.snapshot import DeviceSnapshot, changed_fields
+
+def test_query_uses_updated_indexes(mock_zha_device):
+    """Test filters and projection follow snapshot changes."""
+    indexes = DeviceIndexes()
+    old = DeviceSnapshot.from_device(mock_zha_device)
+    indexes.update(None, old)
+    snapshots = {old.ieee: old}
+
+    filters = {"power_source": ["Battery"], "lqi_max": 80}
+    assert query_devices(snapshots, indexes, filters) == []
+
+    mock_zha_device.lqi = 70
+    new = DeviceSnapshot.from_device(mock_zha_device)
+    indexes.update(old, new, changed_fields(old, new))
+    snapshots[new.ieee] = new
+
+    assert query_devices(snapshots, indexes, filters, ["lqi"]) == [
+        {"ieee": "00:11:22:33:44:55:66:77", "lqi": 70}
+    ]
+
+    indexes.update(new, None)
+    assert query_devices(snapshots, indexes, {"lqi_min": 0}) == []
@@ -0,0 +1,26 @@
+"""Tests for the sharded periodic refresh."""
+from unittest.mock import Mock, patch
+
+from custom_components.zha_device_info.scheduler import ShardedScheduler
+
+SCHEDULER = "custom_components.zha_device_info.scheduler"
+
+async def test_scheduler_reads_current_gateway(hass, mock_zha_data, mock_zha_device):
+    """Test every tick scans the current gateway and skips while ZHA is gone."""
+    registry = hass.data["zha_device_info"]["device_registry"]
+    scheduler = ShardedScheduler(hass, 60, shards=1)
+
+    with patch(f"{SCHEDULER}.async_call_later") as call_later:
+        mock_zha_data.gateway_proxy = None
+        scheduler._async_tick(None)
+        assert registry == {}
+        assert scheduler.diagnostics["bucket"] == 0
+        assert call_later.call_count == 1
+
+        # ZHA was set up again with a new gateway
+        gateway = Mock()
+        gateway.devices = {mock_zha_device.ieee: mock_zha_device}
+        mock_zha_data.gateway_proxy = Mock(gateway=gateway)
+        scheduler._async_tick(None)
+        assert mock_zha_device.ieee in registry
+        assert call_later.call_count == 2
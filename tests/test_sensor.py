@@ -2,14 +2,17 @@
 from unittest.mock import Mock, patch
 import pytest
 
-from custom_components.zha_device_info.sensor import ZHADeviceInfoSensor
+from custom_components.zha_device_info.binary_sensor import ZHADeviceBinarySensor
+from custom_components.zha_device_info.const import SPLITTABLE_ATTRIBUTES
+from custom_components.zha_device_info.device_context import DeviceContext
+from custom_components.zha_device_info.sensor import (
+    ZHADeviceAttributeSensor, ZHADeviceInfoSensor,
+)
+from custom_components.zha_device_info.updater import async_update_device, new_update_stats
 
 async def test_sensor_attributes(hass, mock_zha_device):
     """Test sensor attributes are set correctly."""
-    device_registry = Mock()
-    device_registry.async_get_device.return_value = None
-    
-    sensor = ZHADeviceInfoSensor(hass, mock_zha_device, device_registry)
+    sensor = ZHADeviceInfoSensor(hass, DeviceContext(mock_zha_device, None))
     
     attributes = sensor.extra_state_attributes
     assert attributes["ieee"] == "00:11:22:33:44:55:66:77"
@@ -20,11 +23,111 @@ async def test_sensor_attributes(hass, mock_zha_device):
     assert attributes["quirk_class"] == "TestQuirk"
 
 async def test_sensor_name_by_user(hass, mock_zha_device):
-    """Test sensor uses name_by_user when available."""
-    device_registry = Mock()
+    """Test entities use name_by_user when available."""
     mock_entry = Mock()
     mock_entry.name_by_user = "Custom Name"
-    device_registry.async_get_device.return_value = mock_entry
-    
-    sensor = ZHADeviceInfoSensor(hass, mock_zha_device, device_registry)
-    assert sensor.name == "ZHA Device Info Custom Name"
+    context = DeviceContext(mock_zha_device, mock_entry)
+
+    sensor = ZHADeviceInfoSensor(hass, context)
+    assert sensor.entity_id == "sensor.zha_device_info_entity_custom_name"
+    lqi = ZHADeviceAttributeSensor(hass, context, SPLITTABLE_ATTRIBUTES["split_lqi"])
+    assert lqi.name == "Custom Name LQI"
+
+async def test_sensor_volatile_attributes_unrecorded(hass, mock_zha_device):
+    """Test LQI, RSSI, last seen and the history stats are not recorded."""
+    sensor = ZHADeviceInfoSensor(hass, DeviceContext(mock_zha_device, None))
+    for attribute in ("lqi", "rssi", "last_seen", "available", "lqi_mean", "rssi_p5"):
+        assert attribute in sensor._unrecorded_attributes
+    assert "manufacturer" not in sensor._unrecorded_attributes
+
+async def test_sensor_slim(hass, mock_zha_device):
+    """Test the slim sensor drops volatile attributes and ignores their changes."""
+    hass.data["zha_device_info"]["history_stats"]["00:11:22:33:44:55:66:77"] = {
+        "lqi_mean": 200.0,
+    }
+    sensor = ZHADeviceInfoSensor(hass, DeviceContext(mock_zha_device, None), slim=True)
+
+    attributes = sensor.extra_state_attributes
+    assert attributes["manufacturer"] == "Test Manufacturer"
+    for attribute in ("lqi", "rssi", "last_seen", "available", "lqi_mean"):
+        assert attribute not in attributes
+    assert "lqi" not in sensor.tracked_fields
+    assert "last_seen" not in sensor.tracked_fields
+    assert "nwk" in sensor.tracked_fields
+
+async def test_split_sensor_values(hass, mock_zha_device):
+    """Test split sensors read their value through the configured extractor."""
+    context = DeviceContext(mock_zha_device, None)
+    lqi = ZHADeviceAttributeSensor(hass, context, SPLITTABLE_ATTRIBUTES["split_lqi"])
+    rssi = ZHADeviceAttributeSensor(hass, context, SPLITTABLE_ATTRIBUTES["split_rssi"])
+    nwk = ZHADeviceAttributeSensor(hass, context, SPLITTABLE_ATTRIBUTES["split_network_address"])
+
+    assert lqi.native_value == 255
+    assert lqi.state_class == "measurement"
+    assert rssi.native_value == -60
+    assert rssi.native_unit_of_measurement == "dBm"
+    assert nwk.native_value == "0x1234"
+    assert nwk.extra_state_attributes == {}
+
+async def test_quirk_binary_sensor(hass, mock_zha_device):
+    """Test the quirk binary sensor exposes the quirk class."""
+    sensor = ZHADeviceBinarySensor(
+        hass, DeviceContext(mock_zha_device, None), SPLITTABLE_ATTRIBUTES["split_quirk_info"]
+    )
+    assert sensor.is_on is True
+    assert sensor.extra_state_attributes == {"quirk_class": "TestQuirk"}
+
+async def test_split_entities_only_written_on_change(hass, mock_zha_device):
+    """Test split entities are not polled and skip writes of unchanged data."""
+    context = DeviceContext(mock_zha_device, None)
+    nwk = ZHADeviceAttributeSensor(hass, context, SPLITTABLE_ATTRIBUTES["split_network_address"])
+    quirk = ZHADeviceBinarySensor(hass, context, SPLITTABLE_ATTRIBUTES["split_quirk_info"])
+    for entity in (nwk, quirk):
+        assert entity.should_poll is False
+        entity.hass = hass
+        entity.async_write_ha_state = Mock()
+    data = hass.data["zha_device_info"]
+    data["entities"].add_split(mock_zha_device, nwk)
+    data["entities"].add_binary(mock_zha_device, quirk)
+
+    stats = new_update_stats()
+    async_update_device(hass, mock_zha_device, stats)
+    assert nwk.async_write_ha_state.call_count == 1
+    assert quirk.async_write_ha_state.call_count == 1
+
+    # Unchanged, then a change neither entity shows
+    async_update_device(hass, mock_zha_device, stats)
+    mock_zha_device.lqi = 100
+    async_update_device(hass, mock_zha_device, stats)
+    assert nwk.async_write_ha_state.call_count == 1
+    assert quirk.async_write_ha_state.call_count == 1
+
+    mock_zha_device.nwk = 0x4321
+    async_update_device(hass, mock_zha_device, stats)
+    assert nwk.async_write_ha_state.call_count == 2
+    assert quirk.async_write_ha_state.call_count == 1
+
+async def test_split_lqi_deadband(hass, mock_zha_device):
+    """Test a split LQI sensor is only written once LQI moved by the deadband."""
+    lqi = ZHADeviceAttributeSensor(
+        hass,
+        DeviceContext(mock_zha_device, None),
+        SPLITTABLE_ATTRIBUTES["split_lqi"],
+        thresholds={"lqi": 10},
+    )
+    lqi.hass = hass
+    lqi.async_write_ha_state = Mock()
+    hass.data["zha_device_info"]["entities"].add_split(mock_zha_device, lqi)
+
+    stats = new_update_stats()
+    async_update_device(hass, mock_zha_device, stats)
+    assert lqi.async_write_ha_state.call_count == 1
+
+    mock_zha_device.lqi = 250
+    async_update_device(hass, mock_zha_device, stats)
+    assert lqi.async_write_ha_state.call_count == 1
+    assert stats["entities_throttled"] == 1
+
+    mock_zha_device.lqi = 240
+    async_update_device(hass, mock_zha_device, stats)
+    assert lqi.async_write_ha_state.call_count == 2
@@ -1,7 +1,16 @@
 """Tests for ZHA Device Info services."""
-from unittest.mock import Mock, patch
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock, patch
 import pytest
+from homeassistant.exceptions import ServiceValidationError
+from zigpy.types import EUI64
+
 from custom_components.zha_device_info.services import async_register_services
+from custom_components.zha_device_info.snapshot import DeviceSnapshot
+from custom_components.zha_device_info.updater import (
+    async_remove_snapshot, async_update_device, new_update_stats,
+)
 
 async def test_update_service(hass, mock_zha_device, mock_gateway):
     """Test the update service."""
@@ -17,16 +26,16 @@ async def test_update_service(hass, mock_zha_device, mock_gateway):
     device_registry = hass.data["zha_device_info"]["device_registry"]
     assert len(device_registry) == 1
     device_info = device_registry["00:11:22:33:44:55:66:77"]
-    assert device_info["manufacturer"] == "Test Manufacturer"
-    assert device_info["model"] == "Test Model"
-    assert device_info["quirk_class"] == "TestQuirk"
+    assert device_info.manufacturer == "Test Manufacturer"
+    assert device_info.model == "Test Model"
+    assert device_info.quirk_class == "TestQuirk"
 
 async def test_export_service(hass, mock_zha_device, tmp_path):
     """Test the export service."""
     export_path = tmp_path / "export.json"
     
     hass.data["zha_device_info"]["device_registry"] = {
-        "test_ieee": {"name": "Test Device"}
+        "00:11:22:33:44:55:66:77": DeviceSnapshot.from_device(mock_zha_device)
     }
     
     await async_register_services(hass)
@@ -38,3 +47,102 @@ async def test_export_service(hass, mock_zha_device, tmp_path):
     )
     
     assert export_path.exists()
+
+async def test_update_service_single_device(hass, mock_zha_device, mock_gateway):
+    """Test a single device is read from the gateway, with or without entities."""
+    mock_gateway.devices = {EUI64.convert(mock_zha_device.ieee): mock_zha_device}
+    await async_register_services(hass)
+
+    await hass.services.async_call(
+        "zha_device_info", "update", {"ieee": mock_zha_device.ieee}, blocking=True
+    )
+    assert mock_zha_device.ieee in hass.data["zha_device_info"]["device_registry"]
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            "zha_device_info", "update", {"ieee": "00:00:00:00:00:00:00:01"}, blocking=True
+        )
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            "zha_device_info", "update", {"ieee": "not an address"}, blocking=True
+        )
+
+async def test_delta_export(hass, mock_zha_device, tmp_path):
+    """Test a delta holds inventory changes and removals since the last export."""
+    await async_register_services(hass)
+    stats = new_update_stats()
+    devices = []
+    for index in range(3):
+        device = Mock(**{
+            name: getattr(mock_zha_device, name)
+            for name in (
+                "nwk", "manufacturer", "model", "quirk_applied", "quirk_class",
+                "power_source", "lqi", "rssi", "last_seen", "available",
+            )
+        })
+        device.name = f"Device {index}"
+        device.ieee = f"00:11:22:33:44:55:66:{index:02x}"
+        async_update_device(hass, device, stats)
+        devices.append(device)
+
+    await hass.services.async_call(
+        "zha_device_info", "export", {"path": str(tmp_path / "full.json")}, blocking=True
+    )
+
+    devices[0].lqi = 10
+    devices[1].nwk = 0x4321
+    for device in devices[:2]:
+        async_update_device(hass, device, stats)
+    async_remove_snapshot(hass, devices[2].ieee)
+    delta_path = tmp_path / "delta.ndjson"
+    await hass.services.async_call(
+        "zha_device_info", "export", {"path": str(delta_path), "mode": "delta"}, blocking=True
+    )
+
+    # LQI is not an inventory change, so the first device is left out
+    header, *ops = [json.loads(line) for line in delta_path.read_text().splitlines()]
+    assert header["type"] == "delta"
+    assert header["upserts"] == 1 and header["removed"] == 1
+    assert ops[0]["op"] == "upsert"
+    assert ops[0]["ieee"] == devices[1].ieee
+    assert ops[0]["device"]["nwk"] == "0x4321"
+    assert ops[1] == {"op": "remove", "ieee": devices[2].ieee}
+
+    # The next delta starts from the previous one
+    await hass.services.async_call(
+        "zha_device_info", "export", {"path": str(delta_path), "mode": "delta"}, blocking=True
+    )
+    header, *ops = [json.loads(line) for line in delta_path.read_text().splitlines()]
+    assert header["upserts"] == 0 and header["removed"] == 0
+    assert ops == []
+
+async def test_superseded_update_profiled_with_own_stats(hass, mock_zha_device, mock_gateway):
+    """Test a replaced full scan is not recorded with another run's stats."""
+    for index in range(20):
+        device = Mock(**{
+            name: getattr(mock_zha_device, name)
+            for name in (
+                "name", "nwk", "manufacturer", "model", "quirk_applied", "quirk_class",
+                "power_source", "lqi", "rssi", "last_seen", "available",
+            )
+        })
+        device.ieee = f"00:11:22:33:44:55:66:{index:02x}"
+        mock_gateway.devices[device.ieee] = device
+    profiler = Mock(begin=Mock(return_value=None), async_end=AsyncMock())
+    hass.data["zha_device_info"]["profiler"] = profiler
+    await async_register_services(hass)
+
+    with patch("custom_components.zha_device_info.services.SCAN_CHUNK_BUDGET", 0):
+        first = asyncio.create_task(
+            hass.services.async_call("zha_device_info", "update", blocking=True)
+        )
+        # Let the first scan start and yield after its first device
+        for _ in range(3):
+            await asyncio.sleep(0)
+        await hass.services.async_call("zha_device_info", "update", blocking=True)
+        await first
+
+    # The replaced scan finishes first
+    superseded, latest = [call[0][3] for call in profiler.async_end.call_args_list]
+    assert superseded == {"superseded": True}
+    assert latest["devices_scanned"] == 20
@@ -0,0 +1,72 @@
+"""Tests for the per-model signature cache."""
+from types import MappingProxyType
+from unittest.mock import Mock
+
+import pytest
+
+from custom_components.zha_device_info.query import DeviceIndexes, query_devices
+from custom_components.zha_device_info.signature import SignatureCache
+from custom_components.zha_device_info.snapshot import DeviceSnapshot
+
+class OnOff:
+    """Stand-in for a zigpy cluster class."""
+
+def make_device(ieee):
+    """Return a mock ZHA device of the same model as every other one."""
+    endpoint = Mock(profile_id=0x0104, device_type=0x0100)
+    endpoint.in_clusters = {0x0006: OnOff()}
+    endpoint.out_clusters = {}
+    device = Mock()
+    device.ieee = ieee
+    device.manufacturer = "IKEA of Sweden"
+    device.model = "TRADFRI bulb"
+    device.quirk_applied = False
+    device.zigbee_signature = {"endpoints": {1: {"input_clusters": ["0x0006"]}}}
+    device.device.endpoints = {0: Mock(), 1: endpoint}
+    return device
+
+def test_devices_of_a_model_share_details():
+    """Test details are read once per model and are read-only."""
+    cache = SignatureCache()
+    first = cache.get(make_device("00:00:00:00:00:00:00:01"))
+    second = cache.get(make_device("00:00:00:00:00:00:00:02"))
+
+    assert first is second
+    assert len(cache) == 1
+    assert isinstance(first.signature, MappingProxyType)
+    assert first.as_dict()["endpoints"] == {
+        "1": {"profile_id": "0x0104", "device_type": "0x0100"}
+    }
+    assert first.as_dict()["cluster_details"] == {
+        "1": {"in": {"0x0006": "OnOff"}, "out": {}}
+    }
+    with pytest.raises(TypeError):
+        first.endpoints["2"] = {}
+
+def test_reinterview_invalidates_model():
+    """Test a re-interviewed device reads its model details again."""
+    cache = SignatureCache()
+    device = make_device("00:00:00:00:00:00:00:01")
+    first = cache.get(device)
+
+    device.zigbee_signature = {"endpoints": {}}
+    assert cache.get(device) is first
+    cache.invalidate("00:00:00:00:00:00:00:01")
+    assert cache.get(device).as_dict()["signature"] == {"endpoints": {}}
+
+def test_query_details_projection(mock_zha_device):
+    """Test detail fields are added to query results on request."""
+    indexes = DeviceIndexes()
+    snapshot = DeviceSnapshot.from_device(mock_zha_device)
+    indexes.update(None, snapshot)
+    cache = SignatureCache()
+    device = make_device(snapshot.ieee)
+
+    result = query_devices(
+        {snapshot.ieee: snapshot}, indexes, {}, ["signature"],
+        lambda ieee: cache.get(device),
+    )
+    assert result == [{
+        "ieee": snapshot.ieee,
+        "signature": {"endpoints": {"1": {"input_clusters": ["0x0006"]}}},
+    }]
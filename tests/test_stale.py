@@ -0,0 +1,33 @@
+"""Tests for the stale device tracker."""
+from unittest.mock import patch
+
+from custom_components.zha_device_info.snapshot import DeviceSnapshot
+from custom_components.zha_device_info.stale import StaleTracker
+
+async def test_stale_tracker_fires_once_per_silence(hass, mock_zha_device):
+    """Test a device goes stale at its deadline and recovers when seen."""
+    mock_zha_device.power_source = "Mains"
+    mock_zha_device.last_seen = 1000.0
+    snapshot = DeviceSnapshot.from_device(mock_zha_device)
+    hass.data["zha_device_info"]["device_registry"][snapshot.ieee] = snapshot
+
+    with patch(
+        "custom_components.zha_device_info.stale.async_call_later"
+    ) as call_later, patch(
+        "custom_components.zha_device_info.stale.time.time", return_value=1000.0
+    ) as now:
+        tracker = StaleTracker(hass)
+        tracker.async_update(snapshot)
+        # Armed once for the two hour mains deadline
+        assert call_later.call_args[0][1] == 7200
+
+        now.return_value = 8300.0
+        tracker._async_expire(None)
+        assert snapshot.ieee in tracker.stale
+        assert hass.bus.async_fire.call_count == 1
+        assert hass.bus.async_fire.call_args[0][1]["threshold"] == 7200
+
+        mock_zha_device.last_seen = 8300.0
+        tracker.async_update(DeviceSnapshot.from_device(mock_zha_device))
+        assert snapshot.ieee not in tracker.stale
+        assert call_later.call_args[0][1] == 7200
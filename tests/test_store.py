@@ -0,0 +1,27 @@
+"""Tests for the persisted snapshot store."""
+from unittest.mock import Mock
+
+from custom_components.zha_device_info.const import STORE_SAVE_DELAY
+from custom_components.zha_device_info.store import SnapshotStore
+
+async def test_busy_mesh_still_saved(hass):
+    """Test repeated changes keep the first save deadline instead of pushing it back."""
+    store = SnapshotStore(hass)
+    store._store = Mock()
+    delay_save = store._store.async_delay_save
+
+    for _ in range(10):
+        store.async_schedule_save(changed=True)
+    delay_save.assert_called_once()
+    data_func, delay = delay_save.call_args[0]
+    assert delay == STORE_SAVE_DELAY
+
+    # The store writes, so the next change arms a new save
+    assert data_func()["snapshots"] == []
+    store.async_schedule_save(changed=True)
+    assert delay_save.call_count == 2
+
+    # Nothing changed since
+    data_func()
+    store.async_schedule_save()
+    assert delay_save.call_count == 2
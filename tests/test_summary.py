@@ -0,0 +1,73 @@
+"""Tests for the mesh summary sensors."""
+from unittest.mock import Mock
+
+from custom_components.zha_device_info.summary import (
+    async_write_summaries, current_summary,
+)
+from custom_components.zha_device_info.updater import (
+    async_remove_snapshot, async_update_device, new_update_stats,
+)
+
+def _add_devices(hass, mock_zha_device):
+    """Add a battery device and a mains device, return the mains one."""
+    stats = new_update_stats()
+    async_update_device(hass, mock_zha_device, stats)
+    mains = Mock(**{
+        name: getattr(mock_zha_device, name)
+        for name in ("manufacturer", "model", "last_seen", "available")
+    })
+    mains.name = "Mains Device"
+    mains.ieee = "00:11:22:33:44:55:66:88"
+    mains.nwk = 0x0001
+    mains.quirk_applied = False
+    mains.power_source = "Mains"
+    mains.lqi = 100
+    mains.rssi = -80
+    async_update_device(hass, mains, stats)
+    async_write_summaries(hass)
+    return mains
+
+async def test_summary_counts(hass, mock_zha_device):
+    """Test the summaries count devices by availability, quirk and power source."""
+    _add_devices(hass, mock_zha_device)
+
+    total, attributes = current_summary(hass, "devices")
+    assert total == 2
+    assert attributes["available"] == 2
+    assert attributes["unavailable"] == 0
+    assert attributes["quirk_applied"] == 1
+    assert attributes["no_quirk"] == 1
+    assert attributes["power_source"] == {"Battery": 1, "Mains": 1}
+    assert current_summary(hass, "unavailable") == (0, {})
+    assert current_summary(hass, "lqi")[1]["min"] == 100
+    assert current_summary(hass, "lqi")[1]["devices"] == 2
+
+async def test_summary_follows_updates_and_removals(hass, mock_zha_device):
+    """Test the summaries change with a device and only write changed sensors."""
+    mains = _add_devices(hass, mock_zha_device)
+    data = hass.data["zha_device_info"]
+    devices_sensor, unavailable_sensor = Mock(), Mock()
+    data["summary_entities"].update(
+        {"devices": devices_sensor, "unavailable": unavailable_sensor}
+    )
+
+    mains.available = False
+    async_update_device(hass, mains, new_update_stats())
+    async_write_summaries(hass)
+    assert current_summary(hass, "unavailable")[0] == 1
+    assert current_summary(hass, "devices")[1]["unavailable"] == 1
+    assert devices_sensor.async_write_ha_state.call_count == 1
+    assert unavailable_sensor.async_write_ha_state.call_count == 1
+
+    async_remove_snapshot(hass, mains.ieee)
+    async_write_summaries(hass)
+    total, attributes = current_summary(hass, "devices")
+    assert total == 1
+    assert attributes["power_source"] == {"Battery": 1}
+    assert current_summary(hass, "unavailable")[0] == 0
+    assert current_summary(hass, "lqi")[1]["devices"] == 1
+
+    # Nothing changed, nothing is written
+    async_write_summaries(hass)
+    assert devices_sensor.async_write_ha_state.call_count == 2
+    assert unavailable_sensor.async_write_ha_state.call_count == 2
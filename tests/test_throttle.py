@@ -0,0 +1,73 @@
+"""Tests for minimum-change write throttling."""
+from unittest.mock import Mock
+
+from custom_components.zha_device_info.device_context import DeviceContext
+from custom_components.zha_device_info.history import async_refresh_history_stats
+from custom_components.zha_device_info.sensor import ZHADeviceInfoSensor
+from custom_components.zha_device_info.throttle import WriteThrottle, write_thresholds
+from custom_components.zha_device_info.updater import async_update_device, new_update_stats
+
+def test_write_thresholds():
+    """Test options are converted to snapshot field units."""
+    assert write_thresholds({}) == {}
+    assert write_thresholds({"last_seen_granularity": 5, "lqi_deadband": 12}) == {
+        "last_seen": 300, "lqi": 12, "lqi_mean": 12, "lqi_p5": 12, "lqi_slope": 0.2,
+    }
+
+async def test_throttled_split_keeps_snapshot(hass, mock_zha_device):
+    """Test small changes skip the write but still reach the snapshot."""
+    data = hass.data["zha_device_info"]
+    entity = Mock()
+    entity.tracked_fields = frozenset({"last_seen"})
+    entity.throttle = WriteThrottle.for_fields({"last_seen": 300}, entity.tracked_fields)
+    data["entities"].add_split(mock_zha_device, entity)
+
+    stats = new_update_stats()
+    async_update_device(hass, mock_zha_device, stats)
+    assert stats["entities_written"] == 1
+
+    mock_zha_device.last_seen += 60
+    async_update_device(hass, mock_zha_device, stats)
+    assert stats["entities_written"] == 1
+    assert stats["entities_throttled"] == 1
+    assert data["device_registry"][mock_zha_device.ieee].last_seen == mock_zha_device.last_seen
+
+    mock_zha_device.last_seen += 240
+    async_update_device(hass, mock_zha_device, stats)
+    assert stats["entities_written"] == 2
+
+def test_throttle_ignores_untracked_fields():
+    """Test a change of a field the entity does not show is not written."""
+    throttle = WriteThrottle.for_fields({"lqi": 10, "rssi": 3}, frozenset({"lqi"}))
+    assert throttle.should_write(Mock(lqi=100), {"lqi"})
+    assert not throttle.should_write(Mock(lqi=104, nwk=1), {"lqi", "nwk"})
+    assert WriteThrottle.for_fields({"rssi": 3}, frozenset({"lqi"})) is None
+
+async def test_history_stats_throttled(hass, mock_zha_device):
+    """Test small moves of the history stats do not write the main sensor."""
+    data = hass.data["zha_device_info"]
+    main = ZHADeviceInfoSensor(
+        hass,
+        DeviceContext(mock_zha_device, None),
+        thresholds=write_thresholds({"lqi_deadband": 10}),
+    )
+    main.hass = hass
+    main.async_write_ha_state = Mock()
+    data["entities"].add_main(mock_zha_device, main)
+    async_update_device(hass, mock_zha_device, new_update_stats())
+
+    history = data["history"]
+    for _ in range(58):
+        history.record(mock_zha_device.ieee, 255, -60)
+    await async_refresh_history_stats(hass)
+    assert main.async_write_ha_state.call_count == 2
+
+    history.record(mock_zha_device.ieee, 250, -60)
+    await async_refresh_history_stats(hass)
+    assert data["history_stats"][mock_zha_device.ieee]["lqi_mean"] == 254.9
+    assert main.async_write_ha_state.call_count == 2
+
+    for _ in range(20):
+        history.record(mock_zha_device.ieee, 200, -60)
+    await async_refresh_history_stats(hass)
+    assert main.async_write_ha_state.call_count == 3
@@ -0,0 +1,84 @@
+"""Tests for the mesh topology export."""
+import json
+from unittest.mock import Mock
+
+from custom_components.zha_device_info.topology import (
+    async_collect_topology, write_topology,
+)
+
+COORDINATOR = "00:00:00:00:00:00:00:00"
+ROUTER = "00:00:00:00:00:00:00:01"
+END_DEVICE = "00:00:00:00:00:00:00:02"
+
+def make_gateway():
+    """Return a gateway with a coordinator, a router and an end device."""
+    gateway = Mock()
+    gateway.devices = {
+        COORDINATOR: Mock(nwk=0x0000, device_type="Coordinator"),
+        ROUTER: Mock(nwk=0x1234, device_type="Router"),
+        END_DEVICE: Mock(nwk=0x5678, device_type="EndDevice"),
+    }
+    tables = gateway.application_controller.topology
+    tables.neighbors = {
+        COORDINATOR: [Mock(ieee=ROUTER, nwk=0x1234, lqi=200, depth=1, relationship=2)],
+        ROUTER: [
+            Mock(ieee=COORDINATOR, nwk=0x0000, lqi=190, depth=0, relationship=2),
+            Mock(ieee=END_DEVICE, nwk=0x5678, lqi=120, depth=2, relationship=1),
+        ],
+    }
+    tables.routes = {
+        COORDINATOR: [Mock(DstNWK=0x5678, NextHop=0x1234, RouteStatus=0)],
+    }
+    return gateway
+
+def test_topology_export(tmp_path):
+    """Test nodes, edges and routes are written with degree and hops."""
+    topology = async_collect_topology(make_gateway())
+    path = str(tmp_path / "topology.ndjson")
+    write_topology(path, topology)
+
+    with open(path, encoding="utf-8") as export:
+        header, *lines = [json.loads(line) for line in export]
+    assert header["nodes"] == 3
+    assert header["edges"] == 3
+    assert header["coordinator"] == 0
+
+    nodes = [line for line in lines if line[0] == "n"]
+    assert nodes == [
+        ["n", 0, COORDINATOR, "0x0000", "Coordinator", 1, 0],
+        ["n", 1, ROUTER, "0x1234", "Router", 2, 1],
+        ["n", 2, END_DEVICE, "0x5678", "EndDevice", 1, 2],
+    ]
+    assert ["e", 1, 2, 120, 2, 1] in lines
+    assert ["r", 0, 2, 1, 0] in lines
+
+def test_unknown_neighbor_is_unreachable_without_coordinator(tmp_path):
+    """Test neighbors missing from the gateway get a node of their own."""
+    gateway = make_gateway()
+    del gateway.devices[COORDINATOR]
+    gateway.application_controller.topology.neighbors = {
+        ROUTER: [Mock(ieee="00:00:00:00:00:00:00:09", nwk=0x4321, lqi=50, depth=2, relationship=3)],
+    }
+    gateway.application_controller.topology.routes = {}
+    topology = async_collect_topology(gateway)
+    path = str(tmp_path / "topology.ndjson")
+    write_topology(path, topology)
+
+    with open(path, encoding="utf-8") as export:
+        header, *lines = [json.loads(line) for line in export]
+    assert header["coordinator"] is None
+    assert lines[2] == ["n", 2, "00:00:00:00:00:00:00:09", "0x4321", None, 1, None]
+
+def test_route_to_unknown_address_keeps_nwk(tmp_path):
+    """Test route addresses without a node are written as their NWK."""
+    gateway = make_gateway()
+    gateway.application_controller.topology.routes = {
+        COORDINATOR: [Mock(DstNWK=0x1A2B, NextHop=0x1234, RouteStatus=0)],
+    }
+    topology = async_collect_topology(gateway)
+    path = str(tmp_path / "topology.ndjson")
+    write_topology(path, topology)
+
+    with open(path, encoding="utf-8") as export:
+        lines = [json.loads(line) for line in export]
+    assert ["r", 0, {"nwk": "0x1a2b"}, 1, 0] in lines
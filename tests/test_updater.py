@@ -0,0 +1,115 @@
+"""Tests for the ZHA Device Info update pipeline."""
+import asyncio
+from dataclasses import replace
+from unittest.mock import AsyncMock, Mock, patch
+import pytest
+
+from custom_components.zha_device_info.snapshot import DeviceSnapshot, changed_fields
+from custom_components.zha_device_info.updater import (
+    async_run_full_scan, async_update_device, async_update_devices, new_update_stats,
+)
+
+UPDATER = "custom_components.zha_device_info.updater"
+
+def test_changed_fields_detects_only_differences(mock_zha_device):
+    """Test only the fields that moved are reported as changed."""
+    old = DeviceSnapshot.from_device(mock_zha_device)
+    mock_zha_device.lqi = 120
+    new = DeviceSnapshot.from_device(mock_zha_device)
+
+    assert changed_fields(old, new) == {"lqi"}
+    assert changed_fields(new, new) == set()
+    assert "ieee" in changed_fields(None, new)
+
+def test_snapshot_export_format(mock_zha_device):
+    """Test snapshots export the same fields as the main sensor."""
+    info = DeviceSnapshot.from_device(mock_zha_device).as_dict()
+    assert info["nwk"] == "0x1234"
+    assert info["quirk_class"] == "TestQuirk"
+    assert info["last_seen"] is not None
+
+def test_snapshot_attributes_are_cached(mock_zha_device):
+    """Test the attribute mapping is built on first use, once, and is read-only."""
+    snapshot = DeviceSnapshot.from_device(mock_zha_device)
+    assert snapshot._attributes is None
+    attributes = snapshot.attributes
+
+    assert snapshot.attributes is attributes
+    assert attributes == snapshot.as_dict()
+    with pytest.raises(TypeError):
+        attributes["lqi"] = 0
+    # A new version is a new snapshot with its own mapping
+    assert replace(snapshot, version=2)._attributes is None
+
+def test_snapshot_row_round_trip(mock_zha_device):
+    """Test snapshots survive being stored as rows."""
+    snapshot = DeviceSnapshot.from_device(mock_zha_device, version=7)
+    restored = DeviceSnapshot.from_row(snapshot.as_row())
+
+    assert restored == snapshot
+    assert restored.version == 7
+
+def _devices(mock_zha_device, count):
+    """Return copies of the mock device with distinct addresses."""
+    devices = []
+    for index in range(count):
+        device = Mock()
+        device.configure_mock(**{
+            name: getattr(mock_zha_device, name)
+            for name in (
+                "name", "nwk", "manufacturer", "model", "quirk_applied", "quirk_class",
+                "power_source", "lqi", "rssi", "last_seen", "available",
+            )
+        })
+        device.ieee = f"00:11:22:33:44:55:66:{index:02x}"
+        devices.append(device)
+    return devices
+
+async def test_scan_yields_between_chunks(hass, mock_zha_device):
+    """Test a scan yields once per exhausted chunk budget."""
+    devices = _devices(mock_zha_device, 3)
+    with patch(f"{UPDATER}.asyncio.sleep", AsyncMock()) as sleep:
+        stats = await async_update_devices(hass, devices, chunk_budget=0)
+        assert sleep.await_count == 3
+        assert stats["devices_changed"] == 3
+
+        sleep.reset_mock()
+        stats = await async_update_devices(hass, devices, chunk_budget=60)
+        assert sleep.await_count == 0
+        assert stats["devices_changed"] == 0
+
+async def test_newer_scan_supersedes_running(hass, mock_zha_device):
+    """Test a new full scan cancels the running one, which returns None."""
+    devices = _devices(mock_zha_device, 20)
+    first = asyncio.create_task(async_run_full_scan(hass, devices, 0))
+    # Let the first scan start and yield after its first device
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    second = await async_run_full_scan(hass, devices, 0)
+
+    assert await first is None
+    assert second["devices_scanned"] == 20
+    rescan = await async_run_full_scan(hass, devices, 0)
+    assert rescan["devices_changed"] == 0
+    assert "scan_task" not in hass.data["zha_device_info"]
+
+async def test_only_inventory_changes_move_version(hass, mock_zha_device):
+    """Test LQI, RSSI, last seen and availability keep the device version."""
+    data = hass.data["zha_device_info"]
+    stats = new_update_stats()
+    async_update_device(hass, mock_zha_device, stats)
+    version = data["device_registry"][mock_zha_device.ieee].version
+    assert version == data["change_seq"]
+
+    mock_zha_device.lqi = 100
+    mock_zha_device.last_seen += 60
+    mock_zha_device.available = False
+    async_update_device(hass, mock_zha_device, stats)
+    snapshot = data["device_registry"][mock_zha_device.ieee]
+    assert snapshot.lqi == 100
+    assert snapshot.version == version
+    assert data["change_seq"] == version
+
+    mock_zha_device.power_source = "Mains"
+    async_update_device(hass, mock_zha_device, stats)
+    assert data["device_registry"][mock_zha_device.ieee].version == version + 1